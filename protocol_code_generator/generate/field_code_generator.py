@@ -288,6 +288,28 @@ def generate_serialize(self):
 
         if self._array_field:
             array_size_expression = self._get_length_expression()
+
+            bulk_type_name = self._get_bulk_integer_type_name()
+            if bulk_type_name is not None:
+                values_expression = f"data._{self._name}"
+                if array_size_expression is not None and not array_size_expression.isdigit():
+                    # Writing a slice would silently write fewer values than the length field
+                    # claims, so a short list is rejected up front.
+                    self._data.serialize.begin_control_flow(
+                        f"if len(data._{self._name}) < {array_size_expression}"
+                    )
+                    self._data.serialize.add_line(
+                        f'raise SerializationError(f"Expected length of {self._name} to be at '
+                        f'least {{{array_size_expression}}}, got {{len(data._{self._name})}}.")'
+                    )
+                    self._data.serialize.unindent()
+                    self._data.serialize.add_import(
+                        "SerializationError", "eolib.protocol.serialization_error"
+                    )
+                    values_expression += f"[:{array_size_expression}]"
+                self._data.serialize.add_line(f"writer.add_{bulk_type_name}({values_expression})")
+                return
+
             if array_size_expression is None:
                 array_size_expression = f"len(data._{self._name})"
 
@@ -320,6 +342,45 @@ def generate_deserialize(self):
         if self._optional:
             self._data.deserialize.unindent()
 
+    def generate_layout(self):
+        if self._data.layout is None:
+            return
+
+        field_type = self._get_type()
+        if isinstance(field_type, HasUnderlyingType):
+            field_type = field_type.underlying_type
+
+        if (
+            self._optional
+            or self._padded
+            or self._offset
+            or self._array_field
+            or self._context.chunked_reading_enabled
+            or not isinstance(field_type, (IntegerType, StringType))
+            or not field_type.bounded
+        ):
+            self._data.layout = None
+            return
+
+        length = "None"
+        if isinstance(field_type, StringType):
+            length = self._length_string
+            if not length.isdigit():
+                length = f'"{length}"'
+
+        value = "None"
+        if self._hardcoded_value is not None:
+            if isinstance(field_type, StringType):
+                value = f'"{self._hardcoded_value}"'
+            elif try_parse_int(self._hardcoded_value) is not None:
+                value = self._hardcoded_value
+            else:
+                self._data.layout = None
+                return
+
+        name = "None" if self._name is None else f'"{self._name}"'
+        self._data.layout.append(f'({name}, "{field_type.name}", {length}, {value}),')
+
     def _generate_accessor_docstring(self):
         notes = []
 
@@ -503,6 +564,13 @@ def _generate_deserialize_array(self):
                 )
                 array_length_expression = array_length_variable_name
 
+        bulk_type_name = self._get_bulk_integer_type_name()
+        if bulk_type_name is not None:
+            self._data.deserialize.add_line(
+                f"data._{self._name} = reader.get_{bulk_type_name}({array_length_expression})"
+            )
+            return
+
         self._data.deserialize.add_line(f"data._{self._name} = []")
 
         if array_length_expression is None:
@@ -522,6 +590,16 @@ def _generate_deserialize_array(self):
 
         self._data.deserialize.unindent()
 
+    def _get_bulk_integer_type_name(self):
+        if not self._array_field or self._delimited or self._optional:
+            return None
+
+        field_type = self._get_type()
+        if not isinstance(field_type, IntegerType) or field_type.name == "byte":
+            return None
+
+        return f"{field_type.name}s"
+
     def _get_read_statement(self):
         real_type = self._get_type()
         type_ = real_type
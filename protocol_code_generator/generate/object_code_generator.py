@@ -41,6 +41,7 @@ def __init__(self, class_name):
         self.auxiliary_types = CodeBlock()
         self.docstring = CodeBlock()
         self.repr_fields = ["byte_size"]
+        self.layout = []
 
     def add_method(self, method):
         if self.methods:
@@ -102,6 +103,7 @@ def code(self):
             .add_code_block(self._data.docstring)
             .add_line("_byte_size: int = 0")
             .add_code_block(self._data.fields)
+            .add_code_block(self._generate_field_layout())
             .add_line()
             .add_code_block(self._generate_get_byte_size())
             .add_line()
@@ -138,6 +140,15 @@ def _generate_get_byte_size(self):
             .unindent()
         )
 
+    def _generate_field_layout(self):
+        result = CodeBlock()
+        if self._data.layout:
+            result.add_line("_field_layout = (").indent()
+            for entry in self._data.layout:
+                result.add_line(entry)
+            result.unindent().add_line(")")
+        return result
+
     def _generate_serialize_method(self):
         result = (
             CodeBlock()
@@ -227,6 +238,7 @@ def _generate_field(self, protocol_field):
         field_code_generator.generate_field()
         field_code_generator.generate_serialize()
         field_code_generator.generate_deserialize()
+        field_code_generator.generate_layout()
 
         if optional:
             self._context.reached_optional_field = True
@@ -257,6 +269,7 @@ def _generate_array(self, protocol_array):
         field_code_generator.generate_field()
         field_code_generator.generate_serialize()
         field_code_generator.generate_deserialize()
+        field_code_generator.generate_layout()
 
         if optional:
             self._context.reached_optional_field = True
@@ -279,6 +292,7 @@ def _generate_length(self, protocol_length):
         field_code_generator.generate_field()
         field_code_generator.generate_serialize()
         field_code_generator.generate_deserialize()
+        field_code_generator.generate_layout()
 
         if optional:
             self._context.reached_optional_field = True
@@ -306,6 +320,7 @@ def _generate_dummy(self, protocol_dummy):
             self._data.deserialize.unindent()
 
         self._context.reached_dummy = True
+        self._data.layout = None
 
         if needs_if_guards:
             self._context.needs_old_writer_length_variable = True
@@ -328,6 +343,7 @@ def _generate_switch(self, protocol_switch):
         )
 
         protocol_cases = protocol_switch.findall("case")
+        self._data.layout = None
 
         switch_code_generator.generate_case_data_interface(protocol_cases)
         switch_code_generator.generate_case_data_field()
@@ -372,3 +388,4 @@ def _generate_break(self):
 
         self._data.serialize.add_line("writer.add_byte(0xFF)")
         self._data.deserialize.add_line("reader.next_chunk()")
+        self._data.layout = None
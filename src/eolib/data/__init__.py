@@ -6,6 +6,8 @@
 
 from .number_encoding_utils import *
 from .string_encoding_utils import *
+from .string_cache import *
 
 from .eo_reader import *
 from .eo_writer import *
+from .eo_pool import *
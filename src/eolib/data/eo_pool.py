@@ -0,0 +1,173 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+from eolib.data.eo_reader import EoReader
+from eolib.data.eo_writer import EoWriter
+from eolib.data.string_cache import StringCache
+
+
+class EoReaderPool:
+    """
+    A pool of reusable `EoReader` instances.
+
+    Released readers are kept in a free list that is local to the calling thread, so a pool can
+    be shared between threads or owned by a single connection. In the steady state, acquiring a
+    reader does not create a new `EoReader`.
+    """
+
+    _max_size: int
+    _string_cache: Optional[StringCache]
+    _local: threading.local
+
+    def __init__(self, max_size: int = 8, string_cache: Optional[StringCache] = None):
+        """
+        Creates a new `EoReaderPool` instance.
+
+        Args:
+            max_size (int, optional): The maximum number of released readers to keep per thread.
+                Defaults to 8.
+            string_cache (StringCache, optional): A cache of decoded strings to use in readers
+                created by the pool. Defaults to None.
+
+        Raises:
+            ValueError: If `max_size` is negative.
+        """
+        if max_size < 0:
+            raise ValueError(f"negative max_size: {max_size}")
+        self._max_size = max_size
+        self._string_cache = string_cache
+        self._local = threading.local()
+
+    def acquire(self, data: bytes) -> EoReader:
+        """
+        Takes a reader from the pool, or creates a new one if the pool is empty.
+
+        Args:
+            data (bytes): The byte array containing the input data.
+
+        Returns:
+            EoReader: A reader for the specified data.
+        """
+        free = self._free_list()
+        if free:
+            reader = free.pop()
+            reader.reset(data)
+            return reader
+        return EoReader(data, self._string_cache)
+
+    def release(self, reader: EoReader) -> None:
+        """
+        Returns a reader to the pool.
+
+        The reader must not be used by the caller after it has been released.
+
+        Args:
+            reader (EoReader): The reader to return to the pool.
+        """
+        free = self._free_list()
+        if len(free) < self._max_size:
+            reader.reset(b"")
+            free.append(reader)
+
+    @contextmanager
+    def reader(self, data: bytes) -> Iterator[EoReader]:
+        """
+        Acquires a reader for the duration of a `with` block.
+
+        Args:
+            data (bytes): The byte array containing the input data.
+
+        Yields:
+            EoReader: A reader for the specified data.
+        """
+        reader = self.acquire(data)
+        try:
+            yield reader
+        finally:
+            self.release(reader)
+
+    def _free_list(self) -> List[EoReader]:
+        try:
+            return self._local.free
+        except AttributeError:
+            self._local.free = []
+            return self._local.free
+
+
+class EoWriterPool:
+    """
+    A pool of reusable `EoWriter` instances.
+
+    Released writers are kept in a free list that is local to the calling thread, so a pool can
+    be shared between threads or owned by a single connection. In the steady state, acquiring a
+    writer neither creates a new `EoWriter` nor reallocates its buffer.
+    """
+
+    _max_size: int
+    _local: threading.local
+
+    def __init__(self, max_size: int = 8):
+        """
+        Creates a new `EoWriterPool` instance.
+
+        Args:
+            max_size (int, optional): The maximum number of released writers to keep per thread.
+                Defaults to 8.
+
+        Raises:
+            ValueError: If `max_size` is negative.
+        """
+        if max_size < 0:
+            raise ValueError(f"negative max_size: {max_size}")
+        self._max_size = max_size
+        self._local = threading.local()
+
+    def acquire(self) -> EoWriter:
+        """
+        Takes a writer from the pool, or creates a new one if the pool is empty.
+
+        Returns:
+            EoWriter: An empty writer.
+        """
+        free = self._free_list()
+        if free:
+            return free.pop()
+        return EoWriter()
+
+    def release(self, writer: EoWriter) -> None:
+        """
+        Resets a writer and returns it to the pool.
+
+        The writer must not be used by the caller after it has been released.
+
+        Args:
+            writer (EoWriter): The writer to return to the pool.
+        """
+        free = self._free_list()
+        if len(free) < self._max_size:
+            writer.reset()
+            free.append(writer)
+
+    @contextmanager
+    def writer(self) -> Iterator[EoWriter]:
+        """
+        Acquires a writer for the duration of a `with` block.
+
+        Yields:
+            EoWriter: An empty writer.
+        """
+        writer = self.acquire()
+        try:
+            yield writer
+        finally:
+            self.release(writer)
+
+    def _free_list(self) -> List[EoWriter]:
+        try:
+            return self._local.free
+        except AttributeError:
+            self._local.free = []
+            return self._local.free
+
+
+__all__ = ['EoReaderPool', 'EoWriterPool']
@@ -1,6 +1,9 @@
-from typing import Optional
-from eolib.data.number_encoding_utils import decode_number
+import mmap
+import os
+from typing import List, Optional, Union
+from eolib.data.number_encoding_utils import decode_number, decode_numbers
 from eolib.data.string_encoding_utils import decode_string
+from eolib.data.string_cache import StringCache
 
 
 class EoReader(object):
@@ -19,14 +22,96 @@ class EoReader(object):
     _chunked_reading_mode: bool
     _chunk_start: int
     _next_break: int
+    _string_cache: Optional[StringCache]
+    _mapping: Optional[mmap.mmap] = None
 
-    def __init__(self, data: bytes):
+    def __init__(self, data: bytes, string_cache: Optional[StringCache] = None):
         """
         Creates a new `EoReader` instance for the specified data.
 
         Args:
             data (bytes): The byte array containing the input data.
+            string_cache (StringCache, optional): A cache of decoded strings to use when reading
+                strings. Defaults to None.
         """
+        self._string_cache = string_cache
+        self.reset(data)
+
+    @staticmethod
+    def from_file(
+        path: Union[str, "os.PathLike[str]"], string_cache: Optional[StringCache] = None
+    ) -> "EoReader":
+        """
+        Creates a new `EoReader` instance that reads from a memory-mapped file.
+
+        The file is mapped read-only, so its contents are paged in on demand instead of being
+        read into memory up front. The mapping stays open until the reader is closed, which can be
+        done using the reader as a context manager:
+
+        ```
+        with EoReader.from_file("maps/00001.emf") as reader:
+            emf = Emf.deserialize(reader)
+        ```
+
+        Args:
+            path (Union[str, os.PathLike[str]]): The path of the file to read.
+            string_cache (StringCache, optional): A cache of decoded strings to use when reading
+                strings. Defaults to None.
+
+        Returns:
+            EoReader: The new reader.
+
+        Raises:
+            OSError: If the file cannot be opened or mapped.
+        """
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return EoReader(b"", string_cache)
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        reader = EoReader(mapping, string_cache)  # type: ignore [arg-type]
+        reader._mapping = mapping
+        return reader
+
+    def close(self) -> None:
+        """
+        Releases the input data, closing the underlying file mapping if the reader was created
+        with `from_file()`.
+
+        The reader cannot be used after it has been closed, unless it is reset with new data.
+
+        Raises:
+            BufferError: If readers created with `slice()` still refer to the file mapping.
+        """
+        self._data.release()
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self) -> "EoReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def reset(self, data: bytes) -> None:
+        """
+        Resets this reader so that it reads from the specified data.
+
+        The reader's position will be zero, and its chunked reading mode will be false. This
+        allows a single `EoReader` to be reused across many inputs, rather than creating a new
+        reader for each one.
+
+        If the reader was created with `from_file()`, the underlying file mapping is closed first.
+
+        Args:
+            data (bytes): The byte array containing the new input data.
+
+        Raises:
+            BufferError: If readers created with `slice()` still refer to the file mapping.
+        """
+        if self._mapping is not None:
+            self.close()
         self._data = memoryview(data)
         self._position = 0
         self._chunked_reading_mode = False
@@ -71,7 +156,7 @@ def slice(self, index: Optional[int] = None, length: Optional[int] = None) -> "E
         begin = max(0, min(len(self._data), index))
         end = begin + min(len(self._data) - begin, length)
 
-        return EoReader(self._data[begin:end])
+        return EoReader(self._data[begin:end], self._string_cache)
 
     def get_byte(self) -> int:
         """
@@ -130,6 +215,66 @@ def get_int(self) -> int:
         """
         return decode_number(self._read_bytes(4))
 
+    def get_chars(self, length: int) -> List[int]:
+        """
+        Reads an array of encoded 1-byte integers from the input data.
+
+        Args:
+            length (int): The number of integers to read.
+
+        Returns:
+            List[int]: The decoded 1-byte integers.
+
+        Raises:
+            ValueError: If the length is negative.
+        """
+        return self._read_numbers(length, 1)
+
+    def get_shorts(self, length: int) -> List[int]:
+        """
+        Reads an array of encoded 2-byte integers from the input data.
+
+        Args:
+            length (int): The number of integers to read.
+
+        Returns:
+            List[int]: The decoded 2-byte integers.
+
+        Raises:
+            ValueError: If the length is negative.
+        """
+        return self._read_numbers(length, 2)
+
+    def get_threes(self, length: int) -> List[int]:
+        """
+        Reads an array of encoded 3-byte integers from the input data.
+
+        Args:
+            length (int): The number of integers to read.
+
+        Returns:
+            List[int]: The decoded 3-byte integers.
+
+        Raises:
+            ValueError: If the length is negative.
+        """
+        return self._read_numbers(length, 3)
+
+    def get_ints(self, length: int) -> List[int]:
+        """
+        Reads an array of encoded 4-byte integers from the input data.
+
+        Args:
+            length (int): The number of integers to read.
+
+        Returns:
+            List[int]: The decoded 4-byte integers.
+
+        Raises:
+            ValueError: If the length is negative.
+        """
+        return self._read_numbers(length, 4)
+
     def get_string(self) -> str:
         """
         Reads a string from the input data.
@@ -137,8 +282,7 @@ def get_string(self) -> str:
         Returns:
             str: A string.
         """
-        string_bytes = self._read_bytes(self.remaining)
-        return self._decode_ansi(string_bytes)
+        return self._read_string(self.remaining, False, False)
 
     def get_fixed_string(self, length: int, padded: bool = False) -> str:
         """
@@ -156,10 +300,7 @@ def get_fixed_string(self, length: int, padded: bool = False) -> str:
         """
         if length < 0:
             raise ValueError("Negative length")
-        bytes_ = self._read_bytes(length)
-        if padded:
-            bytes_ = self._remove_padding(bytes_)
-        return self._decode_ansi(bytes_)
+        return self._read_string(length, False, padded)
 
     def get_encoded_string(self) -> str:
         """
@@ -168,9 +309,7 @@ def get_encoded_string(self) -> str:
         Returns:
             str: A decoded string.
         """
-        bytes_ = self._read_bytes(self.remaining)
-        decode_string(bytes_)
-        return self._decode_ansi(bytes_)
+        return self._read_string(self.remaining, True, False)
 
     def get_fixed_encoded_string(self, length: int, padded: bool = False) -> str:
         """
@@ -188,11 +327,20 @@ def get_fixed_encoded_string(self, length: int, padded: bool = False) -> str:
         """
         if length < 0:
             raise ValueError("Negative length")
-        bytes_ = self._read_bytes(length)
-        decode_string(bytes_)
-        if padded:
-            bytes_ = self._remove_padding(bytes_)
-        return self._decode_ansi(bytes_)
+        return self._read_string(length, True, padded)
+
+    @property
+    def string_cache(self) -> Optional[StringCache]:
+        """
+        Optional[StringCache]: Gets or sets the cache of decoded strings used by the reader.
+
+        Readers created with `slice()` share the cache of the reader they were created from.
+        """
+        return self._string_cache
+
+    @string_cache.setter
+    def string_cache(self, string_cache: Optional[StringCache]) -> None:
+        self._string_cache = string_cache
 
     @property
     def chunked_reading_mode(self) -> bool:
@@ -277,6 +425,74 @@ def _read_bytes(self, length) -> bytearray:
 
         return result
 
+    def _read_string(self, length: int, encoded: bool, padded: bool) -> str:
+        """
+        Reads a string from the input data, using the string cache if possible.
+
+        Args:
+            length (int): The length of the string.
+            encoded (bool): True if the string is encoded.
+            padded (bool): True if the string is padded with trailing `0xFF` bytes.
+
+        Returns:
+            str: The decoded string.
+        """
+        length = min(length, self.remaining)
+
+        cache = self._string_cache
+        if cache is None or length > cache.max_length:
+            return self._decode_string_bytes(self._read_bytes(length), encoded, padded)
+
+        key = (encoded, padded, bytes(self._data[self._position : self._position + length]))
+        result = cache.get(key)
+        if result is None:
+            bytes_ = bytearray(key[2])
+            result = cache.put(key, self._decode_string_bytes(bytes_, encoded, padded))
+        self._position += length
+        return result
+
+    def _decode_string_bytes(self, bytes_: bytearray, encoded: bool, padded: bool) -> str:
+        """
+        Decodes the raw bytes of a string.
+
+        Args:
+            bytes_ (bytearray): The raw bytes of the string. May be modified in place.
+            encoded (bool): True if the string is encoded.
+            padded (bool): True if the string is padded with trailing `0xFF` bytes.
+
+        Returns:
+            str: The decoded string.
+        """
+        if encoded:
+            decode_string(bytes_)
+        if padded:
+            bytes_ = self._remove_padding(bytes_)
+        return self._decode_ansi(bytes_)
+
+    def _read_numbers(self, length: int, size: int) -> List[int]:
+        """
+        Reads an array of encoded integers from the input data.
+
+        The result is the same as reading each integer individually, including when the input
+        data runs out partway through the array.
+
+        Args:
+            length (int): The number of integers to read.
+            size (int): The size of each encoded integer in bytes.
+
+        Returns:
+            List[int]: The decoded integers.
+
+        Raises:
+            ValueError: If the length is negative.
+        """
+        if length < 0:
+            raise ValueError("Negative length")
+        result = decode_numbers(bytes(self._read_bytes(length * size)), size)
+        if len(result) < length:
+            result.extend([0] * (length - len(result)))
+        return result
+
     def _find_next_break_index(self) -> int:
         """
         Finds the index of the next break byte (0xFF) in the input data.
@@ -1,12 +1,110 @@
+from typing import Optional, Sequence
 from eolib.data.eo_numeric_limits import CHAR_MAX, SHORT_MAX, THREE_MAX, INT_MAX
-from eolib.data.number_encoding_utils import encode_number
+from eolib.data.number_encoding_utils import encode_number, encode_numbers
 from eolib.data.string_encoding_utils import encode_string
 
+_MAX_VALUES = {1: CHAR_MAX, 2: SHORT_MAX, 3: THREE_MAX, 4: INT_MAX}
+_SANITIZE_TABLE = bytes.maketrans(b"\xFF", b"y")
+
 
 class EoWriter:
-    def __init__(self):
-        self.data = bytearray()
+    """
+    A class for writing EO data to a sequence of bytes.
+
+    The underlying buffer is retained when the writer is reset, so a single `EoWriter` can be
+    reused to write many sequences of data without reallocating its buffer each time.
+
+    A writer can also target a caller-supplied buffer, writing its data in place starting at an
+    offset within that buffer. Optionally, space for a 2-byte length prefix can be reserved at the
+    start of the writer data and filled in once the rest of the data has been written, which
+    avoids copying when framing packets.
+    """
+
+    class Reservation:
+        """
+        A handle to a slot in the writer data that was reserved for an encoded integer.
+
+        See Also:
+            - [`EoWriter.patch`][eolib.data.eo_writer.EoWriter.patch]
+        """
+
+        _position: int
+        _size: int
+
+        def __init__(self, position: int, size: int):
+            self._position = position
+            self._size = size
+
+        @property
+        def position(self) -> int:
+            """
+            int: Gets the position of the reserved slot in the writer data.
+            """
+            return self._position
+
+        @property
+        def size(self) -> int:
+            """
+            int: Gets the size of the reserved slot in bytes.
+            """
+            return self._size
+
+    _data: bytearray
+    _offset: int
+    _length: int
+    _length_prefix: bool
+    _string_sanitization_mode: bool
+
+    def __init__(
+        self, buffer: Optional[bytearray] = None, offset: int = 0, length_prefix: bool = False
+    ):
+        """
+        Creates a new `EoWriter` instance.
+
+        Args:
+            buffer (bytearray, optional): The buffer that the writer data will be written to. If
+                the writer data extends past the end of the buffer, the buffer will grow. Defaults
+                to a new empty buffer.
+            offset (int, optional): The position in `buffer` at which the writer data will start;
+                must be non-negative and no greater than the length of `buffer`. Defaults to 0.
+            length_prefix (bool, optional): True if space for a 2-byte length prefix should be
+                reserved at the start of the writer data. Defaults to False.
+
+        Raises:
+            ValueError: If `offset` is negative or greater than the length of `buffer`.
+
+        See Also:
+            - [`finalize_length_prefix`][eolib.data.eo_writer.EoWriter.finalize_length_prefix]
+        """
+        if buffer is None:
+            buffer = bytearray()
+
+        if offset < 0:
+            raise ValueError(f"negative offset: {offset}")
+
+        if offset > len(buffer):
+            raise ValueError(f"offset {offset} exceeds buffer length of {len(buffer)}")
+
+        self._data = buffer
+        self._offset = offset
+        self._length_prefix = length_prefix
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Resets this writer so that it can be reused.
+
+        The writer data will be empty, and its string sanitization mode will be false. The
+        capacity of the underlying buffer is retained, so subsequent writes up to the previous
+        length of the writer data will not need to grow it.
+
+        If the writer was created with a length prefix, space for the length prefix is reserved
+        again.
+        """
+        self._length = 0
         self._string_sanitization_mode = False
+        if self._length_prefix:
+            self.add_bytes(b"\xFE\xFE")
 
     def add_byte(self, value: int) -> None:
         """
@@ -19,7 +117,12 @@ def add_byte(self, value: int) -> None:
             ValueError: If the value is above `0xFF`.
         """
         self._check_number_size(value, 0xFF)
-        self.data.append(value)
+        position = self._offset + self._length
+        if position < len(self._data):
+            self._data[position] = value
+        else:
+            self._data.append(value)
+        self._length += 1
 
     def add_bytes(self, bytes: bytes) -> None:
         """
@@ -28,7 +131,9 @@ def add_bytes(self, bytes: bytes) -> None:
         Args:
             bytes (bytes): The bytes to add.
         """
-        self.data.extend(bytes)
+        position = self._offset + self._length
+        self._data[position : position + len(bytes)] = bytes
+        self._length += len(bytes)
 
     def add_char(self, number: int) -> None:
         """
@@ -86,6 +191,109 @@ def add_int(self, number: int) -> None:
         number_bytes = encode_number(number)
         self._add_bytes_with_length(number_bytes, 4)
 
+    def add_chars(self, numbers: Sequence[int]) -> None:
+        """
+        Adds an array of encoded 1-byte integers to the writer data.
+
+        Args:
+            numbers (Sequence[int]): The numbers to encode and add.
+
+        Raises:
+            ValueError: If any value is not below `CHAR_MAX`.
+        """
+        self._add_numbers(numbers, 1)
+
+    def add_shorts(self, numbers: Sequence[int]) -> None:
+        """
+        Adds an array of encoded 2-byte integers to the writer data.
+
+        Args:
+            numbers (Sequence[int]): The numbers to encode and add.
+
+        Raises:
+            ValueError: If any value is not below `SHORT_MAX`.
+        """
+        self._add_numbers(numbers, 2)
+
+    def add_threes(self, numbers: Sequence[int]) -> None:
+        """
+        Adds an array of encoded 3-byte integers to the writer data.
+
+        Args:
+            numbers (Sequence[int]): The numbers to encode and add.
+
+        Raises:
+            ValueError: If any value is not below `THREE_MAX`.
+        """
+        self._add_numbers(numbers, 3)
+
+    def add_ints(self, numbers: Sequence[int]) -> None:
+        """
+        Adds an array of encoded 4-byte integers to the writer data.
+
+        Args:
+            numbers (Sequence[int]): The numbers to encode and add.
+
+        Raises:
+            ValueError: If any value is not below `INT_MAX`.
+        """
+        self._add_numbers(numbers, 4)
+
+    def reserve_char(self) -> "EoWriter.Reservation":
+        """
+        Reserves space for an encoded 1-byte integer to be patched later.
+
+        Returns:
+            EoWriter.Reservation: A handle to the reserved slot.
+        """
+        return self._reserve(1)
+
+    def reserve_short(self) -> "EoWriter.Reservation":
+        """
+        Reserves space for an encoded 2-byte integer to be patched later.
+
+        Returns:
+            EoWriter.Reservation: A handle to the reserved slot.
+        """
+        return self._reserve(2)
+
+    def reserve_three(self) -> "EoWriter.Reservation":
+        """
+        Reserves space for an encoded 3-byte integer to be patched later.
+
+        Returns:
+            EoWriter.Reservation: A handle to the reserved slot.
+        """
+        return self._reserve(3)
+
+    def reserve_int(self) -> "EoWriter.Reservation":
+        """
+        Reserves space for an encoded 4-byte integer to be patched later.
+
+        Returns:
+            EoWriter.Reservation: A handle to the reserved slot.
+        """
+        return self._reserve(4)
+
+    def patch(self, reservation: "EoWriter.Reservation", number: int) -> None:
+        """
+        Encodes a number into a previously reserved slot in the writer data.
+
+        This is typically used to write a length or count that is only known after the data that
+        follows it has been written.
+
+        Args:
+            reservation (EoWriter.Reservation): The handle returned when the slot was reserved.
+            number (int): The number to encode.
+
+        Raises:
+            ValueError: If the value is too large to fit in the reserved slot, or the reserved slot
+                is no longer part of the writer data.
+        """
+        if reservation.position + reservation.size > self._length:
+            raise ValueError(f"Reserved slot at {reservation.position} is outside the writer data.")
+        self._patch_number(reservation.position, reservation.size, number)
+
     def add_string(self, string: str) -> None:
         """
         Adds a string to the writer data.
@@ -93,8 +301,7 @@ def add_string(self, string: str) -> None:
         Args:
             string (str): The string to be added.
         """
-        string_bytes = self._encode_ansi(string)
-        self._sanitize_string(string_bytes)
+        string_bytes = self._encode_string(string)
         self.add_bytes(string_bytes)
 
     def add_fixed_string(self, string: str, length: int, padded: bool = False) -> None:
@@ -108,8 +315,7 @@ def add_fixed_string(self, string: str, length: int, padded: bool = False) -> No
                 trailing `0xFF` bytes. Defaults to False.
         """
         self._check_string_length(string, length, padded)
-        string_bytes = self._encode_ansi(string)
-        self._sanitize_string(string_bytes)
+        string_bytes = self._encode_string(string)
         if padded:
             string_bytes = self._add_padding(string_bytes, length)
         self.add_bytes(string_bytes)
@@ -121,8 +327,7 @@ def add_encoded_string(self, string: str) -> None:
         Args:
             string (str): The string to be encoded and added.
         """
-        string_bytes = self._encode_ansi(string)
-        self._sanitize_string(string_bytes)
+        string_bytes = self._encode_string(string)
         encode_string(string_bytes)
         self.add_bytes(string_bytes)
 
@@ -137,8 +342,7 @@ def add_fixed_encoded_string(self, string: str, length: int, padded: bool = Fals
                 trailing `0xFF` bytes. Defaults to False.
         """
         self._check_string_length(string, length, padded)
-        string_bytes = self._encode_ansi(string)
-        self._sanitize_string(string_bytes)
+        string_bytes = self._encode_string(string)
         if padded:
             string_bytes = self._add_padding(string_bytes, length)
         encode_string(string_bytes)
@@ -158,6 +362,15 @@ def string_sanitization_mode(self) -> bool:
     def string_sanitization_mode(self, string_sanitization_mode: bool) -> None:
         self._string_sanitization_mode = string_sanitization_mode
 
+    @property
+    def data(self) -> bytearray:
+        """
+        bytearray: Gets a copy of the writer data.
+
+        Equivalent to [`to_bytearray`][eolib.data.eo_writer.EoWriter.to_bytearray].
+        """
+        return self.to_bytearray()
+
     def to_bytearray(self) -> bytearray:
         """
         Gets the writer data as a byte array.
@@ -165,7 +378,37 @@ def to_bytearray(self) -> bytearray:
         Returns:
             bytearray: A copy of the writer data as a byte array.
         """
-        return self.data.copy()
+        return self._data[self._offset : self._offset + self._length]
+
+    def getbuffer(self) -> memoryview:
+        """
+        Gets a view of the writer data without copying it.
+
+        The view can be used to modify the writer data in place, such as when encrypting it.
+
+        Note:
+            The underlying buffer cannot grow while the view exists. Release the view before adding
+            more data than the buffer can already hold.
+
+        Returns:
+            memoryview: A view of the writer data.
+        """
+        with memoryview(self._data) as view:
+            return view[self._offset : self._offset + self._length]
+
+    def finalize_length_prefix(self) -> None:
+        """
+        Encodes the length of the writer data into the reserved 2-byte length prefix.
+
+        The encoded length excludes the length prefix itself.
+
+        Raises:
+            RuntimeError: If the writer was not created with a length prefix.
+            ValueError: If the length is not below `SHORT_MAX`.
+        """
+        if not self._length_prefix:
+            raise RuntimeError("Writer was not created with a length prefix.")
+        self._patch_number(0, 2, self._length - 2)
 
     def __len__(self) -> int:
         """
@@ -174,7 +417,7 @@ def __len__(self) -> int:
         Returns:
             int: The length of the writer data.
         """
-        return len(self.data)
+        return self._length
 
     def _add_bytes_with_length(self, bytes: bytes, bytes_length: int) -> None:
         """
@@ -184,13 +427,64 @@ def _add_bytes_with_length(self, bytes: bytes, bytes_length: int) -> None:
             bytes (bytes): The bytes to add.
             bytes_length (int): The number of bytes to add.
         """
-        self.data.extend(bytes[:bytes_length])
+        self.add_bytes(bytes[:bytes_length])
+
+    def _add_numbers(self, numbers: Sequence[int], size: int) -> None:
+        """
+        Adds an array of encoded integers to the writer data.
+
+        Args:
+            numbers (Sequence[int]): The numbers to encode and add.
+            size (int): The size of each encoded integer in bytes.
+        """
+        if numbers:
+            self._check_number_size(max(numbers), _MAX_VALUES[size] - 1)
+        self.add_bytes(encode_numbers(numbers, size))
+
+    def _reserve(self, size: int) -> "EoWriter.Reservation":
+        """
+        Reserves space for an encoded integer, filling it with an encoded zero.
+
+        Args:
+            size (int): The size of the encoded integer in bytes.
+
+        Returns:
+            EoWriter.Reservation: A handle to the reserved slot.
+        """
+        reservation = EoWriter.Reservation(self._length, size)
+        self._add_bytes_with_length(encode_number(0), size)
+        return reservation
+
+    def _patch_number(self, position: int, size: int, number: int) -> None:
+        """
+        Encodes a number into the writer data at the specified position.
+
+        Args:
+            position (int): The position in the writer data.
+            size (int): The size of the encoded integer in bytes.
+            number (int): The number to encode.
+        """
+        self._check_number_size(number, _MAX_VALUES[size] - 1)
+        start = self._offset + position
+        self._data[start : start + size] = encode_number(number)[:size]
+
+    def _encode_string(self, string: str) -> bytearray:
+        """
+        Encodes a string to windows-1252 bytes, sanitizing it if string sanitization is enabled.
 
-    def _sanitize_string(self, bytes: bytearray) -> None:
+        Sanitization replaces `0xFF` bytes with `y`, so that the string cannot be mistaken for a
+        break byte in chunked data.
+
+        Args:
+            string (str): The string to encode.
+
+        Returns:
+            bytearray: The encoded string.
+        """
+        string_bytes = self._encode_ansi(string)
         if self.string_sanitization_mode:
-            for i in range(len(bytes)):
-                if bytes[i] == 0xFF:  # 'ÿ'
-                    bytes[i] = 0x79  # 'y'
+            string_bytes = string_bytes.translate(_SANITIZE_TABLE)
+        return string_bytes
 
     @staticmethod
     def _check_number_size(number: int, max_value: int) -> None:
@@ -1,5 +1,10 @@
+from typing import List, Sequence
 from eolib.data.eo_numeric_limits import CHAR_MAX, SHORT_MAX, THREE_MAX
 
+_DECODED_BYTES = [0 if i == 0xFE else i - 1 for i in range(256)]
+_ENCODED_LOW_BYTES = bytes((i + 1) & 0xFF for i in range(256))
+_ENCODED_HIGH_BYTES = bytes(0xFE if i == 0 else (i + 1) & 0xFF for i in range(256))
+
 
 def encode_number(number: int) -> bytes:
     """
@@ -63,3 +68,62 @@ def decode_number(encoded_number: bytes) -> int:
             result += THREE_MAX * value
 
     return result
+
+
+def encode_numbers(numbers: Sequence[int], size: int) -> bytes:
+    """
+    Encodes a sequence of numbers to a sequence of bytes, using `size` bytes for each number.
+
+    This is equivalent to concatenating the first `size` bytes of `encode_number` for each
+    number, but avoids encoding each number individually in the common cases.
+
+    Args:
+        numbers (Sequence[int]): The numbers to encode.
+        size (int): The number of bytes used to encode each number; must be between 1 and 4.
+
+    Returns:
+        bytes: The encoded sequence of bytes.
+    """
+    if numbers and min(numbers) >= 0:
+        if size == 1 and max(numbers) < CHAR_MAX:
+            return bytes(numbers).translate(_ENCODED_LOW_BYTES)
+        if size == 2 and max(numbers) < SHORT_MAX:
+            result = bytearray(len(numbers) * 2)
+            result[0::2] = bytes([n % CHAR_MAX for n in numbers]).translate(_ENCODED_LOW_BYTES)
+            result[1::2] = bytes([n // CHAR_MAX for n in numbers]).translate(_ENCODED_HIGH_BYTES)
+            return bytes(result)
+    return b"".join([encode_number(number)[:size] for number in numbers])
+
+
+def decode_numbers(encoded_numbers: bytes, size: int) -> List[int]:
+    """
+    Decodes a sequence of numbers from a sequence of bytes, using `size` bytes for each number.
+
+    If the length of the sequence of bytes is not a multiple of `size`, the last number is decoded
+    from the remaining bytes.
+
+    Args:
+        encoded_numbers (bytes): The sequence of bytes to decode.
+        size (int): The number of bytes used to encode each number; must be between 1 and 4.
+
+    Returns:
+        List[int]: The decoded numbers.
+    """
+    full_length = len(encoded_numbers) - len(encoded_numbers) % size
+    full = encoded_numbers[:full_length]
+
+    if size == 1:
+        result = list(map(_DECODED_BYTES.__getitem__, full))
+    elif size == 2:
+        decoded = _DECODED_BYTES
+        result = [
+            0 if a == 0xFE else decoded[a] + CHAR_MAX * decoded[b]
+            for a, b in zip(full[0::2], full[1::2])
+        ]
+    else:
+        result = [decode_number(full[i : i + size]) for i in range(0, full_length, size)]
+
+    if full_length < len(encoded_numbers):
+        result.append(decode_number(encoded_numbers[full_length:]))
+
+    return result
@@ -0,0 +1,160 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class StringCache:
+    """
+    A bounded cache of decoded strings, keyed by the raw bytes they were decoded from.
+
+    When an `EoReader` is given a `StringCache`, short strings are looked up by their raw bytes
+    before being decoded. Decoded strings are interned, so repeated values such as character names
+    or item names share a single `str` instance.
+
+    When the cache is full, the least recently used string is evicted.
+
+    A `StringCache` can be shared between threads, such as by the readers of an `EoReaderPool`.
+
+    See Also:
+        - [`EoReader.string_cache`][eolib.data.eo_reader.EoReader.string_cache]
+    """
+
+    _max_size: int
+    _max_length: int
+    _entries: "OrderedDict[Hashable, str]"
+    _hits: int
+    _misses: int
+    _evictions: int
+    _lock: threading.Lock
+
+    def __init__(self, max_size: int = 4096, max_length: int = 64):
+        """
+        Creates a new `StringCache` instance.
+
+        Args:
+            max_size (int, optional): The maximum number of strings to cache. Defaults to 4096.
+            max_length (int, optional): The maximum length in bytes of a string that will be
+                cached. Longer strings are always decoded. Defaults to 64.
+
+        Raises:
+            ValueError: If `max_size` or `max_length` is negative.
+        """
+        if max_size < 0:
+            raise ValueError(f"negative max_size: {max_size}")
+        if max_length < 0:
+            raise ValueError(f"negative max_length: {max_length}")
+        self._max_size = max_size
+        self._max_length = max_length
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        """
+        int: Gets the maximum number of strings to cache.
+        """
+        return self._max_size
+
+    @property
+    def max_length(self) -> int:
+        """
+        int: Gets the maximum length in bytes of a string that will be cached.
+        """
+        return self._max_length
+
+    @property
+    def hits(self) -> int:
+        """
+        int: Gets the number of lookups that found a cached string.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        int: Gets the number of lookups that did not find a cached string.
+        """
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """
+        int: Gets the number of strings that have been evicted from the cache.
+        """
+        return self._evictions
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        float: Gets the fraction of lookups that found a cached string, or 0 if there have been
+            no lookups.
+        """
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """
+        Looks up a cached string, marking it as the most recently used.
+
+        Args:
+            key (Hashable): The key derived from the raw bytes of the string.
+
+        Returns:
+            Optional[str]: The cached string, or `None` if it is not cached.
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: Hashable, value: str) -> str:
+        """
+        Adds a string to the cache, evicting the least recently used string if the cache is full.
+
+        Args:
+            key (Hashable): The key derived from the raw bytes of the string.
+            value (str): The decoded string.
+
+        Returns:
+            str: The interned string that was cached.
+        """
+        value = sys.intern(value)
+        if self._max_size == 0:
+            return value
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """
+        Removes all strings from the cache and resets its counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def __len__(self) -> int:
+        """
+        Gets the number of cached strings.
+
+        Returns:
+            int: The number of cached strings.
+        """
+        return len(self._entries)
+
+
+__all__ = ['StringCache']
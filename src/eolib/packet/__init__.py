@@ -4,3 +4,4 @@
 
 from .sequence_start import *
 from .packet_sequencer import *
+from .file_transfer_cache import *
@@ -0,0 +1,241 @@
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Tuple, Union
+from eolib.data.eo_writer import EoWriter
+from eolib.protocol.net.server import InitInitServerPacket, InitReply, MapFile, PubFile
+
+_PUB_FILE_REPLY_CODES: Dict[InitReply, Any] = {
+    InitReply.FileEif: InitInitServerPacket.ReplyCodeDataFileEif,
+    InitReply.FileEnf: InitInitServerPacket.ReplyCodeDataFileEnf,
+    InitReply.FileEsf: InitInitServerPacket.ReplyCodeDataFileEsf,
+    InitReply.FileEcf: InitInitServerPacket.ReplyCodeDataFileEcf,
+}
+
+_PayloadKey = Tuple[InitReply, int, int, int]
+
+
+class _FileEntry(NamedTuple):
+    stat_key: Tuple[int, int]
+    payload_key: _PayloadKey
+    payload: bytes
+
+
+def build_file_transfer_packet(reply_code: InitReply, content: bytes, file_id: int = 1) -> bytes:
+    """
+    Builds a ready-to-send `InitInitServerPacket` that transfers a pub or map file to the client.
+
+    The packet includes its length prefix, action and family. Packets in the `Init` family are not
+    encrypted, so the result can be sent to any client as-is.
+
+    Args:
+        reply_code (InitReply): The reply code identifying the type of file, which is one of
+            `FileEmf`, `FileEif`, `FileEnf`, `FileEsf` or `FileEcf`.
+        content (bytes): The content of the file.
+        file_id (int, optional): The ID of the pub file, which is ignored for map files. Defaults
+            to 1.
+
+    Returns:
+        bytes: The serialized packet.
+
+    Raises:
+        ValueError: If `reply_code` is not a file reply code, or if the file is too large to fit in
+            a packet. Large pub files can be split using
+            [`split_pub_file`][eolib.protocol.pub.pub_file_merging.split_pub_file].
+    """
+    packet = InitInitServerPacket()
+    packet.reply_code = reply_code
+    if reply_code == InitReply.FileEmf:
+        map_file = MapFile()
+        map_file.content = content
+        map_data = InitInitServerPacket.ReplyCodeDataFileEmf()
+        map_data.map_file = map_file
+        packet.reply_code_data = map_data
+    elif reply_code in _PUB_FILE_REPLY_CODES:
+        pub_file = PubFile()
+        pub_file.file_id = file_id
+        pub_file.content = content
+        pub_data = _PUB_FILE_REPLY_CODES[reply_code]()
+        pub_data.pub_file = pub_file
+        packet.reply_code_data = pub_data
+    else:
+        raise ValueError(f"{reply_code!r} is not a file reply code")
+
+    writer = EoWriter(length_prefix=True)
+    writer.add_byte(int(packet.action()))
+    writer.add_byte(int(packet.family()))
+    packet.write(writer)
+    writer.finalize_length_prefix()
+    return bytes(writer.to_bytearray())
+
+
+class FileTransferCache:
+    """
+    A cache of ready-to-send packets that transfer pub and map files to the client.
+
+    Packets are keyed by a checksum of the file content, so each distinct file is only serialized
+    once no matter how many clients request it. The content of a cached packet is compared with
+    the requested content before it is reused, so checksum collisions cannot return the wrong
+    file. Files that are read from disk are checked for changes before each use, and the packet is
+    rebuilt only if their content actually changed.
+
+    When the cache is full, the least recently used packet is evicted.
+
+    A `FileTransferCache` can be shared between threads.
+    """
+
+    _max_size: int
+    _payloads: "OrderedDict[_PayloadKey, bytes]"
+    _files: Dict[Tuple[InitReply, int, str], _FileEntry]
+    _lock: threading.Lock
+
+    def __init__(self, max_size: int = 256):
+        """
+        Creates a new `FileTransferCache` instance.
+
+        Args:
+            max_size (int, optional): The maximum number of packets to cache. Defaults to 256.
+
+        Raises:
+            ValueError: If `max_size` is negative.
+        """
+        if max_size < 0:
+            raise ValueError(f"negative max_size: {max_size}")
+        self._max_size = max_size
+        self._payloads = OrderedDict()
+        self._files = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        """
+        int: Gets the maximum number of packets to cache.
+        """
+        return self._max_size
+
+    def get(self, reply_code: InitReply, content: bytes, file_id: int = 1) -> bytes:
+        """
+        Gets the packet that transfers some file content.
+
+        Args:
+            reply_code (InitReply): The reply code identifying the type of file, which is one of
+                `FileEmf`, `FileEif`, `FileEnf`, `FileEsf` or `FileEcf`.
+            content (bytes): The content of the file.
+            file_id (int, optional): The ID of the pub file, which is ignored for map files.
+                Defaults to 1.
+
+        Returns:
+            bytes: The serialized packet.
+
+        Raises:
+            ValueError: If `reply_code` is not a file reply code, or if the file is too large to fit
+                in a packet.
+        """
+        return self._get(self._payload_key(reply_code, content, file_id), content)
+
+    def get_file(
+        self, reply_code: InitReply, path: Union[str, "os.PathLike[str]"], file_id: int = 1
+    ) -> bytes:
+        """
+        Gets the packet that transfers a file on disk.
+
+        The file is only read if its size or modification time changed since it was last read.
+
+        Args:
+            reply_code (InitReply): The reply code identifying the type of file, which is one of
+                `FileEmf`, `FileEif`, `FileEnf`, `FileEsf` or `FileEcf`.
+            path (Union[str, os.PathLike[str]]): The path to the file.
+            file_id (int, optional): The ID of the pub file, which is ignored for map files.
+                Defaults to 1.
+
+        Returns:
+            bytes: The serialized packet.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If `reply_code` is not a file reply code, or if the file is too large to fit
+                in a packet.
+        """
+        file_key = (reply_code, file_id, os.fspath(path))
+        stat = os.stat(path)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._files.get(file_key)
+            if entry is not None and entry.stat_key == stat_key:
+                self._payloads.move_to_end(entry.payload_key)
+                return entry.payload
+
+        with open(path, "rb") as f:
+            content = f.read()
+        payload_key = self._payload_key(reply_code, content, file_id)
+        payload = self._get(payload_key, content)
+
+        with self._lock:
+            # The packet may already have been evicted, in which case the file is not tracked.
+            if payload_key in self._payloads:
+                self._files[file_key] = _FileEntry(stat_key, payload_key, payload)
+            else:
+                self._files.pop(file_key, None)
+            if entry is not None and entry.payload_key != payload_key:
+                self._discard_if_unused(entry.payload_key)
+        return payload
+
+    def invalidate(self, path: Union[str, "os.PathLike[str]", None] = None) -> None:
+        """
+        Removes cached packets.
+
+        Args:
+            path (Union[str, os.PathLike[str], None], optional): The path to a file whose packets
+                should be removed. Defaults to None, meaning all packets are removed.
+        """
+        with self._lock:
+            if path is None:
+                self._files.clear()
+                self._payloads.clear()
+                return
+            path = os.fspath(path)
+            for file_key in [k for k in self._files if k[2] == path]:
+                self._discard_if_unused(self._files.pop(file_key).payload_key)
+
+    def __len__(self) -> int:
+        """
+        Gets the number of cached packets.
+
+        Returns:
+            int: The number of cached packets.
+        """
+        return len(self._payloads)
+
+    def _get(self, payload_key: _PayloadKey, content: bytes) -> bytes:
+        with self._lock:
+            payload = self._payloads.get(payload_key)
+            if payload is not None and not payload.endswith(content):
+                payload = None
+            if payload is None:
+                reply_code, file_id, _, _ = payload_key
+                payload = build_file_transfer_packet(reply_code, content, file_id)
+                self._payloads[payload_key] = payload
+                self._evict()
+            else:
+                self._payloads.move_to_end(payload_key)
+            return payload
+
+    @staticmethod
+    def _payload_key(reply_code: InitReply, content: bytes, file_id: int) -> _PayloadKey:
+        if reply_code == InitReply.FileEmf:
+            file_id = 0
+        return (reply_code, file_id, len(content), zlib.crc32(content))
+
+    def _evict(self) -> None:
+        while len(self._payloads) > self._max_size:
+            payload_key, _ = self._payloads.popitem(last=False)
+            for file_key in [k for k, e in self._files.items() if e.payload_key == payload_key]:
+                del self._files[file_key]
+
+    def _discard_if_unused(self, payload_key: _PayloadKey) -> None:
+        if all(entry.payload_key != payload_key for entry in self._files.values()):
+            self._payloads.pop(payload_key, None)
+
+
+__all__ = ['build_file_transfer_packet', 'FileTransferCache']
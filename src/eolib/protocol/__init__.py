@@ -6,9 +6,13 @@
 """
 
 from .serialization_error import *
+from .struct_layout import *
+from .lazy_list import *
 
 from .map import *
 from .net import *
 from .pub import *
+from .file_watcher import *
+from .snapshot import *
 
 from ._generated import *
@@ -0,0 +1,369 @@
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+from eolib.data.eo_reader import EoReader
+from eolib.protocol.serialization_error import SerializationError
+from eolib.protocol.map import Emf
+from eolib.protocol.map.emf_section_index import EMF_SECTIONS, EmfSectionIndex
+from eolib.protocol.pub.lazy_record_list import deserialize_lazy
+from eolib.protocol.pub.pub_file_diff import RecordDiff, _diff_indexes
+from eolib.protocol.pub.pub_file_index import _get_pub_file_format
+
+_logger = logging.getLogger(__name__)
+
+
+class FileChangeEvent(NamedTuple):
+    """
+    A change to a pub or map file detected by a `FileWatcher`.
+    """
+
+    path: str
+    """The path to the file, as it was passed to the watcher."""
+
+    old: Optional[Any]
+    """The file before the change, or `None` if the file was created."""
+
+    new: Optional[Any]
+    """The file after the change, or `None` if the file was deleted."""
+
+    changed_fields: Tuple[str, ...]
+    """
+    The names of the top-level fields of the file that changed, such as `items` for an `Eif` or
+    `tile_spec_rows` for an `Emf`.
+
+    Empty if the file was created or deleted.
+    """
+
+    record_diffs: Tuple[RecordDiff, ...]
+    """
+    The records that changed, for pub files.
+
+    Empty for map files, and if the file was created or deleted.
+    """
+
+
+class _WatchedFile:
+    file_type: type
+    stat_key: Optional[Tuple[int, int]]
+    data: Optional[bytes]
+    value: Optional[Any]
+
+    def __init__(self, file_type: type):
+        self.file_type = file_type
+        self.stat_key = None
+        self.data = None
+        self.value = None
+
+
+def _get_field_names(file_type: type) -> List[str]:
+    return [
+        name
+        for name, value in vars(file_type).items()
+        if isinstance(value, property) and name != "byte_size"
+    ]
+
+
+def _to_comparable(value: Any) -> Any:
+    # Generated data structures compare by identity, so they are compared by their fields instead.
+    if isinstance(value, list):
+        return [_to_comparable(element) for element in value]
+    if hasattr(type(value), "serialize"):
+        return [_to_comparable(getattr(value, name)) for name in _get_field_names(type(value))]
+    return value
+
+
+def _diff_fields(
+    file_type: type, old: Any, new: Any, skip: Tuple[str, ...] = ()
+) -> Tuple[str, ...]:
+    return tuple(
+        name
+        for name in _get_field_names(file_type)
+        if name not in skip
+        and _to_comparable(getattr(old, name)) != _to_comparable(getattr(new, name))
+    )
+
+
+class FileWatcher:
+    """
+    Watches pub and map files for changes by polling them.
+
+    Each watched file is checked by comparing its modification time and size. When a file changes,
+    it is reloaded and compared with its previous contents, and a `FileChangeEvent` is published
+    to each listener.
+
+    Pub files are loaded with
+    [`deserialize_lazy`][eolib.protocol.pub.lazy_record_list.deserialize_lazy], and only the
+    records whose serialized bytes changed are deserialized to compare them. For map files, only
+    the sections (and graphic layers) whose serialized bytes changed are deserialized, and the
+    unchanged sections of the new version share their objects with the previous version.
+
+    A file that is modified while it is being read, that cannot be read, or that cannot be
+    deserialized, is retried on the next poll. Files should be replaced atomically (written to a
+    temporary file which is then renamed) so that a partially written file is never loaded.
+
+    Example:
+        ```python
+        watcher = FileWatcher()
+        watcher.watch("pub/dat001.eif", Eif)
+        watcher.watch("maps/00005.emf", Emf)
+        watcher.add_listener(lambda event: print(event.path, event.changed_fields))
+        watcher.start(interval=0.5)
+        ```
+    """
+
+    _files: Dict[str, _WatchedFile]
+    _listeners: List[Callable[[FileChangeEvent], None]]
+    _lock: threading.RLock
+    _stop: Optional[threading.Event]
+    _thread: Optional[threading.Thread]
+
+    def __init__(self):
+        """
+        Creates a new `FileWatcher` instance.
+        """
+        self._files = {}
+        self._listeners = []
+        self._lock = threading.RLock()
+        self._stop = None
+        self._thread = None
+
+    def watch(self, path: Union[str, "os.PathLike[str]"], file_type: type) -> Optional[Any]:
+        """
+        Starts watching a file, loading it if it exists.
+
+        Args:
+            path (Union[str, os.PathLike[str]]): The path to the file.
+            file_type (type): The type of file, which is one of `Eif`, `Enf`, `Esf`, `Ecf` or
+                `Emf`.
+
+        Returns:
+            Optional[Any]: The loaded file, or `None` if it does not exist or cannot be
+                deserialized yet.
+
+        Raises:
+            TypeError: If `file_type` is not a pub or map file type.
+        """
+        if file_type is not Emf:
+            _get_pub_file_format(file_type)
+        path = os.fspath(path)
+        with self._lock:
+            self._files[path] = _WatchedFile(file_type)
+            self._check(path, self._files[path])
+            return self._files[path].value
+
+    def unwatch(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        """
+        Stops watching a file.
+
+        Args:
+            path (Union[str, os.PathLike[str]]): The path to the file.
+        """
+        with self._lock:
+            self._files.pop(os.fspath(path), None)
+
+    def get(self, path: Union[str, "os.PathLike[str]"]) -> Optional[Any]:
+        """
+        Gets the latest version of a watched file.
+
+        Args:
+            path (Union[str, os.PathLike[str]]): The path to the file.
+
+        Returns:
+            Optional[Any]: The file, or `None` if it does not exist or cannot be deserialized.
+
+        Raises:
+            KeyError: If the file is not being watched.
+        """
+        with self._lock:
+            return self._files[os.fspath(path)].value
+
+    def add_listener(self, listener: Callable[[FileChangeEvent], None]) -> None:
+        """
+        Adds a function to call with each `FileChangeEvent`.
+
+        Listeners are called on the thread that polls the files. An exception raised by a listener
+        is logged, and does not prevent the other listeners from being called.
+
+        Args:
+            listener (Callable[[FileChangeEvent], None]): The function to add.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[FileChangeEvent], None]) -> None:
+        """
+        Removes a listener that was previously added.
+
+        Args:
+            listener (Callable[[FileChangeEvent], None]): The function to remove.
+        """
+        with self._lock:
+            self._listeners.remove(listener)
+
+    def poll(self) -> List[FileChangeEvent]:
+        """
+        Checks each watched file for changes, and publishes an event for each change.
+
+        Returns:
+            List[FileChangeEvent]: The published events.
+        """
+        with self._lock:
+            events = []
+            for path, watched_file in list(self._files.items()):
+                event = self._check(path, watched_file)
+                if event is not None:
+                    events.append(event)
+            listeners = list(self._listeners)
+
+        for event in events:
+            for listener in listeners:
+                try:
+                    listener(event)
+                except Exception:
+                    _logger.exception("FileWatcher listener failed for %s", event.path)
+        return events
+
+    def start(self, interval: float = 1.0) -> None:
+        """
+        Starts polling the watched files on a background thread.
+
+        Args:
+            interval (float, optional): The number of seconds between polls. Defaults to 1.0.
+
+        Raises:
+            RuntimeError: If the watcher has already been started.
+        """
+        if self._thread is not None:
+            raise RuntimeError("FileWatcher has already been started.")
+        stop = threading.Event()
+
+        def run() -> None:
+            while not stop.wait(interval):
+                try:
+                    self.poll()
+                except Exception:
+                    # Keep polling, so that later changes are still detected.
+                    _logger.exception("FileWatcher poll failed")
+
+        self._stop = stop
+        self._thread = threading.Thread(target=run, name="FileWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops polling the watched files, waiting for the background thread to finish.
+        """
+        if self._thread is None or self._stop is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._stop = None
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def _check(self, path: str, watched_file: _WatchedFile) -> Optional[FileChangeEvent]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if watched_file.stat_key is None:
+                return None
+            old = watched_file.value
+            watched_file.stat_key = None
+            watched_file.data = None
+            watched_file.value = None
+            return FileChangeEvent(path, old, None, (), ())
+        except OSError:
+            # The file cannot be checked right now, such as when it is not readable.
+            return None
+
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        if stat_key == watched_file.stat_key:
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if (stat.st_mtime_ns, stat.st_size) != stat_key:
+            # The file is still being written.
+            return None
+        if data == watched_file.data:
+            watched_file.stat_key = stat_key
+            return None
+
+        try:
+            if watched_file.file_type is Emf:
+                new, event = self._reload_map(path, watched_file, data)
+            else:
+                new, event = self._reload_pub(path, watched_file, data)
+        except (SerializationError, ValueError, IndexError):
+            return None
+
+        watched_file.stat_key = stat_key
+        watched_file.data = data
+        watched_file.value = new
+        return event
+
+    @staticmethod
+    def _reload_pub(
+        path: str, watched_file: _WatchedFile, data: bytes
+    ) -> Tuple[Any, FileChangeEvent]:
+        file_type = watched_file.file_type
+        old = watched_file.value
+        new = deserialize_lazy(file_type, data)
+        if old is None:
+            return new, FileChangeEvent(path, None, new, (), ())
+
+        records_name = _get_pub_file_format(file_type).records_name
+        record_diffs = tuple(
+            _diff_indexes(
+                getattr(old, records_name).pub_file_index,
+                getattr(new, records_name).pub_file_index,
+            )
+        )
+        changed_fields = _diff_fields(file_type, old, new, skip=(records_name,))
+        if record_diffs:
+            changed_fields += (records_name,)
+        return new, FileChangeEvent(path, old, new, changed_fields, record_diffs)
+
+    @staticmethod
+    def _reload_map(
+        path: str, watched_file: _WatchedFile, data: bytes
+    ) -> Tuple[Any, FileChangeEvent]:
+        old = watched_file.value
+        if old is None or watched_file.data is None:
+            new = Emf.deserialize(EoReader(data))
+            return new, FileChangeEvent(path, None, new, (), ())
+
+        # Sections whose bytes are unchanged keep their previously deserialized objects.
+        old_index = EmfSectionIndex(watched_file.data)
+        new_index = EmfSectionIndex(data)
+        new = new_index.read_header()
+        changed_fields = _diff_fields(Emf, old, new, skip=EMF_SECTIONS)
+        for section in EMF_SECTIONS:
+            if new_index.get_bytes(section) == old_index.get_bytes(section):
+                setattr(new, section, getattr(old, section))
+                continue
+            changed_fields += (section,)
+            if section == "graphic_layers":
+                new.graphic_layers = [
+                    old.graphic_layers[i]
+                    if new_index.get_graphic_layer_bytes(i) == old_index.get_graphic_layer_bytes(i)
+                    else new_index.read_graphic_layer(i)
+                    for i in range(len(old.graphic_layers))
+                ]
+            else:
+                setattr(new, section, new_index.read_section(section))
+        new._byte_size = len(data)
+        return new, FileChangeEvent(path, old, new, changed_fields, ())
+
+
+__all__ = ['FileChangeEvent', 'FileWatcher']
@@ -0,0 +1,117 @@
+from abc import abstractmethod
+from typing import Any, Iterable, Iterator, List, MutableSequence, TypeVar, Union, overload
+
+T = TypeVar("T")
+
+
+class LazyList(MutableSequence[T]):
+    """
+    A list of items that are loaded on first access.
+
+    Items that have not been loaded yet are held as integer slots, which identify the item to
+    load. When an item is first accessed, its slot is passed to `_materialize` and the loaded item
+    is stored in the list in its place. Items can be added, replaced and removed like in any other
+    list.
+
+    Subclasses implement `_materialize` to load an item from its slot.
+    """
+
+    _slots: List[Any]
+
+    def __init__(self, slots: Iterable[int]):
+        """
+        Creates a new `LazyList` instance.
+
+        Args:
+            slots (Iterable[int]): The slot of each item that has not been loaded yet.
+        """
+        self._slots = list(slots)
+
+    @property
+    def materialized_count(self) -> int:
+        """
+        int: Gets the number of items in the list that have been loaded or added.
+        """
+        return sum(1 for slot in self._slots if not isinstance(slot, int))
+
+    def is_materialized(self, index: int) -> bool:
+        """
+        Checks if the item at an index has been loaded or added.
+
+        Args:
+            index (int): The index of the item in the list.
+
+        Returns:
+            bool: True if the item at the index is held as an object.
+        """
+        return not isinstance(self._slots[index], int)
+
+    @abstractmethod
+    def _materialize(self, slot: int) -> T:
+        """
+        Loads the item identified by a slot.
+
+        Args:
+            slot (int): The slot of the item.
+
+        Returns:
+            T: The loaded item.
+        """
+        raise NotImplementedError()
+
+    @overload
+    def __getitem__(self, index: int) -> T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._slots)))]
+        slot = self._slots[index]
+        if isinstance(slot, int):
+            slot = self._materialize(slot)
+            self._slots[index] = slot
+        return slot
+
+    @overload
+    def __setitem__(self, index: int, value: T) -> None:
+        ...
+
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[T]) -> None:
+        ...
+
+    def __setitem__(self, index: Union[int, slice], value: Any) -> None:
+        self._slots[index] = list(value) if isinstance(index, slice) else value
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        del self._slots[index]
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __iter__(self) -> Iterator[T]:
+        for i in range(len(self._slots)):
+            yield self[i]
+
+    def insert(self, index: int, value: T) -> None:
+        """
+        Inserts an item before an index.
+
+        Args:
+            index (int): The index to insert the item before.
+            value (T): The item to insert.
+        """
+        self._slots.insert(index, value)
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}({len(self._slots)} items, "
+            f"{self.materialized_count} materialized)"
+        )
+
+
+__all__ = ['LazyList']
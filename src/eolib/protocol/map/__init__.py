@@ -6,3 +6,11 @@
 """
 
 from .._generated.map import *
+from .emf_section_index import *
+from .map_grid import *
+from .map_pathfinding import *
+from .map_spatial_index import *
+from .map_line_of_sight import *
+from .emf_cache import *
+from .lazy_graphic_layer_list import *
+from .map_loading import *
@@ -0,0 +1,296 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, List, NamedTuple, Optional, Union
+from eolib.data.eo_reader import EoReader
+from eolib.protocol.map import Emf
+
+
+def emf_memory_size(emf: Emf) -> int:
+    """
+    Measures the memory used by a deserialized `Emf`.
+
+    The result is the sum of `sys.getsizeof` for the `Emf` and every object reachable from its
+    fields, including the attribute dictionaries of the generated data structures. Each object is
+    counted once, and objects that are shared with the rest of the interpreter, such as enum
+    members, `None`, booleans and small integers, are not counted.
+
+    Args:
+        emf (Emf): The map to measure.
+
+    Returns:
+        int: The size of the map in bytes.
+    """
+    getsizeof = sys.getsizeof
+    size = 0
+    seen = set()
+    pending: List[Any] = [emf]
+    while pending:
+        value = pending.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        size += getsizeof(value)
+        if type(value) is list:
+            children = value
+        else:
+            children = vars(value)
+            size += getsizeof(children)
+            children = children.values()
+        for child in children:
+            child_type = type(child)
+            if child_type is int:
+                # Integers are not deduplicated, since deserialization creates one for each field.
+                if not -5 <= child <= 256:
+                    size += getsizeof(child)
+            elif child_type is list or hasattr(child, "__dict__"):
+                if not isinstance(child, Enum):
+                    pending.append(child)
+            elif child is not None and child_type is not bool and id(child) not in seen:
+                seen.add(id(child))
+                size += getsizeof(child)
+    return size
+
+
+class _CacheEntry(NamedTuple):
+    emf: Emf
+    size: int
+
+
+class EmfCache:
+    """
+    A cache of deserialized maps that loads maps on demand and evicts the least recently used maps
+    to stay within a memory budget.
+
+    Maps are loaded from a directory of EMF files named by their map ID, such as `00005.emf`. Each
+    file is memory-mapped while it is deserialized, and the memory used by the deserialized map is
+    measured with [`emf_memory_size`][eolib.protocol.map.emf_cache.emf_memory_size].
+
+    When the total size of the cached maps exceeds the budget, the least recently used maps are
+    evicted until it no longer does. The most recently loaded map is never evicted, even if it is
+    larger than the budget on its own.
+
+    An `EmfCache` can be shared between threads.
+
+    Example:
+        ```python
+        cache = EmfCache("maps", max_bytes=64 * 1024 * 1024)
+        emf = cache.get(5)
+        print(cache.hit_rate, cache.memory_size)
+        ```
+    """
+
+    _directory: str
+    _max_bytes: int
+    _entries: "OrderedDict[int, _CacheEntry]"
+    _memory_size: int
+    _hits: int
+    _misses: int
+    _evictions: int
+    _lock: threading.Lock
+
+    def __init__(self, directory: Union[str, "os.PathLike[str]"], max_bytes: int):
+        """
+        Creates a new `EmfCache` instance.
+
+        Args:
+            directory (Union[str, os.PathLike[str]]): The directory containing the EMF files.
+            max_bytes (int): The maximum total size in bytes of the cached maps, as measured by
+                `emf_memory_size`.
+
+        Raises:
+            ValueError: If `max_bytes` is negative.
+        """
+        if max_bytes < 0:
+            raise ValueError(f"negative max_bytes: {max_bytes}")
+        self._directory = os.fspath(directory)
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._memory_size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        """
+        str: Gets the directory containing the EMF files.
+        """
+        return self._directory
+
+    @property
+    def max_bytes(self) -> int:
+        """
+        int: Gets the maximum total size in bytes of the cached maps.
+        """
+        return self._max_bytes
+
+    @property
+    def memory_size(self) -> int:
+        """
+        int: Gets the total size in bytes of the cached maps.
+        """
+        return self._memory_size
+
+    @property
+    def hits(self) -> int:
+        """
+        int: Gets the number of lookups that found a cached map.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        int: Gets the number of lookups that had to load a map.
+        """
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """
+        int: Gets the number of maps that have been evicted from the cache.
+        """
+        return self._evictions
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        float: Gets the fraction of lookups that found a cached map, or 0 if there have been no
+            lookups.
+        """
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups else 0.0
+
+    def path(self, map_id: int) -> str:
+        """
+        Gets the path to the EMF file of a map.
+
+        Args:
+            map_id (int): The ID of the map.
+
+        Returns:
+            str: The path to the EMF file.
+        """
+        return os.path.join(self._directory, f"{map_id:05d}.emf")
+
+    def get(self, map_id: int) -> Emf:
+        """
+        Gets a map, loading it if it is not cached, and marks it as the most recently used.
+
+        Args:
+            map_id (int): The ID of the map.
+
+        Returns:
+            Emf: The map.
+
+        Raises:
+            OSError: If the map is not cached and its file cannot be read.
+            SerializationError: If the map is not cached and its file cannot be deserialized.
+        """
+        with self._lock:
+            entry = self._entries.get(map_id)
+            if entry is not None:
+                self._hits += 1
+                self._entries.move_to_end(map_id)
+                return entry.emf
+            self._misses += 1
+
+        with EoReader.from_file(self.path(map_id)) as reader:
+            emf = Emf.deserialize(reader)
+        size = emf_memory_size(emf)
+
+        with self._lock:
+            existing = self._entries.pop(map_id, None)
+            if existing is not None:
+                self._memory_size -= existing.size
+            self._entries[map_id] = _CacheEntry(emf, size)
+            self._memory_size += size
+            while self._memory_size > self._max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_size -= evicted.size
+                self._evictions += 1
+        return emf
+
+    def peek(self, map_id: int) -> Optional[Emf]:
+        """
+        Gets a map if it is cached, without loading it or changing the order of eviction.
+
+        Args:
+            map_id (int): The ID of the map.
+
+        Returns:
+            Optional[Emf]: The map, or `None` if it is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(map_id)
+            return None if entry is None else entry.emf
+
+    def size_of(self, map_id: int) -> Optional[int]:
+        """
+        Gets the size of a cached map.
+
+        Args:
+            map_id (int): The ID of the map.
+
+        Returns:
+            Optional[int]: The size of the map in bytes, or `None` if it is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(map_id)
+            return None if entry is None else entry.size
+
+    def invalidate(self, map_id: Optional[int] = None) -> None:
+        """
+        Removes cached maps, such as after their files have changed.
+
+        Removed maps are not counted as evictions.
+
+        Args:
+            map_id (Optional[int], optional): The ID of the map to remove. Defaults to None,
+                meaning all maps are removed.
+        """
+        with self._lock:
+            if map_id is None:
+                self._entries.clear()
+                self._memory_size = 0
+                return
+            entry = self._entries.pop(map_id, None)
+            if entry is not None:
+                self._memory_size -= entry.size
+
+    def reset_stats(self) -> None:
+        """
+        Resets the hit, miss and eviction counters.
+        """
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def __contains__(self, map_id: object) -> bool:
+        """
+        Checks if a map is cached.
+
+        Args:
+            map_id (object): The ID of the map.
+
+        Returns:
+            bool: True if the map is cached.
+        """
+        return map_id in self._entries
+
+    def __len__(self) -> int:
+        """
+        Gets the number of cached maps.
+
+        Returns:
+            int: The number of cached maps.
+        """
+        return len(self._entries)
+
+
+__all__ = ['emf_memory_size', 'EmfCache']
@@ -0,0 +1,233 @@
+from typing import Any, Dict, List, Tuple
+from eolib.data.eo_reader import EoReader
+from eolib.data.number_encoding_utils import decode_number
+from eolib.protocol.map import (
+    Emf,
+    MapGraphicLayer,
+    MapItem,
+    MapLegacyDoorKey,
+    MapNpc,
+    MapSign,
+    MapTileSpecRow,
+    MapWarpRow,
+)
+
+EMF_SECTIONS: Tuple[str, ...] = (
+    "npcs",
+    "legacy_door_keys",
+    "items",
+    "tile_spec_rows",
+    "warp_rows",
+    "graphic_layers",
+    "signs",
+)
+"""
+The names of the sections of an EMF file that follow its header, in file order.
+
+Each name is also the name of the `Emf` field holding the section.
+"""
+
+_HEADER_SIZE = 46
+_GRAPHIC_LAYER_COUNT = 9
+
+_ENTITY_SIZES = {"npcs": 8, "legacy_door_keys": 4, "items": 12}
+_ROW_TILE_SIZES = {"tile_spec_rows": 2, "warp_rows": 8}
+
+_ELEMENT_TYPES: Dict[str, Any] = {
+    "npcs": MapNpc,
+    "legacy_door_keys": MapLegacyDoorKey,
+    "items": MapItem,
+    "tile_spec_rows": MapTileSpecRow,
+    "warp_rows": MapWarpRow,
+    "signs": MapSign,
+}
+
+
+class EmfSectionIndex:
+    """
+    An index of the byte spans of each section of a serialized EMF file.
+
+    The spans are found by reading only the counts and lengths in the file, without deserializing
+    it. Sections can then be compared by their serialized bytes, and deserialized individually.
+    """
+
+    _data: memoryview
+    _spans: Dict[str, Tuple[int, int]]
+    _graphic_layer_spans: List[Tuple[int, int]]
+
+    def __init__(self, data: bytes):
+        """
+        Creates a new `EmfSectionIndex` instance.
+
+        Args:
+            data (bytes): The serialized EMF file. Any object supporting the buffer protocol can be
+                used, including an `mmap`.
+        """
+        self._data = memoryview(data)
+        self._spans = {}
+        self._graphic_layer_spans = []
+
+        view = self._data
+        end = len(view)
+
+        def get_number(position: int, size: int) -> int:
+            return decode_number(view[position : position + size])  # type: ignore [arg-type]
+
+        position = min(_HEADER_SIZE, end)
+        for section in EMF_SECTIONS:
+            start = position
+            if section == "graphic_layers":
+                for _ in range(_GRAPHIC_LAYER_COUNT):
+                    layer_start = position
+                    position = self._skip_rows(get_number, position, 3)
+                    self._graphic_layer_spans.append((layer_start, min(position, end)))
+            elif section == "signs":
+                count = get_number(position, 1)
+                position += 1
+                for _ in range(count):
+                    position += 5 + get_number(position + 2, 2) - 1
+            elif section in _ROW_TILE_SIZES:
+                position = self._skip_rows(get_number, position, _ROW_TILE_SIZES[section])
+            else:
+                position += 1 + get_number(position, 1) * _ENTITY_SIZES[section]
+            position = min(position, end)
+            self._spans[section] = (start, position)
+
+    @staticmethod
+    def _skip_rows(get_number: Any, position: int, tile_size: int) -> int:
+        count = get_number(position, 1)
+        position += 1
+        for _ in range(count):
+            position += 2 + get_number(position + 1, 1) * tile_size
+        return position
+
+    def __reduce__(self) -> Tuple[Any, Tuple[bytes]]:
+        # Memory views cannot be pickled, so the data is pickled as bytes.
+        return (EmfSectionIndex, (self._data.tobytes(),))
+
+    @property
+    def header_span(self) -> Tuple[int, int]:
+        """
+        Tuple[int, int]: Gets the start and end positions of the header, which holds every field
+            of `Emf` that is not in a section.
+        """
+        return (0, min(_HEADER_SIZE, len(self._data)))
+
+    def span(self, section: str) -> Tuple[int, int]:
+        """
+        Gets the start and end positions of a section, including its count.
+
+        Args:
+            section (str): The name of the section, which is one of `EMF_SECTIONS`.
+
+        Returns:
+            Tuple[int, int]: The start and end positions of the section.
+
+        Raises:
+            KeyError: If `section` is not the name of a section.
+        """
+        return self._spans[section]
+
+    def graphic_layer_span(self, layer: int) -> Tuple[int, int]:
+        """
+        Gets the start and end positions of a graphic layer.
+
+        Args:
+            layer (int): The index of the graphic layer, from 0 to 8.
+
+        Returns:
+            Tuple[int, int]: The start and end positions of the graphic layer.
+
+        Raises:
+            IndexError: If `layer` is out of range.
+        """
+        return self._graphic_layer_spans[layer]
+
+    def get_bytes(self, section: str) -> memoryview:
+        """
+        Gets the serialized bytes of a section without copying them.
+
+        Args:
+            section (str): The name of the section, which is one of `EMF_SECTIONS`.
+
+        Returns:
+            memoryview: The serialized section.
+
+        Raises:
+            KeyError: If `section` is not the name of a section.
+        """
+        start, end = self._spans[section]
+        return self._data[start:end]
+
+    def get_graphic_layer_bytes(self, layer: int) -> memoryview:
+        """
+        Gets the serialized bytes of a graphic layer without copying them.
+
+        Args:
+            layer (int): The index of the graphic layer, from 0 to 8.
+
+        Returns:
+            memoryview: The serialized graphic layer.
+
+        Raises:
+            IndexError: If `layer` is out of range.
+        """
+        start, end = self._graphic_layer_spans[layer]
+        return self._data[start:end]
+
+    def read_header(self) -> Emf:
+        """
+        Deserializes the header of the EMF file.
+
+        Returns:
+            Emf: An `Emf` with the header fields set, and every section empty.
+        """
+        start, end = self.header_span
+        emf = Emf.deserialize(EoReader(self._data[start:end]))  # type: ignore [arg-type]
+        emf.graphic_layers = [self._empty_graphic_layer() for _ in range(_GRAPHIC_LAYER_COUNT)]
+        return emf
+
+    def read_section(self, section: str) -> List[Any]:
+        """
+        Deserializes a section.
+
+        Args:
+            section (str): The name of the section, which is one of `EMF_SECTIONS`.
+
+        Returns:
+            List[Any]: The elements of the section, which can be assigned to the `Emf` field with
+                the same name.
+
+        Raises:
+            KeyError: If `section` is not the name of a section.
+        """
+        if section == "graphic_layers":
+            return [self.read_graphic_layer(i) for i in range(_GRAPHIC_LAYER_COUNT)]
+        element_type = _ELEMENT_TYPES[section]
+        reader = EoReader(self.get_bytes(section))  # type: ignore [arg-type]
+        return [element_type.deserialize(reader) for _ in range(reader.get_char())]
+
+    def read_graphic_layer(self, layer: int) -> MapGraphicLayer:
+        """
+        Deserializes a graphic layer.
+
+        Args:
+            layer (int): The index of the graphic layer, from 0 to 8.
+
+        Returns:
+            MapGraphicLayer: The graphic layer.
+
+        Raises:
+            IndexError: If `layer` is out of range.
+        """
+        reader = EoReader(self.get_graphic_layer_bytes(layer))  # type: ignore [arg-type]
+        return MapGraphicLayer.deserialize(reader)
+
+    @staticmethod
+    def _empty_graphic_layer() -> MapGraphicLayer:
+        layer = MapGraphicLayer()
+        layer.graphic_rows = []
+        return layer
+
+
+__all__ = ['EMF_SECTIONS', 'EmfSectionIndex']
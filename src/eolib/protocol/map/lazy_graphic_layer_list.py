@@ -0,0 +1,68 @@
+from eolib.protocol.lazy_list import LazyList
+from eolib.protocol.map import Emf, MapGraphicLayer
+from eolib.protocol.map.emf_section_index import (
+    _GRAPHIC_LAYER_COUNT,
+    EMF_SECTIONS,
+    EmfSectionIndex,
+)
+
+
+class LazyGraphicLayerList(LazyList[MapGraphicLayer]):
+    """
+    A list of the graphic layers of a map that are deserialized on first access.
+
+    Graphic layers are kept as spans of the underlying EMF file until they are accessed, after
+    which the deserialized layer is stored in the list. A `LazyGraphicLayerList` can be used
+    wherever the `graphic_layers` list of a generated `Emf` is expected, including when
+    serializing.
+    """
+
+    _index: EmfSectionIndex
+
+    def __init__(self, index: EmfSectionIndex):
+        """
+        Creates a new `LazyGraphicLayerList` instance.
+
+        Args:
+            index (EmfSectionIndex): The index of the EMF file to load graphic layers from.
+        """
+        super().__init__(range(_GRAPHIC_LAYER_COUNT))
+        self._index = index
+
+    @property
+    def section_index(self) -> EmfSectionIndex:
+        """
+        EmfSectionIndex: Gets the index of the EMF file that graphic layers are loaded from.
+        """
+        return self._index
+
+    def _materialize(self, slot: int) -> MapGraphicLayer:
+        return self._index.read_graphic_layer(slot)
+
+
+def deserialize_emf_lazy(data: bytes) -> Emf:
+    """
+    Deserializes an EMF file, deferring the deserialization of each graphic layer until it is
+    accessed.
+
+    Every other section is deserialized immediately. The graphic layers of the returned map are
+    held in a `LazyGraphicLayerList`, which keeps a reference to `data`.
+
+    Args:
+        data (bytes): The serialized EMF file. Any object supporting the buffer protocol can be
+            used, including an `mmap`, which must stay open while the map is in use.
+
+    Returns:
+        Emf: The deserialized map.
+    """
+    index = EmfSectionIndex(data)
+    result = index.read_header()
+    for section in EMF_SECTIONS:
+        if section != "graphic_layers":
+            setattr(result, section, index.read_section(section))
+    result.graphic_layers = LazyGraphicLayerList(index)  # type: ignore [assignment]
+    result._byte_size = len(memoryview(data))
+    return result
+
+
+__all__ = ['LazyGraphicLayerList', 'deserialize_emf_lazy']
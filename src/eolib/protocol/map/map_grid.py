@@ -0,0 +1,353 @@
+from array import array
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from eolib.protocol.map import (
+    Emf,
+    MapGraphicLayer,
+    MapGraphicRow,
+    MapGraphicRowTile,
+    MapTileSpec,
+    MapTileSpecRow,
+    MapTileSpecRowTile,
+    MapWarp,
+    MapWarpRow,
+    MapWarpRowTile,
+)
+
+NO_TILE_SPEC = 0xFF
+"""The value of a tile in `MapGrid.tile_specs` that has no tile spec."""
+
+NO_GRAPHIC = 0xFFFF
+"""The value of a tile in `MapGrid.graphic_layer` that has no graphic."""
+
+
+class MapGrid:
+    """
+    A dense grid view of the tile specs, warps and graphic layers of an `Emf`.
+
+    Each grid is a flat array indexed by `y * width + x`, so looking up what is at a tile takes
+    constant time instead of scanning the rows of the `Emf`.
+
+    The grid covers the map from (0, 0) to (`Emf.width`, `Emf.height`), extended to include any
+    tile that lies outside of those bounds in the `Emf`. The other fields of the `Emf` are not
+    part of the grid, and are copied from the original `Emf` by `to_emf`.
+    """
+
+    _emf: Emf
+    _width: int
+    _height: int
+    _tile_specs: bytearray
+    _warp_slots: array
+    _warps: List[Optional[MapWarp]]
+    _graphic_layers: List[array]
+
+    def __init__(self, emf: Emf):
+        """
+        Creates a new `MapGrid` instance from an `Emf`.
+
+        Args:
+            emf (Emf): The map to create a grid view of.
+        """
+        self._emf = emf
+
+        def row_bounds(rows: Iterable[Any]) -> Tuple[int, int]:
+            width = height = 0
+            for row in rows:
+                height = max(height, row.y + 1)
+                for tile in row.tiles:
+                    width = max(width, tile.x + 1)
+            return width, height
+
+        width, height = emf.width + 1, emf.height + 1
+        all_rows: List[Iterable[Any]] = [emf.tile_spec_rows, emf.warp_rows]
+        all_rows.extend(layer.graphic_rows for layer in emf.graphic_layers)
+        for rows in all_rows:
+            rows_width, rows_height = row_bounds(rows)
+            width = max(width, rows_width)
+            height = max(height, rows_height)
+        self._width = width
+        self._height = height
+
+        size = width * height
+        self._tile_specs = bytearray([NO_TILE_SPEC]) * size
+        for tile_spec_row in emf.tile_spec_rows:
+            offset = tile_spec_row.y * width
+            for tile_spec_tile in tile_spec_row.tiles:
+                self._tile_specs[offset + tile_spec_tile.x] = int(tile_spec_tile.tile_spec)
+
+        self._warp_slots = array("H", bytes(2 * size))
+        self._warps = [None]
+        for warp_row in emf.warp_rows:
+            offset = warp_row.y * width
+            for warp_tile in warp_row.tiles:
+                self._warp_slots[offset + warp_tile.x] = len(self._warps)
+                self._warps.append(warp_tile.warp)
+
+        self._graphic_layers = []
+        for layer in emf.graphic_layers:
+            grid = array("H", [NO_GRAPHIC]) * size
+            for row in layer.graphic_rows:
+                offset = row.y * width
+                for tile in row.tiles:
+                    grid[offset + tile.x] = tile.graphic
+            self._graphic_layers.append(grid)
+
+    @property
+    def emf(self) -> Emf:
+        """
+        Emf: Gets the map that the grid was created from.
+        """
+        return self._emf
+
+    @property
+    def width(self) -> int:
+        """
+        int: Gets the number of tiles in each row of the grid.
+        """
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """
+        int: Gets the number of rows in the grid.
+        """
+        return self._height
+
+    @property
+    def tile_specs(self) -> bytearray:
+        """
+        bytearray: Gets the tile spec of each tile, indexed by `y * width + x`.
+
+        Tiles without a tile spec have the value `NO_TILE_SPEC`.
+        """
+        return self._tile_specs
+
+    def graphic_layer(self, layer: int) -> array:
+        """
+        Gets the graphics of a layer.
+
+        Args:
+            layer (int): The index of the graphic layer, from 0 to 8.
+
+        Returns:
+            array: The graphic of each tile, indexed by `y * width + x`. Tiles without a graphic
+                have the value `NO_GRAPHIC`.
+
+        Raises:
+            IndexError: If `layer` is out of range.
+        """
+        return self._graphic_layers[layer]
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        """
+        Checks if a tile is inside the grid.
+
+        Args:
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+
+        Returns:
+            bool: True if the tile is inside the grid.
+        """
+        return 0 <= x < self._width and 0 <= y < self._height
+
+    def get_tile_spec(self, x: int, y: int) -> Optional[MapTileSpec]:
+        """
+        Gets the tile spec of a tile.
+
+        Args:
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+
+        Returns:
+            Optional[MapTileSpec]: The tile spec, or `None` if the tile has no tile spec or is
+                outside the grid.
+        """
+        if not self.in_bounds(x, y):
+            return None
+        value = self._tile_specs[y * self._width + x]
+        return None if value == NO_TILE_SPEC else MapTileSpec(value)
+
+    def set_tile_spec(self, x: int, y: int, tile_spec: Optional[MapTileSpec]) -> None:
+        """
+        Sets the tile spec of a tile.
+
+        Args:
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+            tile_spec (Optional[MapTileSpec]): The tile spec, or `None` to remove it.
+
+        Raises:
+            IndexError: If the tile is outside the grid.
+        """
+        self._tile_specs[self._index(x, y)] = NO_TILE_SPEC if tile_spec is None else int(tile_spec)
+
+    def get_warp(self, x: int, y: int) -> Optional[MapWarp]:
+        """
+        Gets the warp on a tile.
+
+        Args:
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+
+        Returns:
+            Optional[MapWarp]: The warp, or `None` if the tile has no warp or is outside the grid.
+        """
+        if not self.in_bounds(x, y):
+            return None
+        return self._warps[self._warp_slots[y * self._width + x]]
+
+    def set_warp(self, x: int, y: int, warp: Optional[MapWarp]) -> None:
+        """
+        Sets the warp on a tile.
+
+        Args:
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+            warp (Optional[MapWarp]): The warp, or `None` to remove it.
+
+        Raises:
+            IndexError: If the tile is outside the grid.
+        """
+        index = self._index(x, y)
+        slot = self._warp_slots[index]
+        if warp is None:
+            if slot:
+                self._warps[slot] = None
+                self._warp_slots[index] = 0
+        elif slot:
+            self._warps[slot] = warp
+        else:
+            self._warp_slots[index] = len(self._warps)
+            self._warps.append(warp)
+
+    def warps(self) -> Iterator[Tuple[int, int, MapWarp]]:
+        """
+        Iterates over the warps in the grid.
+
+        Yields:
+            Tuple[int, int, MapWarp]: The x and y coordinates of each tile with a warp, and its
+                warp, in order of y and then x coordinates.
+        """
+        width = self._width
+        for index, slot in enumerate(self._warp_slots):
+            if slot:
+                y, x = divmod(index, width)
+                yield x, y, self._warps[slot]
+
+    def get_graphic(self, layer: int, x: int, y: int) -> Optional[int]:
+        """
+        Gets the graphic of a tile in a graphic layer.
+
+        Args:
+            layer (int): The index of the graphic layer, from 0 to 8.
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+
+        Returns:
+            Optional[int]: The graphic ID, or `None` if the tile has no graphic or is outside the
+                grid.
+
+        Raises:
+            IndexError: If `layer` is out of range.
+        """
+        grid = self._graphic_layers[layer]
+        if not self.in_bounds(x, y):
+            return None
+        value = grid[y * self._width + x]
+        return None if value == NO_GRAPHIC else value
+
+    def set_graphic(self, layer: int, x: int, y: int, graphic: Optional[int]) -> None:
+        """
+        Sets the graphic of a tile in a graphic layer.
+
+        Args:
+            layer (int): The index of the graphic layer, from 0 to 8.
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+            graphic (Optional[int]): The graphic ID, or `None` to remove it.
+
+        Raises:
+            IndexError: If `layer` is out of range, or the tile is outside the grid.
+        """
+        self._graphic_layers[layer][self._index(x, y)] = NO_GRAPHIC if graphic is None else graphic
+
+    def to_emf(self) -> Emf:
+        """
+        Creates an `Emf` from the grid.
+
+        The tile spec, warp and graphic rows are rebuilt from the grid, in order of y and then x
+        coordinates. Every other field is copied from the `Emf` that the grid was created from.
+
+        Returns:
+            Emf: The map.
+        """
+        result = Emf()
+        for name, value in vars(Emf).items():
+            if isinstance(value, property) and value.fset is not None:
+                field = getattr(self._emf, name)
+                setattr(result, name, list(field) if isinstance(field, list) else field)
+
+        width = self._width
+        tile_spec_rows: List[MapTileSpecRow] = []
+        warp_rows: List[MapWarpRow] = []
+        for y in range(self._height):
+            offset = y * width
+            tile_spec_tiles = []
+            warp_tiles = []
+            for x in range(width):
+                tile_spec = self._tile_specs[offset + x]
+                if tile_spec != NO_TILE_SPEC:
+                    tile_spec_tile = MapTileSpecRowTile()
+                    tile_spec_tile.x = x
+                    tile_spec_tile.tile_spec = MapTileSpec(tile_spec)
+                    tile_spec_tiles.append(tile_spec_tile)
+                slot = self._warp_slots[offset + x]
+                if slot:
+                    warp_tile = MapWarpRowTile()
+                    warp_tile.x = x
+                    warp_tile.warp = self._warps[slot]
+                    warp_tiles.append(warp_tile)
+            if tile_spec_tiles:
+                tile_spec_row = MapTileSpecRow()
+                tile_spec_row.y = y
+                tile_spec_row.tiles = tile_spec_tiles
+                tile_spec_rows.append(tile_spec_row)
+            if warp_tiles:
+                warp_row = MapWarpRow()
+                warp_row.y = y
+                warp_row.tiles = warp_tiles
+                warp_rows.append(warp_row)
+
+        result.tile_spec_rows = tile_spec_rows
+        result.warp_rows = warp_rows
+        result.graphic_layers = [self._to_graphic_layer(grid) for grid in self._graphic_layers]
+        return result
+
+    def _to_graphic_layer(self, grid: array) -> MapGraphicLayer:
+        width = self._width
+        rows: List[MapGraphicRow] = []
+        for y in range(self._height):
+            offset = y * width
+            tiles = []
+            for x, graphic in enumerate(grid[offset : offset + width]):
+                if graphic != NO_GRAPHIC:
+                    tile = MapGraphicRowTile()
+                    tile.x = x
+                    tile.graphic = graphic
+                    tiles.append(tile)
+            if tiles:
+                row = MapGraphicRow()
+                row.y = y
+                row.tiles = tiles
+                rows.append(row)
+        layer = MapGraphicLayer()
+        layer.graphic_rows = rows
+        return layer
+
+    def _index(self, x: int, y: int) -> int:
+        if not self.in_bounds(x, y):
+            raise IndexError(f"tile ({x}, {y}) is outside the {self._width}x{self._height} grid")
+        return y * self._width + x
+
+
+__all__ = ['NO_TILE_SPEC', 'NO_GRAPHIC', 'MapGrid']
@@ -0,0 +1,239 @@
+from itertools import chain
+from typing import FrozenSet, Iterable, Iterator, Optional, Tuple, Union
+from eolib.protocol.map import MapTileSpec
+from eolib.protocol.map.map_grid import MapGrid
+from eolib.protocol.map.map_pathfinding import build_walkability
+
+SIGHT_BLOCKING_TILE_SPECS: FrozenSet[MapTileSpec] = frozenset([MapTileSpec.Wall, MapTileSpec.Edge])
+"""The tile specs that cannot be seen or shot through."""
+
+
+def row_spans_in_range(
+    x: int, y: int, distance: int, width: int, height: int
+) -> Iterator[Tuple[int, int, int]]:
+    """
+    Iterates over the rows of tiles within a number of steps of a tile.
+
+    The distance between two tiles is the number of steps between them, which is the sum of the
+    differences between their x and y coordinates. Only one tuple is created for each row, rather
+    than one for each tile.
+
+    Args:
+        x (int): The x coordinate of the tile.
+        y (int): The y coordinate of the tile.
+        distance (int): The maximum number of steps from the tile, inclusive.
+        width (int): The number of tiles in each row of the map.
+        height (int): The number of rows in the map.
+
+    Yields:
+        Tuple[int, int, int]: The y coordinate of each row, and the smallest and largest x
+            coordinates of the tiles in range in that row, inclusive. Rows are clipped to the map,
+            and rows without any tiles on the map are skipped.
+    """
+    for row_y in range(max(0, y - distance), min(height - 1, y + distance) + 1):
+        reach = distance - abs(row_y - y)
+        left = max(0, x - reach)
+        right = min(width - 1, x + reach)
+        if left <= right:
+            yield row_y, left, right
+
+
+def tile_indices_in_range(x: int, y: int, distance: int, width: int, height: int) -> Iterator[int]:
+    """
+    Iterates over the tiles within a number of steps of a tile.
+
+    Args:
+        x (int): The x coordinate of the tile.
+        y (int): The y coordinate of the tile.
+        distance (int): The maximum number of steps from the tile, inclusive.
+        width (int): The number of tiles in each row of the map.
+        height (int): The number of rows in the map.
+
+    Returns:
+        Iterator[int]: The index of each tile in range, which is `y * width + x`, in order of y and
+            then x coordinates. Tiles outside the map are skipped.
+    """
+    return chain.from_iterable(
+        range(row_y * width + left, row_y * width + right + 1)
+        for row_y, left, right in row_spans_in_range(x, y, distance, width, height)
+    )
+
+
+class LineOfSight:
+    """
+    Checks whether tiles on a map can be seen from each other, such as to validate spells and
+    ranged attacks.
+
+    Lines are traced between the centers of tiles using Bresenham's line algorithm over a bitmap of
+    the tiles that can be seen through, which is built once for each map.
+
+    Example:
+        ```python
+        sight = LineOfSight.from_grid(MapGrid(emf))
+        if sight.has_line_of_sight((3, 4), (8, 6)):
+            ...
+        ```
+    """
+
+    _width: int
+    _height: int
+    _transparent: bytearray
+
+    def __init__(self, transparent: Union[bytes, bytearray, memoryview], width: int, height: int):
+        """
+        Creates a new `LineOfSight` instance.
+
+        Args:
+            transparent (Union[bytes, bytearray, memoryview]): 1 for each tile that can be
+                seen through, and 0 otherwise, indexed by `y * width + x`.
+            width (int): The number of tiles in each row of the map.
+            height (int): The number of rows in the map.
+
+        Raises:
+            ValueError: If the length of `transparent` is not `width * height`.
+        """
+        if len(transparent) != width * height:
+            raise ValueError(f"expected {width * height} tiles, got {len(transparent)}")
+        self._width = width
+        self._height = height
+        self._transparent = bytearray(transparent)
+
+    @staticmethod
+    def from_grid(
+        grid: MapGrid, blocking_tile_specs: Optional[Iterable[MapTileSpec]] = None
+    ) -> "LineOfSight":
+        """
+        Creates a `LineOfSight` for a map.
+
+        Args:
+            grid (MapGrid): The grid view of the map.
+            blocking_tile_specs (Optional[Iterable[MapTileSpec]], optional): The tile specs that
+                cannot be seen through. Defaults to None, meaning `SIGHT_BLOCKING_TILE_SPECS`.
+
+        Returns:
+            LineOfSight: The line of sight checker.
+        """
+        if blocking_tile_specs is None:
+            blocking_tile_specs = SIGHT_BLOCKING_TILE_SPECS
+        transparent = build_walkability(grid, blocking_tile_specs, block_doors=False)
+        return LineOfSight(transparent, grid.width, grid.height)
+
+    @property
+    def width(self) -> int:
+        """
+        int: Gets the number of tiles in each row of the map.
+        """
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """
+        int: Gets the number of rows in the map.
+        """
+        return self._height
+
+    def is_transparent(self, x: int, y: int) -> bool:
+        """
+        Checks if a tile can be seen through.
+
+        Args:
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+
+        Returns:
+            bool: True if the tile is on the map and can be seen through.
+        """
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return False
+        return self._transparent[y * self._width + x] != 0
+
+    def set_transparent(self, x: int, y: int, transparent: bool) -> None:
+        """
+        Sets whether a tile can be seen through.
+
+        Args:
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+            transparent (bool): True if the tile can be seen through.
+
+        Raises:
+            IndexError: If the tile is not on the map.
+        """
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            raise IndexError(f"tile ({x}, {y}) is outside the {self._width}x{self._height} map")
+        self._transparent[y * self._width + x] = 1 if transparent else 0
+
+    def has_line_of_sight(self, start: Tuple[int, int], end: Tuple[int, int]) -> bool:
+        """
+        Checks if there is a clear line between two tiles.
+
+        The start and end tiles themselves are not checked, so a wall can be seen, but not what is
+        behind it. The result is the same if the start and end tiles are swapped.
+
+        Args:
+            start (Tuple[int, int]): The x and y coordinates of the start tile.
+            end (Tuple[int, int]): The x and y coordinates of the end tile.
+
+        Returns:
+            bool: True if every tile between the start and end tiles can be seen through, or False
+                if any of them cannot or either tile is not on the map.
+        """
+        x0, y0 = start
+        x1, y1 = end
+        width = self._width
+        if not (0 <= x0 < width and 0 <= y0 < self._height):
+            return False
+        if not (0 <= x1 < width and 0 <= y1 < self._height):
+            return False
+        # Lines are always traced in the same direction, so that they are symmetric.
+        if (y1, x1) < (y0, x0):
+            x0, y0, x1, y1 = x1, y1, x0, y0
+
+        dx = abs(x1 - x0)
+        dy = y1 - y0
+        step_x = 1 if x0 < x1 else -1
+        error = dx - dy
+        index = y0 * width + x0
+        end_index = y1 * width + x1
+        transparent = self._transparent
+        while index != end_index:
+            doubled_error = 2 * error
+            if doubled_error >= -dy:
+                error -= dy
+                index += step_x
+            if doubled_error <= dx:
+                error += dx
+                index += width
+            if index != end_index and not transparent[index]:
+                return False
+        return True
+
+    def tile_indices_in_sight(self, x: int, y: int, distance: int) -> Iterator[int]:
+        """
+        Iterates over the tiles within a number of steps of a tile that can be seen from it.
+
+        Args:
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+            distance (int): The maximum number of steps from the tile, inclusive.
+
+        Yields:
+            int: The index of each tile in sight, which is `y * width + x`, in order of y and then
+                x coordinates.
+        """
+        width = self._width
+        start = (x, y)
+        has_line_of_sight = self.has_line_of_sight
+        for row_y, left, right in row_spans_in_range(x, y, distance, width, self._height):
+            offset = row_y * width
+            for tile_x in range(left, right + 1):
+                if has_line_of_sight(start, (tile_x, row_y)):
+                    yield offset + tile_x
+
+
+__all__ = [
+    'SIGHT_BLOCKING_TILE_SPECS',
+    'row_spans_in_range',
+    'tile_indices_in_range',
+    'LineOfSight',
+]
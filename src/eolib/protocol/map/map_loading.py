@@ -0,0 +1,111 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Union
+from eolib.data.eo_reader import EoReader
+from eolib.protocol.map import Emf
+from eolib.protocol.map.lazy_graphic_layer_list import deserialize_emf_lazy
+
+_MAP_FILE_NAME = re.compile(r"^(\d+)\.emf$", re.IGNORECASE)
+
+
+def find_map_files(directory: Union[str, "os.PathLike[str]"]) -> Dict[int, str]:
+    """
+    Finds the EMF files in a directory that are named by their map ID, such as `00005.emf`.
+
+    Args:
+        directory (Union[str, os.PathLike[str]]): The directory to search.
+
+    Returns:
+        Dict[int, str]: The path to each EMF file, keyed by map ID, in order of map ID.
+
+    Raises:
+        OSError: If the directory cannot be listed.
+    """
+    directory = os.fspath(directory)
+    result = {}
+    for name in os.listdir(directory):
+        match = _MAP_FILE_NAME.match(name)
+        if match is not None:
+            result[int(match.group(1))] = os.path.join(directory, name)
+    return dict(sorted(result.items()))
+
+
+def _load_map(path: str, lazy_graphic_layers: bool) -> Emf:
+    with open(path, "rb") as f:
+        data = f.read()
+    if lazy_graphic_layers:
+        return deserialize_emf_lazy(data)
+    return Emf.deserialize(EoReader(data))
+
+
+def _load_map_batch(paths: List[str], lazy_graphic_layers: bool) -> List[Emf]:
+    return [_load_map(path, lazy_graphic_layers) for path in paths]
+
+
+def load_maps(
+    directory: Union[str, "os.PathLike[str]"],
+    processes: int = 1,
+    lazy_graphic_layers: bool = True,
+) -> Dict[int, Emf]:
+    """
+    Loads every EMF file in a directory, optionally deserializing them across a pool of processes.
+
+    Maps are loaded in the calling process unless `processes` is more than 1, so a pool of
+    processes must be opted into. This is because a pool does not always pay off: maps are sent
+    back from the worker processes by pickling them, and the calling process still has to unpickle
+    every map. With `lazy_graphic_layers`, the graphic layers of each map are sent as the
+    serialized bytes they are loaded from, which is much cheaper to pickle than the deserialized
+    layers. Even so, on a single CPU, loading a directory of maps with a pool of processes took
+    more than twice as long as loading it in the calling process. Pass `processes` when there are
+    many maps and several idle CPU cores, such as `os.cpu_count()`, and measure the difference.
+
+    Note:
+        On platforms that start worker processes by spawning a new interpreter, such as Windows and
+        macOS, the main module is imported by each worker. A script that calls `load_maps` with
+        more than one process must then guard its entry point with
+        `if __name__ == "__main__":`.
+
+    Args:
+        directory (Union[str, os.PathLike[str]]): The directory containing the EMF files, which
+            are named by their map ID, such as `00005.emf`.
+        processes (int, optional): The number of worker processes to use. If 1, maps are loaded
+            in the calling process. Defaults to 1, since a pool of processes is slower unless
+            there are several idle CPU cores.
+        lazy_graphic_layers (bool, optional): True if graphic layers should be deserialized when
+            they are first accessed, as with `deserialize_emf_lazy`. Defaults to True.
+
+    Returns:
+        Dict[int, Emf]: The loaded maps, keyed by map ID, in order of map ID.
+
+    Raises:
+        OSError: If the directory cannot be listed or a file cannot be read.
+        SerializationError: If a file cannot be deserialized.
+        ValueError: If `processes` is less than 1.
+    """
+    if processes < 1:
+        raise ValueError(f"processes must be at least 1, got {processes}")
+
+    paths = find_map_files(directory)
+    if processes == 1 or len(paths) <= 1:
+        return {map_id: _load_map(path, lazy_graphic_layers) for map_id, path in paths.items()}
+
+    # Maps are sent to each worker in a few batches, to limit the overhead of each task while
+    # still balancing the load between workers.
+    items: List[Tuple[int, str]] = list(paths.items())
+    batch_size = max(1, len(items) // (processes * 4))
+    batches = [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+
+    result = {}
+    with ProcessPoolExecutor(max_workers=min(processes, len(batches))) as executor:
+        futures = [
+            executor.submit(_load_map_batch, [path for _, path in batch], lazy_graphic_layers)
+            for batch in batches
+        ]
+        for batch, future in zip(batches, futures):
+            for (map_id, _), emf in zip(batch, future.result()):
+                result[map_id] = emf
+    return result
+
+
+__all__ = ['find_map_files', 'load_maps']
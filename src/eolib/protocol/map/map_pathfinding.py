@@ -0,0 +1,447 @@
+from array import array
+from typing import FrozenSet, Iterable, List, Optional, Tuple, Union
+from eolib.protocol.map import MapTileSpec
+from eolib.protocol.map.map_grid import NO_TILE_SPEC, MapGrid
+
+PLAYER_BLOCKING_TILE_SPECS: FrozenSet[MapTileSpec] = frozenset(
+    [
+        MapTileSpec.Wall,
+        MapTileSpec.ChairDown,
+        MapTileSpec.ChairLeft,
+        MapTileSpec.ChairRight,
+        MapTileSpec.ChairUp,
+        MapTileSpec.ChairDownRight,
+        MapTileSpec.ChairUpLeft,
+        MapTileSpec.ChairAll,
+        MapTileSpec.Chest,
+        MapTileSpec.BankVault,
+        MapTileSpec.Edge,
+        MapTileSpec.Board1,
+        MapTileSpec.Board2,
+        MapTileSpec.Board3,
+        MapTileSpec.Board4,
+        MapTileSpec.Board5,
+        MapTileSpec.Board6,
+        MapTileSpec.Board7,
+        MapTileSpec.Board8,
+        MapTileSpec.Jukebox,
+    ]
+)
+"""The tile specs that players cannot walk onto."""
+
+NPC_BLOCKING_TILE_SPECS: FrozenSet[MapTileSpec] = PLAYER_BLOCKING_TILE_SPECS | frozenset(
+    [MapTileSpec.NpcBoundary, MapTileSpec.Water]
+)
+"""The tile specs that NPCs cannot walk onto."""
+
+
+def build_walkability(
+    grid: MapGrid,
+    blocking_tile_specs: Optional[Iterable[MapTileSpec]] = None,
+    block_warps: bool = False,
+    block_doors: bool = False,
+) -> bytearray:
+    """
+    Builds a walkability bitmap of a map.
+
+    Tiles with a door can be walked onto by default, since players open doors by walking into
+    them. Doors that need a key the walker does not have can be blocked with `block_doors`, or
+    individually with `PathFinder.set_walkable`.
+
+    Args:
+        grid (MapGrid): The grid view of the map.
+        blocking_tile_specs (Optional[Iterable[MapTileSpec]], optional): The tile specs that
+            cannot be walked onto. Defaults to None, meaning `PLAYER_BLOCKING_TILE_SPECS`.
+        block_warps (bool, optional): True if tiles with a warp cannot be walked onto, such as
+            for NPCs. Defaults to False.
+        block_doors (bool, optional): True if tiles with a warp that has a door cannot be walked
+            onto. Defaults to False.
+
+    Returns:
+        bytearray: 1 for each tile that can be walked onto, and 0 otherwise, indexed by
+            `y * grid.width + x`.
+    """
+    if blocking_tile_specs is None:
+        blocking_tile_specs = PLAYER_BLOCKING_TILE_SPECS
+    table = bytearray([1]) * 256
+    for tile_spec in blocking_tile_specs:
+        table[int(tile_spec)] = 0
+    table[NO_TILE_SPEC] = 1
+    walkable = grid.tile_specs.translate(table)
+
+    if block_warps or block_doors:
+        for x, y, warp in grid.warps():
+            if block_warps or warp.door:
+                walkable[y * grid.width + x] = 0
+    return walkable
+
+
+class PathFinder:
+    """
+    Finds paths between tiles on a map, moving one tile up, down, left or right at a time.
+
+    The search state is kept in scratch buffers that are reused by every query, so that a
+    `PathFinder` can answer many queries without allocating per-tile objects.
+
+    Paths are found with A* search, using the Manhattan distance to the goal as the heuristic.
+    Since every step costs 1, a step changes the estimated path length through a tile by either 0,
+    when it moves towards the goal, or 2, when it moves away. The open tiles are therefore kept in
+    two stacks rather than a heap, one for each estimate. Popping the most recently pushed tile
+    first breaks ties in favor of the tiles furthest from the start, so on open ground a path is
+    found by expanding little more than the tiles along it.
+
+    The connected regions of walkable tiles are labelled on the first query, so that queries for
+    an unreachable goal return immediately instead of exploring the whole region of the start.
+
+    Example:
+        ```python
+        grid = MapGrid(emf)
+        finder = PathFinder(build_walkability(grid), grid.width, grid.height)
+        path = finder.find_path((1, 1), (10, 12))
+        ```
+    """
+
+    _width: int
+    _height: int
+    _stride: int
+    _walkable: bytearray
+    _base: int
+    _costs: array
+    _parents: array
+    _components: Optional[array]
+    _component_parents: List[int]
+
+    def __init__(self, walkable: Union[bytes, bytearray, memoryview], width: int, height: int):
+        """
+        Creates a new `PathFinder` instance.
+
+        Args:
+            walkable (Union[bytes, bytearray, memoryview]): 1 for each tile that can be
+                walked onto, and 0 otherwise, indexed by `y * width + x`.
+            width (int): The number of tiles in each row of the map.
+            height (int): The number of rows in the map.
+
+        Raises:
+            ValueError: If the length of `walkable` is not `width * height`.
+        """
+        if len(walkable) != width * height:
+            raise ValueError(f"expected {width * height} tiles, got {len(walkable)}")
+
+        # The map is surrounded by a border of tiles that cannot be walked onto, so that neighbors
+        # never need to be bounds checked.
+        self._width = width
+        self._height = height
+        self._stride = width + 2
+        self._walkable = bytearray(self._stride * (height + 2))
+        for y in range(height):
+            start = (y + 1) * self._stride + 1
+            self._walkable[start : start + width] = walkable[y * width : (y + 1) * width]
+
+        size = len(self._walkable)
+        self._base = 0
+        self._costs = array("q", [0]) * size
+        self._parents = array("i", [0]) * size
+        self._components = None
+        self._component_parents = []
+
+    @staticmethod
+    def from_grid(grid: MapGrid, for_npcs: bool = False) -> "PathFinder":
+        """
+        Creates a `PathFinder` for a map, using the default walkability rules.
+
+        Args:
+            grid (MapGrid): The grid view of the map.
+            for_npcs (bool, optional): True if paths are for NPCs, which cannot walk onto
+                `NPC_BLOCKING_TILE_SPECS` or warps. Defaults to False.
+
+        Returns:
+            PathFinder: The path finder.
+        """
+        if for_npcs:
+            walkable = build_walkability(grid, NPC_BLOCKING_TILE_SPECS, block_warps=True)
+        else:
+            walkable = build_walkability(grid)
+        return PathFinder(walkable, grid.width, grid.height)
+
+    @property
+    def width(self) -> int:
+        """
+        int: Gets the number of tiles in each row of the map.
+        """
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """
+        int: Gets the number of rows in the map.
+        """
+        return self._height
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        """
+        Checks if a tile can be walked onto.
+
+        Args:
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+
+        Returns:
+            bool: True if the tile is on the map and can be walked onto.
+        """
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return False
+        return self._walkable[(y + 1) * self._stride + x + 1] != 0
+
+    def set_walkable(self, x: int, y: int, walkable: bool) -> None:
+        """
+        Sets whether a tile can be walked onto, such as when a door is opened or a tile becomes
+        occupied.
+
+        Args:
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+            walkable (bool): True if the tile can be walked onto.
+
+        Raises:
+            IndexError: If the tile is not on the map.
+        """
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            raise IndexError(f"tile ({x}, {y}) is outside the {self._width}x{self._height} map")
+        index = (y + 1) * self._stride + x + 1
+        self._walkable[index] = 1 if walkable else 0
+
+        # Blocking a tile can only split a region, so the labels stay conservative and are kept.
+        # Unblocking a tile joins the regions around it.
+        components = self._components
+        if walkable and components is not None:
+            label = -1
+            for neighbor in (index + 1, index - 1, index + self._stride, index - self._stride):
+                if self._walkable[neighbor]:
+                    if label == -1:
+                        label = self._find_component(components[neighbor])
+                    else:
+                        self._join_components(label, components[neighbor])
+            if label == -1:
+                label = len(self._component_parents)
+                self._component_parents.append(label)
+            components[index] = label
+
+    def find_path(
+        self,
+        start: Tuple[int, int],
+        goal: Tuple[int, int],
+        max_steps: Optional[int] = None,
+    ) -> Optional[List[Tuple[int, int]]]:
+        """
+        Finds a shortest path between two tiles using A* search.
+
+        The start tile does not need to be walkable, since it is usually occupied by the walker.
+
+        Args:
+            start (Tuple[int, int]): The x and y coordinates of the start tile.
+            goal (Tuple[int, int]): The x and y coordinates of the goal tile.
+            max_steps (Optional[int], optional): The maximum length of the path. Defaults to None,
+                meaning no limit.
+
+        Returns:
+            Optional[List[Tuple[int, int]]]: The coordinates of each tile along the path, excluding
+                the start tile and including the goal tile, or `None` if there is no path.
+        """
+        start_x, start_y = start
+        if not (0 <= start_x < self._width and 0 <= start_y < self._height):
+            return None
+        if not self.is_walkable(*goal):
+            return None
+
+        stride = self._stride
+        start_index = (start_y + 1) * stride + start_x + 1
+        goal_x = goal[0] + 1
+        goal_index = (goal[1] + 1) * stride + goal_x
+        if start_index == goal_index:
+            return []
+        if not self._may_connect(start_index, goal_index):
+            return None
+
+        walkable = self._walkable
+        costs = self._costs
+        parents = self._parents
+        base = self._next_base()
+        limit = -1 if max_steps is None else base + max_steps
+        # A neighbor is closer to the goal vertically if the tile is above the goal row and the
+        # neighbor is below it, or the other way around.
+        goal_row_start = goal_index - goal_x
+        goal_row_end = goal_row_start + stride
+
+        costs[start_index] = base
+        parents[start_index] = -1
+        # Tiles whose estimate is the current minimum, and tiles whose estimate is 2 more.
+        current: List[int] = [start_index]
+        following: List[int] = []
+        while True:
+            if not current:
+                if not following:
+                    return None
+                current, following = following, current
+            index = current.pop()
+            if index == goal_index:
+                return self._build_path(index)
+            cost = costs[index]
+            if cost == limit:
+                continue
+            cost += 1
+            x = index % stride
+
+            neighbor = index + 1
+            if walkable[neighbor] and (costs[neighbor] < base or cost < costs[neighbor]):
+                costs[neighbor] = cost
+                parents[neighbor] = index
+                (current if x < goal_x else following).append(neighbor)
+            neighbor = index - 1
+            if walkable[neighbor] and (costs[neighbor] < base or cost < costs[neighbor]):
+                costs[neighbor] = cost
+                parents[neighbor] = index
+                (current if x > goal_x else following).append(neighbor)
+            neighbor = index + stride
+            if walkable[neighbor] and (costs[neighbor] < base or cost < costs[neighbor]):
+                costs[neighbor] = cost
+                parents[neighbor] = index
+                (current if index < goal_row_start else following).append(neighbor)
+            neighbor = index - stride
+            if walkable[neighbor] and (costs[neighbor] < base or cost < costs[neighbor]):
+                costs[neighbor] = cost
+                parents[neighbor] = index
+                (current if index >= goal_row_end else following).append(neighbor)
+
+    def reachable_tiles(self, start: Tuple[int, int], max_steps: int) -> List[Tuple[int, int]]:
+        """
+        Finds the tiles that can be reached from a tile using breadth-first search.
+
+        Args:
+            start (Tuple[int, int]): The x and y coordinates of the start tile.
+            max_steps (int): The maximum number of steps to take.
+
+        Returns:
+            List[Tuple[int, int]]: The coordinates of each reachable tile, excluding the start
+                tile, in order of distance.
+        """
+        if not (0 <= start[0] < self._width and 0 <= start[1] < self._height):
+            return []
+
+        stride = self._stride
+        walkable = self._walkable
+        costs = self._costs
+        base = self._next_base()
+        offsets = (stride, -1, -stride, 1)
+
+        start_index = (start[1] + 1) * stride + start[0] + 1
+        costs[start_index] = base
+        frontier = [start_index]
+        result = []
+        for _ in range(max_steps):
+            next_frontier = []
+            for index in frontier:
+                for offset in offsets:
+                    neighbor = index + offset
+                    if walkable[neighbor] and costs[neighbor] < base:
+                        costs[neighbor] = base
+                        next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            for index in next_frontier:
+                y, x = divmod(index, stride)
+                result.append((x - 1, y - 1))
+            frontier = next_frontier
+        return result
+
+    def _next_base(self) -> int:
+        # Each query stores its costs offset by a base that is larger than any cost stored by an
+        # earlier query, so a tile has been seen by the current query if its cost is at least the
+        # base, and the scratch buffers never need to be cleared between queries.
+        self._base += len(self._walkable) + 1
+        return self._base
+
+    def _may_connect(self, start_index: int, goal_index: int) -> bool:
+        components = self._components
+        if components is None:
+            components = self._label_components()
+        goal_component = self._find_component(components[goal_index])
+        if self._walkable[start_index]:
+            return self._find_component(components[start_index]) == goal_component
+        for neighbor in (
+            start_index + 1,
+            start_index - 1,
+            start_index + self._stride,
+            start_index - self._stride,
+        ):
+            if self._walkable[neighbor]:
+                if self._find_component(components[neighbor]) == goal_component:
+                    return True
+        return False
+
+    def _label_components(self) -> array:
+        # Each run of walkable tiles in a row is labelled, and joined with the runs that it
+        # touches in the row above.
+        walkable = self._walkable
+        stride = self._stride
+        self._component_parents = []
+        runs: List[Tuple[int, int, int]] = []
+        previous_start = 0
+        for y in range(1, self._height + 1):
+            row_start = y * stride
+            row_end = row_start + stride
+            current_start = len(runs)
+            above = previous_start
+            position = walkable.find(1, row_start, row_end)
+            while position != -1:
+                run_end = walkable.find(0, position, row_end)
+                label = len(self._component_parents)
+                self._component_parents.append(label)
+                runs.append((position, run_end, label))
+                while above < current_start and runs[above][1] <= position - stride:
+                    above += 1
+                touching = above
+                while touching < current_start and runs[touching][0] < run_end - stride:
+                    self._join_components(label, runs[touching][2])
+                    touching += 1
+                position = walkable.find(1, run_end, row_end)
+            previous_start = current_start
+
+        components = array("i", [-1]) * len(walkable)
+        for run_start, run_end, label in runs:
+            components[run_start:run_end] = array("i", [self._find_component(label)]) * (
+                run_end - run_start
+            )
+        self._components = components
+        return components
+
+    def _find_component(self, label: int) -> int:
+        parents = self._component_parents
+        while parents[label] != label:
+            parents[label] = parents[parents[label]]
+            label = parents[label]
+        return label
+
+    def _join_components(self, a: int, b: int) -> None:
+        a = self._find_component(a)
+        b = self._find_component(b)
+        if a != b:
+            self._component_parents[max(a, b)] = min(a, b)
+
+    def _build_path(self, index: int) -> List[Tuple[int, int]]:
+        stride = self._stride
+        parents = self._parents
+        path = []
+        while parents[index] != -1:
+            y, x = divmod(index, stride)
+            path.append((x - 1, y - 1))
+            index = parents[index]
+        path.reverse()
+        return path
+
+
+__all__ = [
+    'PLAYER_BLOCKING_TILE_SPECS',
+    'NPC_BLOCKING_TILE_SPECS',
+    'build_walkability',
+    'PathFinder',
+]
@@ -0,0 +1,330 @@
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+from eolib.protocol.map import Emf
+
+VIEW_RANGE = 11
+"""The number of tiles that the client can see in each direction, measured in steps."""
+
+_Position = Tuple[int, int]
+
+
+class SpatialIndex:
+    """
+    An index of entities by their position on a map, for finding the entities near a tile.
+
+    Entities are grouped into square buckets of tiles. A query only visits the buckets that overlap
+    the queried area, and moving an entity only updates the buckets that it leaves and enters.
+
+    Any hashable value can be used as an entity, such as a player ID or a `MapNpc`.
+
+    Example:
+        ```python
+        players = SpatialIndex()
+        players.add(player_id, 10, 12)
+        players.move(player_id, 11, 12)
+        nearby = players.in_range(12, 12, VIEW_RANGE)
+        ```
+    """
+
+    _bucket_size: int
+    _positions: Dict[Hashable, _Position]
+    _buckets: Dict[_Position, Dict[Hashable, _Position]]
+
+    def __init__(self, bucket_size: int = VIEW_RANGE):
+        """
+        Creates a new `SpatialIndex` instance.
+
+        Args:
+            bucket_size (int, optional): The width and height of each bucket in tiles. Queries are
+                fastest when this is close to the range of a typical query. Defaults to
+                `VIEW_RANGE`.
+
+        Raises:
+            ValueError: If `bucket_size` is less than 1.
+        """
+        if bucket_size < 1:
+            raise ValueError(f"bucket_size must be at least 1, got {bucket_size}")
+        self._bucket_size = bucket_size
+        self._positions = {}
+        self._buckets = {}
+
+    @property
+    def bucket_size(self) -> int:
+        """
+        int: Gets the width and height of each bucket in tiles.
+        """
+        return self._bucket_size
+
+    def __len__(self) -> int:
+        """
+        Gets the number of entities in the index.
+
+        Returns:
+            int: The number of entities.
+        """
+        return len(self._positions)
+
+    def __contains__(self, entity: object) -> bool:
+        """
+        Checks if an entity is in the index.
+
+        Args:
+            entity (object): The entity.
+
+        Returns:
+            bool: True if the entity is in the index.
+        """
+        return entity in self._positions
+
+    def __iter__(self) -> Iterator[Hashable]:
+        """
+        Iterates over the entities in the index.
+
+        Returns:
+            Iterator[Hashable]: An iterator over the entities, in the order they were added.
+        """
+        return iter(self._positions)
+
+    def position(self, entity: Hashable) -> Optional[Tuple[int, int]]:
+        """
+        Gets the position of an entity.
+
+        Args:
+            entity (Hashable): The entity.
+
+        Returns:
+            Optional[Tuple[int, int]]: The x and y coordinates of the entity, or `None` if it is
+                not in the index.
+        """
+        return self._positions.get(entity)
+
+    def add(self, entity: Hashable, x: int, y: int) -> None:
+        """
+        Adds an entity to the index, or moves it if it is already in the index.
+
+        Args:
+            entity (Hashable): The entity.
+            x (int): The x coordinate of the entity.
+            y (int): The y coordinate of the entity.
+        """
+        if entity in self._positions:
+            self.move(entity, x, y)
+            return
+        position = (x, y)
+        self._positions[entity] = position
+        self._bucket(x, y)[entity] = position
+
+    def move(self, entity: Hashable, x: int, y: int) -> None:
+        """
+        Moves an entity in the index.
+
+        Args:
+            entity (Hashable): The entity.
+            x (int): The new x coordinate of the entity.
+            y (int): The new y coordinate of the entity.
+
+        Raises:
+            KeyError: If the entity is not in the index.
+        """
+        old_x, old_y = self._positions[entity]
+        position = (x, y)
+        self._positions[entity] = position
+        size = self._bucket_size
+        if old_x // size == x // size and old_y // size == y // size:
+            self._buckets[(x // size, y // size)][entity] = position
+            return
+        self._remove_from_bucket(entity, old_x, old_y)
+        self._bucket(x, y)[entity] = position
+
+    def remove(self, entity: Hashable) -> None:
+        """
+        Removes an entity from the index.
+
+        Args:
+            entity (Hashable): The entity.
+
+        Raises:
+            KeyError: If the entity is not in the index.
+        """
+        x, y = self._positions.pop(entity)
+        self._remove_from_bucket(entity, x, y)
+
+    def clear(self) -> None:
+        """
+        Removes every entity from the index.
+        """
+        self._positions.clear()
+        self._buckets.clear()
+
+    def in_rect(self, left: int, top: int, right: int, bottom: int) -> List[Hashable]:
+        """
+        Finds the entities inside a rectangle.
+
+        Args:
+            left (int): The smallest x coordinate of the rectangle.
+            top (int): The smallest y coordinate of the rectangle.
+            right (int): The largest x coordinate of the rectangle, inclusive.
+            bottom (int): The largest y coordinate of the rectangle, inclusive.
+
+        Returns:
+            List[Hashable]: The entities inside the rectangle, in no particular order.
+        """
+        result: List[Hashable] = []
+        size = self._bucket_size
+        buckets = self._buckets
+        for bucket_y in range(top // size, bottom // size + 1):
+            for bucket_x in range(left // size, right // size + 1):
+                bucket = buckets.get((bucket_x, bucket_y))
+                if bucket is None:
+                    continue
+                inner = (
+                    left <= bucket_x * size
+                    and (bucket_x + 1) * size - 1 <= right
+                    and top <= bucket_y * size
+                    and (bucket_y + 1) * size - 1 <= bottom
+                )
+                if inner:
+                    result.extend(bucket)
+                    continue
+                for entity, (x, y) in bucket.items():
+                    if left <= x <= right and top <= y <= bottom:
+                        result.append(entity)
+        return result
+
+    def in_range(self, x: int, y: int, distance: int) -> List[Hashable]:
+        """
+        Finds the entities within a number of steps of a tile.
+
+        The distance between two tiles is the number of steps between them, which is the sum of
+        the differences between their x and y coordinates.
+
+        Args:
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+            distance (int): The maximum number of steps from the tile, inclusive.
+
+        Returns:
+            List[Hashable]: The entities within range of the tile, in no particular order.
+        """
+        result: List[Hashable] = []
+        size = self._bucket_size
+        buckets = self._buckets
+        for bucket_y in range((y - distance) // size, (y + distance) // size + 1):
+            for bucket_x in range((x - distance) // size, (x + distance) // size + 1):
+                bucket = buckets.get((bucket_x, bucket_y))
+                if bucket is None:
+                    continue
+                for entity, (entity_x, entity_y) in bucket.items():
+                    if abs(entity_x - x) + abs(entity_y - y) <= distance:
+                        result.append(entity)
+        return result
+
+    def _bucket(self, x: int, y: int) -> Dict[Hashable, _Position]:
+        size = self._bucket_size
+        key = (x // size, y // size)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = {}
+        return bucket
+
+    def _remove_from_bucket(self, entity: Hashable, x: int, y: int) -> None:
+        size = self._bucket_size
+        key = (x // size, y // size)
+        bucket = self._buckets[key]
+        del bucket[entity]
+        if not bucket:
+            del self._buckets[key]
+
+
+class MapEntityIndex:
+    """
+    Spatial indexes of the entities on a map.
+
+    The NPC spawns, items, signs and warps of an `Emf` are indexed when the index is created.
+    Players and NPCs are added and moved by the caller as they move around the map.
+
+    Example:
+        ```python
+        index = MapEntityIndex(emf)
+        index.players.add(player_id, 5, 5)
+        nearby_players = index.players.in_range(5, 5, VIEW_RANGE)
+        nearby_chests = index.items.in_range(5, 5, 1)
+        ```
+    """
+
+    _npc_spawns: SpatialIndex
+    _items: SpatialIndex
+    _signs: SpatialIndex
+    _warps: SpatialIndex
+    _players: SpatialIndex
+    _npcs: SpatialIndex
+
+    def __init__(self, emf: Emf, bucket_size: int = VIEW_RANGE):
+        """
+        Creates a new `MapEntityIndex` instance from an `Emf`.
+
+        Args:
+            emf (Emf): The map whose entities should be indexed.
+            bucket_size (int, optional): The width and height of each bucket in tiles. Defaults to
+                `VIEW_RANGE`.
+        """
+        self._npc_spawns = SpatialIndex(bucket_size)
+        self._items = SpatialIndex(bucket_size)
+        self._signs = SpatialIndex(bucket_size)
+        self._warps = SpatialIndex(bucket_size)
+        self._players = SpatialIndex(bucket_size)
+        self._npcs = SpatialIndex(bucket_size)
+
+        for npc in emf.npcs:
+            self._npc_spawns.add(npc, npc.coords.x, npc.coords.y)
+        for item in emf.items:
+            self._items.add(item, item.coords.x, item.coords.y)
+        for sign in emf.signs:
+            self._signs.add(sign, sign.coords.x, sign.coords.y)
+        for row in emf.warp_rows:
+            for tile in row.tiles:
+                self._warps.add(tile.warp, tile.x, row.y)
+
+    @property
+    def npc_spawns(self) -> SpatialIndex:
+        """
+        SpatialIndex: Gets the index of the `MapNpc` spawns of the map.
+        """
+        return self._npc_spawns
+
+    @property
+    def items(self) -> SpatialIndex:
+        """
+        SpatialIndex: Gets the index of the `MapItem`s of the map, such as chest spawns.
+        """
+        return self._items
+
+    @property
+    def signs(self) -> SpatialIndex:
+        """
+        SpatialIndex: Gets the index of the `MapSign`s of the map.
+        """
+        return self._signs
+
+    @property
+    def warps(self) -> SpatialIndex:
+        """
+        SpatialIndex: Gets the index of the `MapWarp`s of the map.
+        """
+        return self._warps
+
+    @property
+    def players(self) -> SpatialIndex:
+        """
+        SpatialIndex: Gets the index of the players on the map, which is initially empty.
+        """
+        return self._players
+
+    @property
+    def npcs(self) -> SpatialIndex:
+        """
+        SpatialIndex: Gets the index of the NPCs on the map, which is initially empty.
+        """
+        return self._npcs
+
+
+__all__ = ['VIEW_RANGE', 'SpatialIndex', 'MapEntityIndex']
@@ -6,3 +6,10 @@
 """
 
 from .._generated.pub import *
+from .pub_file_index import *
+from .lazy_record_list import *
+from .columnar_records import *
+from .name_index import *
+from .pub_file_merging import *
+from .pub_checksum import *
+from .pub_file_diff import *
@@ -0,0 +1,616 @@
+import importlib
+import typing
+from array import array
+from itertools import compress
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Union
+from eolib.data.eo_reader import EoReader
+from eolib.data.eo_numeric_limits import CHAR_MAX, SHORT_MAX, THREE_MAX, INT_MAX
+from eolib.data.eo_writer import EoWriter
+from eolib.data.number_encoding_utils import decode_numbers
+from eolib.protocol.struct_layout import StructLayout
+from eolib.protocol.pub.pub_file_index import PubFileIndex
+
+# "L" is 8 bytes on 64-bit Linux and macOS, so 4-byte columns use "I" wherever it is 4 bytes.
+_UINT32_TYPECODE = "I" if array("I").itemsize == 4 else "L"
+_TYPECODES = {1: "B", 2: "H", 3: _UINT32_TYPECODE, 4: _UINT32_TYPECODE}
+_MAX_VALUES = {1: CHAR_MAX, 2: SHORT_MAX, 3: THREE_MAX, 4: INT_MAX}
+_NUMPY_SIZES = {1: 1, 2: 2, 3: 4, 4: 4}
+
+Condition = Union[Any, Callable[[Any], bool]]
+
+
+class _Field(NamedTuple):
+    name: str
+    type: str
+    size: int
+    length: str
+    value: Any
+
+
+class ColumnarRecords:
+    """
+    A columnar representation of pub file records.
+
+    Each integer field of the records is stored in an `array.array` column. Each string field is
+    stored as a column of indices into a string pool, which is shared by all of the string fields.
+    This takes a fraction of the memory of the equivalent record objects, and a query over a field
+    only has to scan the column for that field.
+
+    Enum and bool fields are stored as integers, and are converted back when records are created
+    from the columns. Length fields and hardcoded fields are not stored.
+    """
+
+    _record_type: Any
+    _fields: List[_Field]
+    _leading_fields: List[_Field]
+    _trailing_fields: List[_Field]
+    _trailing_offsets: List[int]
+    _trailing_size: int
+    _length_sources: Dict[str, str]
+    _python_types: Dict[str, type]
+    _columns: Dict[str, array]
+    _string_pool: List[str]
+    _string_ids: Dict[str, int]
+
+    def __init__(self, record_type: type):
+        """
+        Creates a new empty `ColumnarRecords` instance.
+
+        Args:
+            record_type (type): The pub file record type, such as `EifRecord`.
+
+        Raises:
+            ValueError: If the record type does not have a flat layout.
+        """
+        fields = [
+            _Field(
+                f.name or "",
+                f.type,
+                f.size or 0,
+                f.length if isinstance(f.length, str) else "",
+                f.value,
+            )
+            for f in StructLayout(record_type).fields
+        ]
+        self._record_type = record_type
+        self._length_sources = {f.length: f.name for f in fields if f.length}
+        self._fields = [
+            f for f in fields if f.name and f.value is None and f.name not in self._length_sources
+        ]
+
+        split = max((i + 1 for i, f in enumerate(fields) if _is_string(f)), default=0)
+        self._leading_fields = list(fields[:split])
+        self._trailing_fields = list(fields[split:])
+        self._trailing_offsets = []
+        self._trailing_size = 0
+        for field in self._trailing_fields:
+            self._trailing_offsets.append(self._trailing_size)
+            self._trailing_size += field.size
+
+        hints = typing.get_type_hints(record_type)
+        self._python_types = {f.name: hints[f"_{f.name}"] for f in self._fields}
+        self._columns = {
+            f.name: array(_UINT32_TYPECODE if _is_string(f) else _TYPECODES[f.size])
+            for f in self._fields
+        }
+        self._string_pool = []
+        self._string_ids = {}
+
+    @staticmethod
+    def from_records(record_type: type, records: Iterable[Any]) -> "ColumnarRecords":
+        """
+        Creates a columnar representation of some records.
+
+        Args:
+            record_type (type): The pub file record type, such as `EifRecord`.
+            records (Iterable[Any]): The records to store.
+
+        Returns:
+            ColumnarRecords: The columnar representation of the records.
+        """
+        result = ColumnarRecords(record_type)
+        for record in records:
+            result.append(record)
+        return result
+
+    @staticmethod
+    def from_index(index: PubFileIndex) -> "ColumnarRecords":
+        """
+        Creates a columnar representation of the records in a pub file, without deserializing any
+        records.
+
+        Fixed-size fields are decoded a whole column at a time.
+
+        Args:
+            index (PubFileIndex): The index of the pub file.
+
+        Returns:
+            ColumnarRecords: The columnar representation of the records in the pub file.
+        """
+        result = ColumnarRecords(index.record_type)
+        trailing_size = result._trailing_size
+        trailing = bytearray()
+        truncated = None
+
+        for record_id in range(1, len(index) + 1):
+            data = index.get_bytes(record_id)
+            leading_size = len(data) - trailing_size
+            values = result._read_leading_fields(data[: max(leading_size, 0)])
+            if values is None:
+                truncated = record_id
+                break
+            for name, value in values.items():
+                result._columns[name].append(value)
+            trailing += data[leading_size:]
+
+        count = len(trailing) // trailing_size if trailing_size else 0
+        for field, offset in zip(result._trailing_fields, result._trailing_offsets):
+            column = result._columns.get(field.name)
+            if column is None:
+                continue
+            size = field.size
+            if size == 1:
+                encoded = trailing[offset::trailing_size]
+            else:
+                encoded = bytearray(count * size)
+                for i in range(size):
+                    encoded[i::size] = trailing[offset + i :: trailing_size]
+            if field.type == "byte":
+                column.extend(encoded)
+            else:
+                column.extend(decode_numbers(bytes(encoded), size))
+
+        if truncated is not None:
+            result.append(index.get(truncated))
+
+        return result
+
+    @staticmethod
+    def from_numpy(record_type: type, records: Any) -> "ColumnarRecords":
+        """
+        Creates a columnar representation of the records in a NumPy structured array.
+
+        The structured array must have a field for each stored field of the record type, like the
+        ones created by `to_numpy`. Any other fields are ignored.
+
+        Note:
+            Requires NumPy to be installed.
+
+        Args:
+            record_type (type): The pub file record type, such as `EifRecord`.
+            records (numpy.ndarray): The structured array of records.
+
+        Returns:
+            ColumnarRecords: The columnar representation of the records.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If a field is missing from the structured array, or holds a value that
+                cannot be encoded as its EO integer type.
+        """
+        numpy = _import_numpy()
+        result = ColumnarRecords(record_type)
+        names = records.dtype.names or ()
+        for field in result._fields:
+            if field.name not in names:
+                raise ValueError(f"{field.name} is missing from the structured array")
+            values = records[field.name]
+            column = result._columns[field.name]
+            if _is_string(field):
+                column.extend(result._intern(str(value)) for value in values)
+                continue
+            max_value = 0x100 if field.type == "byte" else _MAX_VALUES[field.size]
+            if values.size and (values.min() < 0 or values.max() >= max_value):
+                raise ValueError(f"{field.name} holds a value that does not fit in {field.type}")
+            column.frombytes(values.astype(numpy.dtype(f"=u{column.itemsize}")).tobytes())
+        return result
+
+    @staticmethod
+    def from_columns(
+        record_type: type, columns: Dict[str, Any], string_pool: Iterable[str]
+    ) -> "ColumnarRecords":
+        """
+        Creates a columnar representation of records from existing columns, like the ones returned
+        by `column`.
+
+        Columns that use the same item size as the column they are copied into, such as an
+        `array.array` or a `memoryview` of a memory-mapped file, are copied as raw bytes.
+
+        Args:
+            record_type (type): The pub file record type, such as `EifRecord`.
+            columns (Dict[str, Any]): The column for each stored field of the record type. Any
+                other columns are ignored.
+            string_pool (Iterable[str]): The pool of strings that string columns refer to.
+
+        Returns:
+            ColumnarRecords: The columnar representation of the records.
+
+        Raises:
+            ValueError: If a column is missing, the columns have different lengths, or a string
+                column refers to a string that is not in the pool.
+        """
+        result = ColumnarRecords(record_type)
+        for string in string_pool:
+            result._string_ids.setdefault(string, len(result._string_pool))
+            result._string_pool.append(string)
+
+        for field in result._fields:
+            if field.name not in columns:
+                raise ValueError(f"{field.name} column is missing")
+            values = columns[field.name]
+            column = result._columns[field.name]
+            if getattr(values, "itemsize", None) == column.itemsize:
+                column.frombytes(memoryview(values).cast("B"))
+            else:
+                column.extend(values)
+
+        lengths = {len(column) for column in result._columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"columns have different lengths: {sorted(lengths)}")
+        pool_size = len(result._string_pool)
+        for field in result._fields:
+            column = result._columns[field.name]
+            if _is_string(field) and column and max(column) >= pool_size:
+                raise ValueError(f"{field.name} refers to a string that is not in the pool")
+        return result
+
+    @property
+    def record_type(self) -> type:
+        """
+        type: Gets the pub file record type.
+        """
+        return self._record_type
+
+    @property
+    def field_names(self) -> List[str]:
+        """
+        List[str]: Gets the names of the stored fields, in serialization order.
+        """
+        return [f.name for f in self._fields]
+
+    @property
+    def string_pool(self) -> List[str]:
+        """
+        List[str]: Gets the pool of strings that string columns refer to.
+        """
+        return self._string_pool
+
+    def column(self, name: str) -> array:
+        """
+        Gets the column for a field.
+
+        The values of a string column are indices into `string_pool`.
+
+        Args:
+            name (str): The name of the field.
+
+        Returns:
+            array: The column for the field.
+
+        Raises:
+            KeyError: If there is no column for the field.
+        """
+        return self._columns[name]
+
+    def get_value(self, name: str, row: int) -> Any:
+        """
+        Gets the value of a field in a row.
+
+        Args:
+            name (str): The name of the field.
+            row (int): The row index.
+
+        Returns:
+            Any: The value of the field, converted to the type of the record property.
+        """
+        return self._to_python(name, self._columns[name][row])
+
+    def append(self, record: Any) -> None:
+        """
+        Adds a record to the end of the columns.
+
+        Args:
+            record (Any): The record to add.
+        """
+        for field in self._fields:
+            value = getattr(record, field.name)
+            if _is_string(field):
+                value = self._intern(value)
+            elif self._python_types[field.name] is bool:
+                value = 1 if value else 0
+            self._columns[field.name].append(int(value))
+
+    def to_record(self, row: int) -> Any:
+        """
+        Creates a record from a row.
+
+        Args:
+            row (int): The row index.
+
+        Returns:
+            Any: A new record, which is an instance of `record_type`.
+        """
+        record = self._record_type()
+        for name, column in self._columns.items():
+            setattr(record, name, self._to_python(name, column[row]))
+        return record
+
+    def to_records(self, rows: Optional[Iterable[int]] = None) -> List[Any]:
+        """
+        Creates records from some rows.
+
+        Args:
+            rows (Optional[Iterable[int]], optional): The row indices. Defaults to all rows.
+
+        Returns:
+            List[Any]: A new record for each row.
+        """
+        if rows is None:
+            rows = range(len(self))
+        return [self.to_record(row) for row in rows]
+
+    def where(self, **conditions: Condition) -> List[int]:
+        """
+        Finds the rows that match all of the specified conditions.
+
+        Each keyword argument names a field. If its value is callable, it is used as a predicate
+        that is passed the field value. Otherwise, the field value must be equal to it.
+
+        Example:
+            ```python
+            weapons = columns.where(type=ItemType.Weapon, min_damage=lambda value: value > 50)
+            ```
+
+        Args:
+            **conditions: The conditions to match, keyed by field name.
+
+        Returns:
+            List[int]: The indices of the matching rows, in ascending order.
+
+        Raises:
+            KeyError: If there is no column for one of the fields.
+        """
+        rows: Optional[List[int]] = None
+        for name, condition in conditions.items():
+            column = self._columns[name]
+            if self._python_types[name] is str:
+                condition = self._string_condition(condition)
+            elif callable(condition) and self._python_types[name] is not int:
+                predicate = condition
+                python_type = self._python_types[name]
+                condition = lambda value: predicate(python_type(value))  # noqa: E731
+
+            if rows is None:
+                if callable(condition):
+                    rows = list(compress(range(len(column)), map(condition, column)))
+                else:
+                    rows = _find_equal(column, condition)
+            elif callable(condition):
+                rows = [i for i in rows if condition(column[i])]
+            else:
+                rows = [i for i in rows if column[i] == condition]
+
+        return list(range(len(self))) if rows is None else rows
+
+    def select(self, rows: Iterable[int]) -> "ColumnarRecords":
+        """
+        Creates a columnar representation of some of the rows.
+
+        Args:
+            rows (Iterable[int]): The row indices.
+
+        Returns:
+            ColumnarRecords: A new columnar representation containing only the specified rows.
+        """
+        rows = list(rows)
+        result = ColumnarRecords(self._record_type)
+        result._string_pool = self._string_pool.copy()
+        result._string_ids = self._string_ids.copy()
+        for name, column in self._columns.items():
+            result._columns[name].extend(column[i] for i in rows)
+        return result
+
+    def to_numpy(self) -> Any:
+        """
+        Creates a NumPy structured array with a field for each column.
+
+        Integer fields are stored as the smallest unsigned integer type that fits the column, and
+        string fields as Unicode strings. The array is built directly from the columns, so no
+        records are created.
+
+        Note:
+            Requires NumPy to be installed.
+
+        Example:
+            ```python
+            index = PubFileIndex(Eif, data)
+            items = ColumnarRecords.from_index(index).to_numpy()
+            mean_weight = items["weight"].mean()
+            ```
+
+        Returns:
+            numpy.ndarray: A structured array with a row for each record.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        numpy = _import_numpy()
+        dtypes = []
+        for field in self._fields:
+            if _is_string(field):
+                length = max(
+                    (len(self._string_pool[i]) for i in self._columns[field.name]), default=0
+                )
+                dtypes.append((field.name, f"U{max(length, 1)}"))
+            else:
+                dtypes.append((field.name, f"u{_NUMPY_SIZES[field.size]}"))
+
+        result = numpy.empty(len(self), dtype=dtypes)
+        pool = None
+        for field in self._fields:
+            column = self._columns[field.name]
+            values = numpy.frombuffer(column, dtype=f"=u{column.itemsize}")
+            if _is_string(field):
+                if pool is None:
+                    pool = numpy.array(self._string_pool or [""], dtype=str)
+                values = pool[values]
+            result[field.name] = values
+        return result
+
+    def write_to(self, writer: EoWriter) -> None:
+        """
+        Serializes the records to an `EoWriter`, without creating any records.
+
+        Args:
+            writer (EoWriter): The writer that the records will be serialized to.
+
+        Raises:
+            ValueError: If a value exceeds the maximum value of its field.
+        """
+        count = len(self)
+        trailing_size = self._trailing_size
+        trailing = bytearray(count * trailing_size)
+        for field, offset in zip(self._trailing_fields, self._trailing_offsets):
+            size = field.size
+            column = self._columns.get(field.name)
+            values: Any = [field.value] * count if column is None else column
+            encoder = EoWriter()
+            if field.type == "byte":
+                encoder.add_bytes(bytes(values))
+            else:
+                getattr(encoder, f"add_{field.type}s")(values)
+            encoded = encoder.to_bytearray()
+            for i in range(size):
+                trailing[offset + i :: trailing_size] = encoded[i::size]
+
+        string_columns = {
+            f.name: self._columns[f.name] for f in self._leading_fields if _is_string(f)
+        }
+        for row in range(count):
+            strings = {
+                name: self._string_pool[column[row]] for name, column in string_columns.items()
+            }
+            for field in self._leading_fields:
+                self._write_leading_field(writer, field, row, strings)
+            writer.add_bytes(bytes(trailing[row * trailing_size : (row + 1) * trailing_size]))
+
+    def __len__(self) -> int:
+        """
+        Gets the number of rows.
+
+        Returns:
+            int: The number of rows.
+        """
+        if not self._columns:
+            return 0
+        return len(next(iter(self._columns.values())))
+
+    def _intern(self, string: str) -> int:
+        result = self._string_ids.get(string)
+        if result is None:
+            result = len(self._string_pool)
+            self._string_pool.append(string)
+            self._string_ids[string] = result
+        return result
+
+    def _to_python(self, name: str, value: int) -> Any:
+        python_type = self._python_types[name]
+        if python_type is str:
+            return self._string_pool[value]
+        if python_type is int:
+            return value
+        return python_type(value)
+
+    def _string_condition(self, condition: Condition) -> Condition:
+        if callable(condition):
+            matches = {i for i, string in enumerate(self._string_pool) if condition(string)}
+            return matches.__contains__
+        return self._string_ids.get(condition, -1)
+
+    def _read_leading_fields(self, data: memoryview) -> Optional[Dict[str, Any]]:
+        reader = EoReader(data)  # type: ignore [arg-type]
+        lengths: Dict[str, int] = {}
+        values: Dict[str, Any] = {}
+        for field in self._leading_fields:
+            if _is_string(field):
+                length = field.size or lengths[field.length]
+                if reader.remaining < length:
+                    return None
+                if field.type == "encoded_string":
+                    value = self._intern(reader.get_fixed_encoded_string(length))
+                else:
+                    value = self._intern(reader.get_fixed_string(length))
+            else:
+                if reader.remaining < field.size:
+                    return None
+                value = _read_integer(reader, field)
+                if field.name in self._length_sources:
+                    lengths[field.name] = value
+            if field.name in self._columns:
+                values[field.name] = value
+        if reader.remaining != 0:
+            return None
+        return values
+
+    def _write_leading_field(
+        self, writer: EoWriter, field: _Field, row: int, strings: Dict[str, str]
+    ) -> None:
+        if _is_string(field):
+            string = strings[field.name]
+            length = field.size or len(string)
+            if field.type == "encoded_string":
+                writer.add_fixed_encoded_string(string, length)
+            else:
+                writer.add_fixed_string(string, length)
+            return
+
+        if field.name in self._length_sources:
+            value = len(strings[self._length_sources[field.name]])
+        elif field.value is not None:
+            value = field.value
+        else:
+            value = self._columns[field.name][row]
+        _write_integer(writer, field, value)
+
+
+def _import_numpy() -> Any:
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:
+        raise ImportError("NumPy is required for conversion to and from NumPy arrays") from None
+
+
+def _is_string(field: _Field) -> bool:
+    return field.type in ("string", "encoded_string")
+
+
+def _read_integer(reader: EoReader, field: _Field) -> int:
+    return getattr(reader, f"get_{field.type}")()
+
+
+def _write_integer(writer: EoWriter, field: _Field, value: int) -> None:
+    getattr(writer, f"add_{field.type}")(value)
+
+
+def _find_equal(column: array, value: Any) -> List[int]:
+    # Searches the raw bytes of the column for the value, so the time taken depends mostly on the
+    # number of matches rather than the number of rows.
+    try:
+        needle = array(column.typecode, [value]).tobytes()
+    except (TypeError, OverflowError):
+        return [i for i, item in enumerate(column) if item == value]
+    data = column.tobytes()
+    itemsize = column.itemsize
+    result = []
+    position = data.find(needle)
+    while position != -1:
+        if position % itemsize:
+            # Skip matches that straddle two values.
+            position = data.find(needle, position + 1)
+        else:
+            result.append(position // itemsize)
+            position = data.find(needle, position + itemsize)
+    return result
+
+
+__all__ = ['ColumnarRecords']
@@ -0,0 +1,89 @@
+from typing import Any
+from eolib.data.eo_reader import EoReader
+from eolib.data.eo_writer import EoWriter
+from eolib.protocol.lazy_list import LazyList
+from eolib.protocol.pub.pub_file_index import PubFileIndex, _get_pub_file_format
+
+
+class LazyRecordList(LazyList[Any]):
+    """
+    A list of pub file records that are deserialized on first access.
+
+    Records are kept as spans of the underlying pub file until they are accessed, after which the
+    deserialized record is stored in the list. A `LazyRecordList` can be used wherever the records
+    list of a generated `Eif`, `Enf`, `Esf` or `Ecf` is expected, including when serializing.
+
+    Records can be added, replaced and removed like in any other list. Records that were never
+    accessed are written back unchanged by `write_to`.
+    """
+
+    _index: PubFileIndex
+
+    def __init__(self, index: PubFileIndex):
+        """
+        Creates a new `LazyRecordList` instance.
+
+        Args:
+            index (PubFileIndex): The index of the pub file to load records from.
+        """
+        super().__init__(range(1, len(index) + 1))
+        self._index = index
+
+    @property
+    def pub_file_index(self) -> PubFileIndex:
+        """
+        PubFileIndex: Gets the index of the pub file that records are loaded from.
+        """
+        return self._index
+
+    def write_to(self, writer: EoWriter) -> None:
+        """
+        Serializes the records to an `EoWriter`.
+
+        Records that were never accessed are copied from the pub file without being deserialized.
+
+        Args:
+            writer (EoWriter): The writer that the records will be serialized to.
+        """
+        record_type: Any = self._index.record_type
+        for slot in self._slots:
+            if isinstance(slot, int):
+                writer.add_bytes(self._index.get_bytes(slot))  # type: ignore [arg-type]
+            else:
+                record_type.serialize(writer, slot)
+
+    def _materialize(self, slot: int) -> Any:
+        reader = EoReader(self._index.get_bytes(slot))  # type: ignore [arg-type]
+        record_type: Any = self._index.record_type
+        return record_type.deserialize(reader)
+
+
+def deserialize_lazy(pub_type: type, data: bytes) -> Any:
+    """
+    Deserializes a pub file, deferring the deserialization of each record until it is accessed.
+
+    The records of the returned pub file are held in a `LazyRecordList`.
+
+    Args:
+        pub_type (type): The pub file type, which is one of `Eif`, `Enf`, `Esf` or `Ecf`.
+        data (bytes): The serialized pub file. Any object supporting the buffer protocol can be
+            used, including an `mmap`.
+
+    Returns:
+        Any: The deserialized pub file, which is an instance of `pub_type`.
+
+    Raises:
+        TypeError: If `pub_type` is not a pub file type.
+    """
+    pub_format = _get_pub_file_format(pub_type)
+    index = PubFileIndex(pub_type, data, cache_size=0)
+    result = pub_type()
+    result.rid = index.rid
+    setattr(result, pub_format.total_records_count_name, index.total_records_count)
+    result.version = index.version
+    setattr(result, pub_format.records_name, LazyRecordList(index))
+    result._byte_size = len(memoryview(data))
+    return result
+
+
+__all__ = ['LazyRecordList', 'deserialize_lazy']
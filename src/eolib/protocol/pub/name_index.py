@@ -0,0 +1,275 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from eolib.data.eo_reader import EoReader
+from eolib.protocol.struct_layout import StructLayout
+from eolib.protocol.pub.pub_file_index import PubFileIndex
+
+_SEPARATOR = "\0"
+_MIN_REBUILD_THRESHOLD = 64
+
+
+def _normalize(name: str) -> str:
+    # str.lower maps each windows-1252 letter to a single windows-1252 letter (Ÿ to ÿ, Š to š,
+    # etc.), unlike str.casefold, which would expand ß to ss.
+    return name.lower()
+
+
+class NameIndex:
+    """
+    An index of pub file records by name, supporting exact, prefix and substring lookups.
+
+    Lookups are case-insensitive. Records are identified by their 1-based ID, and more than one
+    record can have the same name.
+
+    The index is updated incrementally as records are added, renamed and removed.
+    """
+
+    _names: Dict[int, str]
+    _normalized_names: Dict[int, str]
+    _exact: Dict[str, Set[int]]
+    _sorted: List[Tuple[str, int]]
+    _haystack: Optional[str]
+    _haystack_starts: List[int]
+    _haystack_ids: List[int]
+    _stale_ids: Set[int]
+    _pending: Dict[int, str]
+
+    def __init__(self, names: Optional[Iterable[Tuple[int, str]]] = None):
+        """
+        Creates a new `NameIndex` instance.
+
+        Args:
+            names (Optional[Iterable[Tuple[int, str]]], optional): The ID and name of each record to
+                add to the index. Defaults to None.
+        """
+        self._names = {}
+        self._normalized_names = {}
+        self._exact = {}
+        self._sorted = []
+        self._haystack = None
+        self._haystack_starts = []
+        self._haystack_ids = []
+        self._stale_ids = set()
+        self._pending = {}
+        if names is not None:
+            for record_id, name in dict(names).items():
+                self._add(record_id, name)
+            self._sorted = sorted((n, i) for i, n in self._normalized_names.items())
+
+    @staticmethod
+    def from_records(records: Iterable[Any]) -> "NameIndex":
+        """
+        Creates an index of records by name.
+
+        Args:
+            records (Iterable[Any]): The records, in ID order, such as the `items` of an `Eif`.
+
+        Returns:
+            NameIndex: The index of the records.
+        """
+        return NameIndex((i, record.name) for i, record in enumerate(records, 1))
+
+    @staticmethod
+    def from_index(index: PubFileIndex) -> "NameIndex":
+        """
+        Creates an index of the records in a pub file by name, decoding only their names.
+
+        Args:
+            index (PubFileIndex): The index of the pub file.
+
+        Returns:
+            NameIndex: The index of the records.
+        """
+        fields = StructLayout(index.record_type).fields
+        length_names = {f.length for f in fields if isinstance(f.length, str)}
+
+        def read_name(record_id: int) -> str:
+            reader = EoReader(index.get_bytes(record_id))  # type: ignore [arg-type]
+            lengths: Dict[str, int] = {}
+            for field in fields:
+                if field.type in ("string", "encoded_string"):
+                    length = field.size or lengths[field.length]  # type: ignore [index]
+                    if field.name == "name":
+                        return reader.get_fixed_string(length)
+                    reader.get_fixed_string(length)
+                else:
+                    value = getattr(reader, f"get_{field.type}")()
+                    if field.name in length_names:
+                        lengths[field.name] = value
+            raise ValueError(f"{index.record_type.__name__} has no name field")
+
+        return NameIndex((i, read_name(i)) for i in range(1, len(index) + 1))
+
+    def get_name(self, record_id: int) -> Optional[str]:
+        """
+        Gets the name of a record.
+
+        Args:
+            record_id (int): The 1-based ID of the record.
+
+        Returns:
+            Optional[str]: The name of the record, or `None` if the record is not in the index.
+        """
+        return self._names.get(record_id)
+
+    def set_name(self, record_id: int, name: str) -> None:
+        """
+        Adds a record to the index, or updates the name of a record that is already in the index.
+
+        Args:
+            record_id (int): The 1-based ID of the record.
+            name (str): The name of the record.
+        """
+        if record_id in self._names:
+            self.remove(record_id)
+        self._add(record_id, name)
+        insort(self._sorted, (self._normalized_names[record_id], record_id))
+
+    def remove(self, record_id: int) -> None:
+        """
+        Removes a record from the index, if it is in the index.
+
+        Args:
+            record_id (int): The 1-based ID of the record.
+        """
+        if record_id not in self._names:
+            return
+        del self._names[record_id]
+        normalized_name = self._normalized_names.pop(record_id)
+
+        ids = self._exact[normalized_name]
+        ids.discard(record_id)
+        if not ids:
+            del self._exact[normalized_name]
+
+        i = bisect_left(self._sorted, (normalized_name, record_id))
+        del self._sorted[i]
+
+        if self._haystack is not None:
+            self._stale_ids.add(record_id)
+            self._pending.pop(record_id, None)
+
+    def find(self, name: str) -> List[int]:
+        """
+        Finds the records with a name.
+
+        Args:
+            name (str): The name to find.
+
+        Returns:
+            List[int]: The IDs of the records with the name, in ascending order.
+        """
+        return sorted(self._exact.get(_normalize(name), ()))
+
+    def find_prefix(self, prefix: str, limit: Optional[int] = None) -> List[int]:
+        """
+        Finds the records with a name that starts with a prefix.
+
+        Args:
+            prefix (str): The prefix to find.
+            limit (Optional[int], optional): The maximum number of records to find. Defaults to
+                None, meaning no limit.
+
+        Returns:
+            List[int]: The IDs of the matching records, in order of name and then ID.
+        """
+        prefix = _normalize(prefix)
+        result: List[int] = []
+        i = bisect_left(self._sorted, (prefix,))
+        while i < len(self._sorted) and (limit is None or len(result) < limit):
+            normalized_name, record_id = self._sorted[i]
+            if not normalized_name.startswith(prefix):
+                break
+            result.append(record_id)
+            i += 1
+        return result
+
+    def find_substring(self, text: str, limit: Optional[int] = None) -> List[int]:
+        """
+        Finds the records with a name that contains some text.
+
+        Every name contains empty text, so all records match it.
+
+        Args:
+            text (str): The text to find.
+            limit (Optional[int], optional): The maximum number of records to find. Defaults to
+                None, meaning no limit.
+
+        Returns:
+            List[int]: The IDs of the matching records, in ascending order.
+        """
+        text = _normalize(text)
+        if _SEPARATOR in text:
+            return []
+
+        haystack = self._get_haystack()
+        starts = self._haystack_starts
+        result: List[int] = []
+        # An empty haystack has no names to search, but would still contain empty text.
+        position = haystack.find(text) if starts else -1
+        while position != -1 and (limit is None or len(result) < limit):
+            i = bisect_right(starts, position) - 1
+            if self._haystack_ids[i] not in self._stale_ids:
+                result.append(self._haystack_ids[i])
+            if i + 1 == len(starts):
+                break
+            position = haystack.find(text, starts[i + 1])
+
+        if self._pending:
+            pending = [i for i, name in self._pending.items() if text in name]
+            result = sorted(result + pending)[:limit]
+
+        return result
+
+    def __len__(self) -> int:
+        """
+        Gets the number of records in the index.
+
+        Returns:
+            int: The number of records in the index.
+        """
+        return len(self._names)
+
+    def __contains__(self, record_id: object) -> bool:
+        """
+        Checks if a record is in the index.
+
+        Args:
+            record_id (object): The 1-based ID of the record.
+
+        Returns:
+            bool: True if the record is in the index.
+        """
+        return record_id in self._names
+
+    def _add(self, record_id: int, name: str) -> None:
+        normalized_name = _normalize(name)
+        self._names[record_id] = name
+        self._normalized_names[record_id] = normalized_name
+        self._exact.setdefault(normalized_name, set()).add(record_id)
+
+        if self._haystack is not None:
+            self._stale_ids.add(record_id)
+            self._pending[record_id] = normalized_name
+
+    def _get_haystack(self) -> str:
+        # Names that changed since the haystack was built are masked out of it and searched
+        # separately, until there are enough of them to make rebuilding it worthwhile.
+        threshold = max(_MIN_REBUILD_THRESHOLD, len(self._names) // 16)
+        if len(self._stale_ids) + len(self._pending) > threshold:
+            self._haystack = None
+        if self._haystack is None:
+            self._stale_ids.clear()
+            self._pending.clear()
+            self._haystack_ids = sorted(self._normalized_names)
+            normalized_names = [self._normalized_names[i] for i in self._haystack_ids]
+            self._haystack_starts = []
+            position = 0
+            for normalized_name in normalized_names:
+                self._haystack_starts.append(position)
+                position += len(normalized_name) + 1
+            self._haystack = _SEPARATOR.join(normalized_names)
+        return self._haystack
+
+
+__all__ = ['NameIndex']
@@ -0,0 +1,232 @@
+import zlib
+from typing import Any, Iterable, List
+from eolib.data.eo_numeric_limits import SHORT_MAX
+from eolib.data.eo_writer import EoWriter
+from eolib.protocol.pub.pub_file_index import PubFileIndex
+
+_MODULUS = (1 << 61) - 1
+_BASE = 1_000_003
+
+
+def _to_rid(value: int) -> List[int]:
+    value %= SHORT_MAX * SHORT_MAX
+    return [value // SHORT_MAX, value % SHORT_MAX]
+
+
+def compute_pub_rid(pub_type: type, data: bytes) -> List[int]:
+    """
+    Computes the rid of a pub file from its serialized records.
+
+    The rid is a checksum that changes whenever a record is added, removed, reordered or modified.
+    The header of the pub file is not included in the checksum.
+
+    The checksum is a polynomial hash of the CRC-32 of each serialized record, modulo the
+    Mersenne prime 2^61 - 1. It is reduced modulo 64009^2 and split into two shorts.
+
+    See Also:
+        - [`PubChecksum`][eolib.protocol.pub.pub_checksum.PubChecksum], which maintains the same
+          checksum incrementally.
+
+    Args:
+        pub_type (type): The pub file type, which is one of `Eif`, `Enf`, `Esf` or `Ecf`.
+        data (bytes): The serialized pub file.
+
+    Returns:
+        List[int]: The rid, as two shorts.
+
+    Raises:
+        TypeError: If `pub_type` is not a pub file type.
+    """
+    index = PubFileIndex(pub_type, data, cache_size=0)
+    value = 0
+    for record_id in range(1, len(index) + 1):
+        value = (value * _BASE + zlib.crc32(index.get_bytes(record_id))) % _MODULUS
+    return _to_rid(value)
+
+
+class PubChecksum:
+    """
+    An incrementally maintained pub file rid.
+
+    Computes the same checksum as `compute_pub_rid`, from the serialized records of a pub file. The
+    checksum of each record is cached in a segment tree, so replacing or appending a record only
+    rehashes that record and updates O(log n) nodes. Inserting or deleting a record before the
+    end rebuilds the tree from the cached checksums, which takes O(n) time.
+    """
+
+    _capacity: int
+    _count: int
+    _hashes: List[int]
+    _sizes: List[int]
+    _powers: List[int]
+
+    def __init__(self, records: Iterable[bytes] = ()):
+        """
+        Creates a new `PubChecksum` instance.
+
+        Args:
+            records (Iterable[bytes], optional): The serialized records of the pub file, in order.
+                Defaults to no records.
+        """
+        self._build([zlib.crc32(record) for record in records])
+
+    @staticmethod
+    def from_index(index: PubFileIndex) -> "PubChecksum":
+        """
+        Creates a checksum of the records in an indexed pub file.
+
+        Args:
+            index (PubFileIndex): The index of the pub file.
+
+        Returns:
+            PubChecksum: The checksum of the records in the pub file.
+        """
+        return PubChecksum(index.get_bytes(i) for i in range(1, len(index) + 1))  # type: ignore
+
+    @staticmethod
+    def from_records(records: Iterable[Any]) -> "PubChecksum":
+        """
+        Creates a checksum of some records.
+
+        Args:
+            records (Iterable[Any]): The records of the pub file, in order.
+
+        Returns:
+            PubChecksum: The checksum of the records.
+        """
+        return PubChecksum(_serialize_record(record) for record in records)
+
+    @property
+    def value(self) -> int:
+        """
+        int: Gets the full checksum, before it is reduced to a rid.
+        """
+        return self._hashes[1]
+
+    @property
+    def rid(self) -> List[int]:
+        """
+        List[int]: Gets the rid, as two shorts.
+        """
+        return _to_rid(self._hashes[1])
+
+    def update(self, index: int, record: bytes) -> None:
+        """
+        Replaces a record.
+
+        Args:
+            index (int): The 0-based index of the record.
+            record (bytes): The new serialized record.
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        if not 0 <= index < self._count:
+            raise IndexError(f"index {index} out of range")
+        self._set_leaf(index, zlib.crc32(record), 1)
+
+    def append(self, record: bytes) -> None:
+        """
+        Adds a record to the end of the pub file.
+
+        Args:
+            record (bytes): The serialized record.
+        """
+        if self._count == self._capacity:
+            self._build(self._leaves())
+        self._count += 1
+        self._set_leaf(self._count - 1, zlib.crc32(record), 1)
+
+    def insert(self, index: int, record: bytes) -> None:
+        """
+        Inserts a record before an index.
+
+        As with `list.insert`, a negative index counts from the end, and an index past either end
+        inserts the record at that end.
+
+        Args:
+            index (int): The 0-based index to insert the record before.
+            record (bytes): The serialized record.
+        """
+        if index < 0:
+            index = max(index + self._count, 0)
+        if index >= self._count:
+            self.append(record)
+            return
+        leaves = self._leaves()
+        leaves.insert(index, zlib.crc32(record))
+        self._build(leaves)
+
+    def delete(self, index: int) -> None:
+        """
+        Deletes a record.
+
+        Args:
+            index (int): The 0-based index of the record.
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        if not 0 <= index < self._count:
+            raise IndexError(f"index {index} out of range")
+        if index == self._count - 1:
+            self._count -= 1
+            self._set_leaf(index, 0, 0)
+            return
+        leaves = self._leaves()
+        del leaves[index]
+        self._build(leaves)
+
+    def __len__(self) -> int:
+        """
+        Gets the number of records.
+
+        Returns:
+            int: The number of records.
+        """
+        return self._count
+
+    def _leaves(self) -> List[int]:
+        return self._hashes[self._capacity : self._capacity + self._count]
+
+    def _build(self, leaves: List[int]) -> None:
+        capacity = 1
+        while capacity <= len(leaves):
+            capacity *= 2
+        self._capacity = capacity
+        self._count = len(leaves)
+        self._hashes = [0] * (2 * capacity)
+        self._sizes = [0] * (2 * capacity)
+        self._hashes[capacity : capacity + len(leaves)] = leaves
+        self._sizes[capacity : capacity + len(leaves)] = [1] * len(leaves)
+        self._powers = [1]
+        for _ in range(capacity):
+            self._powers.append(self._powers[-1] * _BASE % _MODULUS)
+        for node in range(capacity - 1, 0, -1):
+            self._combine(node)
+
+    def _set_leaf(self, index: int, hash_: int, size: int) -> None:
+        node = self._capacity + index
+        self._hashes[node] = hash_
+        self._sizes[node] = size
+        node //= 2
+        while node:
+            self._combine(node)
+            node //= 2
+
+    def _combine(self, node: int) -> None:
+        left = 2 * node
+        right = left + 1
+        self._hashes[node] = (
+            self._hashes[left] * self._powers[self._sizes[right]] + self._hashes[right]
+        ) % _MODULUS
+        self._sizes[node] = self._sizes[left] + self._sizes[right]
+
+
+def _serialize_record(record: Any) -> bytes:
+    writer = EoWriter()
+    type(record).serialize(writer, record)
+    return bytes(writer.to_bytearray())
+
+
+__all__ = ['compute_pub_rid', 'PubChecksum']
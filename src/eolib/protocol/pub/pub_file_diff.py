@@ -0,0 +1,138 @@
+from typing import Any, List, NamedTuple, Optional, Tuple
+from eolib.data.eo_reader import EoReader
+from eolib.protocol.struct_layout import StructLayout
+from eolib.protocol.pub.pub_file_index import PubFileIndex
+
+
+class FieldChange(NamedTuple):
+    """
+    A change to a field of a pub file record.
+    """
+
+    name: str
+    """The name of the field."""
+
+    old_value: Any
+    """The value of the field in the old pub file."""
+
+    new_value: Any
+    """The value of the field in the new pub file."""
+
+
+class RecordDiff(NamedTuple):
+    """
+    A difference between a record in two versions of a pub file.
+    """
+
+    record_id: int
+    """The 1-based ID of the record."""
+
+    old_record: Optional[Any]
+    """The record in the old pub file, or `None` if the record was added."""
+
+    new_record: Optional[Any]
+    """The record in the new pub file, or `None` if the record was removed."""
+
+    field_changes: Tuple[FieldChange, ...]
+    """
+    The changed fields, in layout order.
+
+    Empty if the record was added or removed.
+    """
+
+    @property
+    def added(self) -> bool:
+        """
+        bool: Gets whether the record was added.
+        """
+        return self.old_record is None
+
+    @property
+    def removed(self) -> bool:
+        """
+        bool: Gets whether the record was removed.
+        """
+        return self.new_record is None
+
+
+def _diff_fields(
+    field_names: List[str], old_record: Any, new_record: Any
+) -> Tuple[FieldChange, ...]:
+    changes = []
+    for name in field_names:
+        old_value = getattr(old_record, name)
+        new_value = getattr(new_record, name)
+        if old_value != new_value:
+            changes.append(FieldChange(name, old_value, new_value))
+    return tuple(changes)
+
+
+def diff_pub_files(pub_type: type, old: bytes, new: bytes) -> List[RecordDiff]:
+    """
+    Compares the records in two versions of a pub file.
+
+    Records are matched by ID. The serialized records are compared first, and only records that
+    differ are deserialized and compared field by field.
+
+    Example:
+        ```python
+        for diff in diff_pub_files(Eif, old_data, new_data):
+            for change in diff.field_changes:
+                print(f"#{diff.record_id} {change.name}: {change.old_value} -> {change.new_value}")
+        ```
+
+    Args:
+        pub_type (type): The pub file type, which is one of `Eif`, `Enf`, `Esf` or `Ecf`.
+        old (bytes): The old serialized pub file. Any object supporting the buffer protocol can be
+            used, including an `mmap`.
+        new (bytes): The new serialized pub file. Any object supporting the buffer protocol can be
+            used, including an `mmap`.
+
+    Returns:
+        List[RecordDiff]: The records that were changed, added or removed, in ID order.
+
+    Raises:
+        TypeError: If `pub_type` is not a pub file type.
+    """
+    return _diff_indexes(
+        PubFileIndex(pub_type, old, cache_size=0), PubFileIndex(pub_type, new, cache_size=0)
+    )
+
+
+def _diff_indexes(old_index: PubFileIndex, new_index: PubFileIndex) -> List[RecordDiff]:
+    record_type: Any = old_index.record_type
+    fields = StructLayout(record_type).fields
+    length_names = {field.length for field in fields if isinstance(field.length, str)}
+    field_names = [
+        field.name
+        for field in fields
+        if field.name is not None and field.name not in length_names and field.value is None
+    ]
+
+    def load(index: PubFileIndex, record_id: int) -> Any:
+        return record_type.deserialize(EoReader(index.get_bytes(record_id)))  # type: ignore
+
+    result: List[RecordDiff] = []
+    common_count = min(len(old_index), len(new_index))
+    for record_id in range(1, common_count + 1):
+        if old_index.get_bytes(record_id) != new_index.get_bytes(record_id):
+            old_record = load(old_index, record_id)
+            new_record = load(new_index, record_id)
+            result.append(
+                RecordDiff(
+                    record_id,
+                    old_record,
+                    new_record,
+                    _diff_fields(field_names, old_record, new_record),
+                )
+            )
+
+    for record_id in range(common_count + 1, len(old_index) + 1):
+        result.append(RecordDiff(record_id, load(old_index, record_id), None, ()))
+    for record_id in range(common_count + 1, len(new_index) + 1):
+        result.append(RecordDiff(record_id, None, load(new_index, record_id), ()))
+
+    return result
+
+
+__all__ = ['FieldChange', 'RecordDiff', 'diff_pub_files']
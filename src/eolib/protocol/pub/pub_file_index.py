@@ -0,0 +1,226 @@
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Tuple
+from eolib.data.eo_reader import EoReader
+from eolib.protocol.struct_layout import StructLayout
+from eolib.protocol._generated.pub import (
+    Ecf,
+    EcfRecord,
+    Eif,
+    EifRecord,
+    Enf,
+    EnfRecord,
+    Esf,
+    EsfRecord,
+)
+
+
+class _PubFileFormat(NamedTuple):
+    file_id: str
+    record_type: Any
+    records_name: str
+    total_records_count_name: str
+
+
+_PUB_FILE_FORMATS: Dict[type, _PubFileFormat] = {
+    Eif: _PubFileFormat("EIF", EifRecord, "items", "total_items_count"),
+    Enf: _PubFileFormat("ENF", EnfRecord, "npcs", "total_npcs_count"),
+    Esf: _PubFileFormat("ESF", EsfRecord, "skills", "total_skills_count"),
+    Ecf: _PubFileFormat("ECF", EcfRecord, "classes", "total_classes_count"),
+}
+
+_HEADER_SIZE = 10
+
+
+def _get_pub_file_format(pub_type: type) -> _PubFileFormat:
+    try:
+        return _PUB_FILE_FORMATS[pub_type]
+    except KeyError:
+        raise TypeError(f"{pub_type.__name__} is not a pub file type") from None
+
+
+class PubFileIndex:
+    """
+    A random-access index of the records in a pub file.
+
+    Building the index makes a single pass over the file, measuring each record from its length
+    fields without decoding any strings or constructing any records. Records are then deserialized
+    one at a time, directly from the underlying buffer, and the most recently used records are
+    kept in a bounded cache.
+
+    Works with `Eif`, `Enf`, `Esf` and `Ecf` files.
+
+    Note:
+        Records are identified by their 1-based ID, so the first record in the file has an ID of
+        `1`. Records returned from the cache are shared, and should not be modified.
+    """
+
+    _pub_type: type
+    _record_type: Any
+    _data: memoryview
+    _rid: List[int]
+    _total_records_count: int
+    _version: int
+    _offsets: array
+    _cache_size: int
+    _cache: "OrderedDict[int, Any]"
+
+    def __init__(self, pub_type: type, data: bytes, cache_size: int = 256):
+        """
+        Creates a new `PubFileIndex` instance.
+
+        Args:
+            pub_type (type): The pub file type, which is one of `Eif`, `Enf`, `Esf` or `Ecf`.
+            data (bytes): The serialized pub file. Any object supporting the buffer protocol can be
+                used, including an `mmap`.
+            cache_size (int, optional): The maximum number of deserialized records to cache.
+                Defaults to 256.
+
+        Raises:
+            TypeError: If `pub_type` is not a pub file type.
+            ValueError: If `cache_size` is negative, the file ID in the header does not match
+                `pub_type`, or a record has a negative length field.
+        """
+        if cache_size < 0:
+            raise ValueError(f"negative cache_size: {cache_size}")
+
+        pub_format = _get_pub_file_format(pub_type)
+        self._pub_type = pub_type
+        self._record_type = pub_format.record_type
+        self._data = memoryview(data)
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+
+        header = EoReader(self._data[:_HEADER_SIZE])  # type: ignore [arg-type]
+        file_id = header.get_fixed_string(3)
+        if file_id and file_id != pub_format.file_id:
+            raise ValueError(f"expected a {pub_format.file_id} file, got {file_id!r}")
+        self._rid = header.get_shorts(2)
+        self._total_records_count = header.get_short()
+        self._version = header.get_char()
+
+        size_of = StructLayout(self._record_type).size_of
+        offsets = array("L")
+        position = _HEADER_SIZE
+        end = len(self._data)
+        while position < end:
+            offsets.append(position)
+            position += size_of(self._data, position)
+        offsets.append(min(position, end))
+        self._offsets = offsets
+
+    @property
+    def pub_type(self) -> type:
+        """
+        type: Gets the pub file type.
+        """
+        return self._pub_type
+
+    @property
+    def record_type(self) -> type:
+        """
+        type: Gets the type of the records in the pub file.
+        """
+        return self._record_type
+
+    @property
+    def rid(self) -> List[int]:
+        """
+        List[int]: Gets the rid from the pub file header.
+        """
+        return self._rid
+
+    @property
+    def total_records_count(self) -> int:
+        """
+        int: Gets the total number of records from the pub file header.
+        """
+        return self._total_records_count
+
+    @property
+    def version(self) -> int:
+        """
+        int: Gets the version from the pub file header.
+        """
+        return self._version
+
+    def span(self, record_id: int) -> Tuple[int, int]:
+        """
+        Gets the position of a serialized record in the pub file.
+
+        Args:
+            record_id (int): The 1-based ID of the record.
+
+        Returns:
+            Tuple[int, int]: The start and end positions of the record.
+
+        Raises:
+            IndexError: If there is no record with the specified ID.
+        """
+        index = self._check_record_id(record_id)
+        return self._offsets[index], self._offsets[index + 1]
+
+    def get_bytes(self, record_id: int) -> memoryview:
+        """
+        Gets the serialized bytes of a record, without copying them.
+
+        Args:
+            record_id (int): The 1-based ID of the record.
+
+        Returns:
+            memoryview: A view of the serialized record in the underlying buffer.
+
+        Raises:
+            IndexError: If there is no record with the specified ID.
+        """
+        start, end = self.span(record_id)
+        return self._data[start:end]
+
+    def get(self, record_id: int) -> Any:
+        """
+        Gets a record, deserializing it if it is not cached.
+
+        Args:
+            record_id (int): The 1-based ID of the record.
+
+        Returns:
+            Any: The record, which is an instance of `record_type`.
+
+        Raises:
+            IndexError: If there is no record with the specified ID.
+        """
+        record = self._cache.get(record_id)
+        if record is not None:
+            self._cache.move_to_end(record_id)
+            return record
+
+        reader = EoReader(self.get_bytes(record_id))  # type: ignore [arg-type]
+        record = self._record_type.deserialize(reader)
+        if self._cache_size > 0:
+            self._cache[record_id] = record
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return record
+
+    def clear_cache(self) -> None:
+        """
+        Removes all deserialized records from the cache.
+        """
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        """
+        Gets the number of records in the pub file.
+
+        Returns:
+            int: The number of records in the pub file.
+        """
+        return len(self._offsets) - 1
+
+    def _check_record_id(self, record_id: int) -> int:
+        if not 1 <= record_id <= len(self):
+            raise IndexError(f"record_id {record_id} out of range")
+        return record_id - 1
+
+
+__all__ = ['PubFileIndex']
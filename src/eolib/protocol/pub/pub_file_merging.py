@@ -0,0 +1,117 @@
+from typing import BinaryIO, Iterator, List, Optional, Sequence
+from eolib.data.eo_writer import EoWriter
+from eolib.protocol.pub.pub_file_index import PubFileIndex, _get_pub_file_format
+
+
+def _encode_header(pub_type: type, rid: List[int], total_records_count: int, version: int) -> bytes:
+    writer = EoWriter()
+    writer.add_fixed_string(_get_pub_file_format(pub_type).file_id, 3)
+    writer.add_shorts(rid)
+    writer.add_short(total_records_count)
+    writer.add_char(version)
+    return bytes(writer.to_bytearray())
+
+
+def _records_span(index: PubFileIndex) -> slice:
+    if len(index) == 0:
+        return slice(0, 0)
+    return slice(index.span(1)[0], index.span(len(index))[1])
+
+
+def merge_pub_files(
+    pub_type: type,
+    sources: Sequence[bytes],
+    output: BinaryIO,
+    rid: Optional[List[int]] = None,
+) -> int:
+    """
+    Merges pub files that were split into parts, such as `dat001.eif` and `dat002.eif`.
+
+    The records of each part are copied to the output without being deserialized. The header of
+    the merged pub file takes its rid and version from the first part, and its total records count
+    is the number of merged records.
+
+    Example:
+        ```python
+        parts = [Path(f"dat00{i}.eif").read_bytes() for i in (1, 2)]
+        with open("merged.eif", "wb") as output:
+            merge_pub_files(Eif, parts, output)
+        ```
+
+    Args:
+        pub_type (type): The pub file type, which is one of `Eif`, `Enf`, `Esf` or `Ecf`.
+        sources (Sequence[bytes]): The serialized parts, in order. Any object supporting the buffer
+            protocol can be used, including an `mmap`.
+        output (BinaryIO): The binary stream that the merged pub file will be written to.
+        rid (Optional[List[int]], optional): The rid to write to the header of the merged pub
+            file. Defaults to None, meaning the rid of the first part.
+
+    Returns:
+        int: The number of merged records.
+
+    Raises:
+        TypeError: If `pub_type` is not a pub file type.
+        ValueError: If there are no parts.
+    """
+    if not sources:
+        raise ValueError("no pub files to merge")
+
+    indexes = [PubFileIndex(pub_type, source, cache_size=0) for source in sources]
+    total_records_count = sum(len(index) for index in indexes)
+    output.write(
+        _encode_header(
+            pub_type,
+            indexes[0].rid if rid is None else rid,
+            total_records_count,
+            indexes[0].version,
+        )
+    )
+    for source, index in zip(sources, indexes):
+        with memoryview(source) as view:
+            output.write(view[_records_span(index)])
+    return total_records_count
+
+
+def split_pub_file(pub_type: type, source: bytes, max_records: int) -> Iterator[bytes]:
+    """
+    Splits a pub file into parts, such as `dat001.eif` and `dat002.eif`.
+
+    The records are copied to each part without being deserialized, and the parts are created one
+    at a time as they are iterated. Each part has the rid and version of the pub file, and, like the
+    parts shipped by EO servers, its total records count is the number of records in all the parts.
+
+    Example:
+        ```python
+        for i, part in enumerate(split_pub_file(Eif, data, 1000), 1):
+            Path(f"dat{i:03}.eif").write_bytes(part)
+        ```
+
+    Args:
+        pub_type (type): The pub file type, which is one of `Eif`, `Enf`, `Esf` or `Ecf`.
+        source (bytes): The serialized pub file. Any object supporting the buffer protocol can be
+            used, including an `mmap`.
+        max_records (int): The maximum number of records in each part.
+
+    Yields:
+        bytes: Each serialized part.
+
+    Raises:
+        TypeError: If `pub_type` is not a pub file type.
+        ValueError: If `max_records` is less than 1.
+    """
+    if max_records < 1:
+        raise ValueError(f"max_records must be at least 1, got {max_records}")
+
+    index = PubFileIndex(pub_type, source, cache_size=0)
+    header = _encode_header(pub_type, index.rid, len(index), index.version)
+    if len(index) == 0:
+        yield header
+        return
+
+    with memoryview(source) as view:
+        for first in range(1, len(index) + 1, max_records):
+            last = min(first + max_records - 1, len(index))
+            yield header + view[index.span(first)[0] : index.span(last)[1]]
+
+
+__all__ = ['merge_pub_files', 'split_pub_file']
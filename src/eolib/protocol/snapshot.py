@@ -0,0 +1,549 @@
+import mmap
+import os
+import stat
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from eolib.data.eo_reader import EoReader
+from eolib.protocol.map import Emf
+from eolib.protocol.map.map_grid import MapGrid
+from eolib.protocol.map.map_pathfinding import NPC_BLOCKING_TILE_SPECS, build_walkability
+from eolib.protocol.map.map_line_of_sight import SIGHT_BLOCKING_TILE_SPECS
+from eolib.protocol.pub.columnar_records import ColumnarRecords
+from eolib.protocol.pub.pub_file_index import PubFileIndex, _get_pub_file_format
+
+SNAPSHOT_VERSION = 1
+"""
+The version of the snapshot format.
+
+The version changes whenever the layout of a snapshot file or the arrays compiled into it change,
+so that snapshots written by other versions of eolib are rebuilt.
+"""
+
+_MAGIC = b"EOLIBSNP"
+_HEADER = struct.Struct("<8sHBx8sQII")
+_ENTRY = struct.Struct("<32scB6xQQ")
+_ALIGNMENT = 8
+_BYTE_ORDERS = {"little": 0, "big": 1}
+
+ArrayLike = Union[bytes, bytearray, memoryview, array]
+
+
+def _get_file_mode(path: str) -> int:
+    # Keep the mode of an existing file, or use the mode that open() would create a file with.
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        pass
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def compute_source_checksum(data: bytes) -> Tuple[int, int]:
+    """
+    Computes the checksum of a source file that a snapshot is validated against.
+
+    Args:
+        data (bytes): The content of the source file. Any object supporting the buffer protocol
+            can be used, including an `mmap`.
+
+    Returns:
+        Tuple[int, int]: The size of the source file, and the CRC-32 of its content.
+    """
+    return (len(memoryview(data)), zlib.crc32(data))
+
+
+class Snapshot:
+    """
+    A memory-mapped file of named flat arrays compiled from a source map or pub file.
+
+    Arrays are returned as `memoryview`s of the mapped file, so they can be used directly without
+    being read or copied. A snapshot records the checksum of the source file it was compiled from,
+    so that a stale snapshot can be detected and rebuilt.
+
+    A snapshot file consists of a header, an entry for each array, and the content of each array
+    aligned to 8 bytes. Arrays are stored in the native byte order and item sizes of the platform
+    that wrote them, and snapshots written on an incompatible platform are rejected.
+
+    Example:
+        ```python
+        with load_map_snapshot("maps/00005.emf") as snapshot:
+            width, height = snapshot["dimensions"]
+            finder = PathFinder(snapshot["player_walkable"], width, height)
+        ```
+    """
+
+    _mapping: Optional[mmap.mmap]
+    _data: memoryview
+    _kind: str
+    _source_checksum: Tuple[int, int]
+    _entries: Dict[str, Tuple[str, int, int]]
+
+    def __init__(self, data: bytes):
+        """
+        Creates a new `Snapshot` instance from the content of a snapshot file.
+
+        Args:
+            data (bytes): The content of the snapshot file. Any object supporting the buffer
+                protocol can be used, including an `mmap`.
+
+        Raises:
+            ValueError: If the data is not a snapshot, was written by another version of the
+                snapshot format, or was written on a platform with a different byte order or item
+                sizes.
+        """
+        self._mapping = None
+        self._data = memoryview(data)
+        try:
+            self._read_header()
+        except ValueError:
+            # Release the view so that a memory-mapped file can be closed.
+            self._data.release()
+            raise
+
+    def _read_header(self) -> None:
+        if len(self._data) < _HEADER.size:
+            raise ValueError("snapshot is truncated")
+        magic, version, byte_order, kind, size, crc, count = _HEADER.unpack_from(self._data)
+        if magic != _MAGIC:
+            raise ValueError("not a snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported snapshot version: {version}")
+        if byte_order != _BYTE_ORDERS[sys.byteorder]:
+            raise ValueError("snapshot was written with a different byte order")
+        self._kind = kind.rstrip(b"\0").decode("ascii")
+        self._source_checksum = (size, crc)
+
+        self._entries = {}
+        position = _HEADER.size
+        for _ in range(count):
+            if position + _ENTRY.size > len(self._data):
+                raise ValueError("snapshot is truncated")
+            name, typecode, itemsize, offset, length = _ENTRY.unpack_from(self._data, position)
+            position += _ENTRY.size
+            typecode = typecode.decode("ascii")
+            if array(typecode).itemsize != itemsize:
+                raise ValueError(f"snapshot was written with a different size of '{typecode}'")
+            if offset + length * itemsize > len(self._data):
+                raise ValueError("snapshot is truncated")
+            self._entries[name.rstrip(b"\0").decode("utf-8")] = (typecode, offset, length)
+
+    @staticmethod
+    def open(path: Union[str, "os.PathLike[str]"]) -> "Snapshot":
+        """
+        Opens a snapshot file by memory-mapping it.
+
+        The mapping stays open until the snapshot is closed, which can be done using the snapshot
+        as a context manager.
+
+        Args:
+            path (Union[str, os.PathLike[str]]): The path to the snapshot file.
+
+        Returns:
+            Snapshot: The snapshot.
+
+        Raises:
+            OSError: If the file cannot be opened or mapped.
+            ValueError: If the file is not a valid snapshot for this platform.
+        """
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                raise ValueError("snapshot is truncated")
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            result = Snapshot(mapping)  # type: ignore [arg-type]
+        except ValueError:
+            mapping.close()
+            raise
+        result._mapping = mapping
+        return result
+
+    @staticmethod
+    def write(
+        path: Union[str, "os.PathLike[str]"],
+        kind: str,
+        source_checksum: Tuple[int, int],
+        arrays: Dict[str, ArrayLike],
+    ) -> None:
+        """
+        Writes a snapshot file.
+
+        The snapshot is written to a uniquely named temporary file in the same directory, which
+        then replaces `path` with the mode of the file it replaces, or the mode of a newly created
+        file if there is none. A partially written snapshot is therefore never opened, and
+        concurrent writers of the same snapshot do not interfere with each other. The temporary
+        file is removed if writing fails.
+
+        Args:
+            path (Union[str, os.PathLike[str]]): The path to the snapshot file.
+            kind (str): The kind of source file, such as `emf` or `eif`, of up to 8 characters.
+            source_checksum (Tuple[int, int]): The checksum of the source file, as computed by
+                `compute_source_checksum`.
+            arrays (Dict[str, ArrayLike]): The arrays to store, keyed by names of up to 32 bytes.
+                Byte strings are stored as arrays of unsigned bytes.
+
+        Raises:
+            OSError: If the file cannot be written.
+            ValueError: If `kind` or the name of an array is too long.
+        """
+        encoded_kind = kind.encode("ascii")
+        if len(encoded_kind) > 8:
+            raise ValueError(f"kind is longer than 8 characters: {kind}")
+        entries = []
+        contents = []
+        position = _HEADER.size + _ENTRY.size * len(arrays)
+        for name, values in arrays.items():
+            encoded_name = name.encode("utf-8")
+            if len(encoded_name) > 32:
+                raise ValueError(f"array name is longer than 32 bytes: {name}")
+            if isinstance(values, array):
+                typecode, itemsize, content = values.typecode, values.itemsize, values.tobytes()
+            else:
+                typecode, itemsize, content = "B", 1, bytes(values)
+            position += -position % _ALIGNMENT
+            entries.append(
+                _ENTRY.pack(
+                    encoded_name,
+                    typecode.encode("ascii"),
+                    itemsize,
+                    position,
+                    len(content) // itemsize,
+                )
+            )
+            contents.append((position, content))
+            position += len(content)
+
+        header = _HEADER.pack(
+            _MAGIC,
+            SNAPSHOT_VERSION,
+            _BYTE_ORDERS[sys.byteorder],
+            encoded_kind,
+            *source_checksum,
+            len(arrays),
+        )
+        path = os.fspath(path)
+        directory, name = os.path.split(path)
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", prefix=f"{name}.", dir=directory or ".")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(header)
+                file.write(b"".join(entries))
+                for offset, content in contents:
+                    file.write(bytes(offset - file.tell()))
+                    file.write(content)
+            # mkstemp creates the file readable only by its owner.
+            os.chmod(temp_path, _get_file_mode(path))
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @property
+    def kind(self) -> str:
+        """
+        str: Gets the kind of source file that the snapshot was compiled from, such as `emf`.
+        """
+        return self._kind
+
+    @property
+    def source_checksum(self) -> Tuple[int, int]:
+        """
+        Tuple[int, int]: Gets the checksum of the source file that the snapshot was compiled from.
+        """
+        return self._source_checksum
+
+    @property
+    def names(self) -> List[str]:
+        """
+        List[str]: Gets the names of the arrays in the snapshot.
+        """
+        return list(self._entries)
+
+    def matches(self, data: bytes) -> bool:
+        """
+        Checks if the snapshot was compiled from a source file.
+
+        Args:
+            data (bytes): The content of the source file.
+
+        Returns:
+            bool: True if the checksum of `data` matches the snapshot.
+        """
+        return compute_source_checksum(data) == self._source_checksum
+
+    def __getitem__(self, name: str) -> memoryview:
+        """
+        Gets an array from the snapshot without copying it.
+
+        Args:
+            name (str): The name of the array.
+
+        Returns:
+            memoryview: The array, with the format of its `array.array` typecode.
+
+        Raises:
+            KeyError: If there is no array with the name.
+        """
+        typecode, offset, length = self._entries[name]
+        end = offset + length * array(typecode).itemsize
+        return self._data[offset:end].cast(typecode)  # type: ignore [call-overload]
+
+    def __contains__(self, name: object) -> bool:
+        """
+        Checks if the snapshot has an array.
+
+        Args:
+            name (object): The name of the array.
+
+        Returns:
+            bool: True if the snapshot has an array with the name.
+        """
+        return name in self._entries
+
+    def close(self) -> None:
+        """
+        Releases the snapshot data, closing the underlying file mapping if the snapshot was
+        opened with `open()`.
+
+        Raises:
+            BufferError: If arrays returned by the snapshot still refer to the file mapping.
+        """
+        self._data.release()
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def load_snapshot(
+    source_path: Union[str, "os.PathLike[str]"],
+    kind: str,
+    compiler: Callable[[bytes], Dict[str, ArrayLike]],
+    snapshot_path: Union[str, "os.PathLike[str]", None] = None,
+) -> Snapshot:
+    """
+    Opens the snapshot of a source file, compiling and writing it first if it is missing, stale
+    or invalid.
+
+    Args:
+        source_path (Union[str, os.PathLike[str]]): The path to the source file.
+        kind (str): The kind of source file, such as `emf` or `eif`.
+        compiler (Callable[[bytes], Dict[str, ArrayLike]]): A function that compiles the content
+            of the source file into the arrays to store.
+        snapshot_path (Union[str, os.PathLike[str], None], optional): The path to the snapshot
+            file. Defaults to None, meaning `source_path` with `.snapshot` appended.
+
+    Returns:
+        Snapshot: The snapshot, which is up to date with the source file.
+
+    Raises:
+        OSError: If the source file cannot be read, or the snapshot cannot be written.
+        PermissionError: If the snapshot file cannot be opened due to its permissions.
+    """
+    source_path = os.fspath(source_path)
+    if snapshot_path is None:
+        snapshot_path = f"{source_path}.snapshot"
+    with open(source_path, "rb") as file:
+        data = file.read()
+
+    try:
+        snapshot = Snapshot.open(snapshot_path)
+    except PermissionError:
+        # Rebuilding would hide a misconfiguration, and is likely to fail in the same way.
+        raise
+    except (OSError, ValueError):
+        pass
+    else:
+        if snapshot.kind == kind and snapshot.matches(data):
+            return snapshot
+        snapshot.close()
+
+    Snapshot.write(snapshot_path, kind, compute_source_checksum(data), compiler(data))
+    return Snapshot.open(snapshot_path)
+
+
+def compile_map_snapshot(data: bytes) -> Dict[str, ArrayLike]:
+    """
+    Compiles an EMF file into the arrays of a map snapshot.
+
+    The snapshot holds the following arrays, where each grid is indexed by `y * width + x` and
+    covers the tiles of a [`MapGrid`][eolib.protocol.map.map_grid.MapGrid]:
+
+    - `dimensions`: The width and height of the grid.
+    - `tile_specs`: The tile spec of each tile, or `NO_TILE_SPEC`.
+    - `player_walkable`: 1 for each tile that players can walk onto.
+    - `npc_walkable`: 1 for each tile that NPCs can walk onto.
+    - `transparent`: 1 for each tile that can be seen through.
+    - `warp_tiles`: The grid index of each warp.
+    - `warp_maps`, `warp_xs`, `warp_ys`, `warp_levels` and `warp_doors`: The destination map,
+      destination coordinates, required level and door of each warp.
+
+    Args:
+        data (bytes): The content of the EMF file.
+
+    Returns:
+        Dict[str, ArrayLike]: The arrays of the map snapshot.
+    """
+    grid = MapGrid(Emf.deserialize(EoReader(data)))
+    warps = list(grid.warps())
+    return {
+        "dimensions": array("H", [grid.width, grid.height]),
+        "tile_specs": grid.tile_specs,
+        "player_walkable": build_walkability(grid),
+        "npc_walkable": build_walkability(grid, NPC_BLOCKING_TILE_SPECS, block_warps=True),
+        "transparent": build_walkability(grid, SIGHT_BLOCKING_TILE_SPECS, block_doors=False),
+        "warp_tiles": array("I", [y * grid.width + x for x, y, _ in warps]),
+        "warp_maps": array("H", [warp.destination_map for _, _, warp in warps]),
+        "warp_xs": array("H", [warp.destination_coords.x for _, _, warp in warps]),
+        "warp_ys": array("H", [warp.destination_coords.y for _, _, warp in warps]),
+        "warp_levels": array("H", [warp.level_required for _, _, warp in warps]),
+        "warp_doors": array("H", [warp.door for _, _, warp in warps]),
+    }
+
+
+def compile_pub_snapshot(pub_type: type, data: bytes) -> Dict[str, ArrayLike]:
+    """
+    Compiles a pub file into the arrays of a pub snapshot.
+
+    The snapshot holds the following arrays:
+
+    - `header`: The two parts of the rid, the total records count and the version of the pub file.
+    - `column:<name>`: The column of each stored field of a
+      [`ColumnarRecords`][eolib.protocol.pub.columnar_records.ColumnarRecords].
+    - `string_pool`: The UTF-8 encoded strings of the string pool, one after another.
+    - `string_pool_offsets`: The start of each string in `string_pool`, followed by its length.
+
+    Args:
+        pub_type (type): The pub file type, which is one of `Eif`, `Enf`, `Esf` or `Ecf`.
+        data (bytes): The content of the pub file.
+
+    Returns:
+        Dict[str, ArrayLike]: The arrays of the pub snapshot.
+
+    Raises:
+        TypeError: If `pub_type` is not a pub file type.
+    """
+    index = PubFileIndex(pub_type, data, cache_size=0)
+    columns = ColumnarRecords.from_index(index)
+
+    encoded = [string.encode("utf-8") for string in columns.string_pool]
+    offsets = array("I", [0])
+    for string in encoded:
+        offsets.append(offsets[-1] + len(string))
+
+    result: Dict[str, ArrayLike] = {
+        "header": array("I", [*index.rid, index.total_records_count, index.version]),
+        "string_pool": b"".join(encoded),
+        "string_pool_offsets": offsets,
+    }
+    for name in columns.field_names:
+        result[f"column:{name}"] = columns.column(name)
+    return result
+
+
+def load_map_snapshot(
+    emf_path: Union[str, "os.PathLike[str]"],
+    snapshot_path: Union[str, "os.PathLike[str]", None] = None,
+) -> Snapshot:
+    """
+    Opens the snapshot of an EMF file, compiling it with `compile_map_snapshot` first if it is
+    missing, stale or invalid.
+
+    Args:
+        emf_path (Union[str, os.PathLike[str]]): The path to the EMF file.
+        snapshot_path (Union[str, os.PathLike[str], None], optional): The path to the snapshot
+            file. Defaults to None, meaning `emf_path` with `.snapshot` appended.
+
+    Returns:
+        Snapshot: The map snapshot.
+
+    Raises:
+        OSError: If the EMF file cannot be read, or the snapshot cannot be written.
+        SerializationError: If the EMF file cannot be deserialized.
+    """
+    return load_snapshot(emf_path, "emf", compile_map_snapshot, snapshot_path)
+
+
+def load_pub_snapshot(
+    pub_type: type,
+    pub_path: Union[str, "os.PathLike[str]"],
+    snapshot_path: Union[str, "os.PathLike[str]", None] = None,
+) -> Snapshot:
+    """
+    Opens the snapshot of a pub file, compiling it with `compile_pub_snapshot` first if it is
+    missing, stale or invalid.
+
+    Args:
+        pub_type (type): The pub file type, which is one of `Eif`, `Enf`, `Esf` or `Ecf`.
+        pub_path (Union[str, os.PathLike[str]]): The path to the pub file.
+        snapshot_path (Union[str, os.PathLike[str], None], optional): The path to the snapshot
+            file. Defaults to None, meaning `pub_path` with `.snapshot` appended.
+
+    Returns:
+        Snapshot: The pub snapshot.
+
+    Raises:
+        OSError: If the pub file cannot be read, or the snapshot cannot be written.
+        TypeError: If `pub_type` is not a pub file type.
+    """
+    kind = _get_pub_file_format(pub_type).file_id.lower()
+    return load_snapshot(
+        pub_path, kind, lambda data: compile_pub_snapshot(pub_type, data), snapshot_path
+    )
+
+
+def snapshot_columnar_records(pub_type: type, snapshot: Snapshot) -> ColumnarRecords:
+    """
+    Creates the columnar representation of the records in a pub snapshot.
+
+    The columns are copied from the snapshot as raw bytes, so the result can be used after the
+    snapshot is closed.
+
+    Args:
+        pub_type (type): The pub file type, which is one of `Eif`, `Enf`, `Esf` or `Ecf`.
+        snapshot (Snapshot): The pub snapshot, as created by `compile_pub_snapshot`.
+
+    Returns:
+        ColumnarRecords: The columnar representation of the records.
+
+    Raises:
+        TypeError: If `pub_type` is not a pub file type.
+        ValueError: If the snapshot is not a snapshot of a pub file of that type.
+    """
+    pub_format = _get_pub_file_format(pub_type)
+    if snapshot.kind != pub_format.file_id.lower():
+        raise ValueError(f"{snapshot.kind} snapshot is not a {pub_type.__name__} snapshot")
+
+    pool = snapshot["string_pool"]
+    offsets = snapshot["string_pool_offsets"]
+    strings = [str(pool[offsets[i] : offsets[i + 1]], "utf-8") for i in range(len(offsets) - 1)]
+    prefix = "column:"
+    columns = {
+        name[len(prefix) :]: snapshot[name] for name in snapshot.names if name.startswith(prefix)
+    }
+    result = ColumnarRecords.from_columns(pub_format.record_type, columns, strings)
+    for view in (pool, offsets, *columns.values()):
+        view.release()
+    return result
+
+
+__all__ = [
+    'SNAPSHOT_VERSION',
+    'compute_source_checksum',
+    'Snapshot',
+    'load_snapshot',
+    'compile_map_snapshot',
+    'compile_pub_snapshot',
+    'load_map_snapshot',
+    'load_pub_snapshot',
+    'snapshot_columnar_records',
+]
@@ -0,0 +1,151 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+from eolib.data.number_encoding_utils import decode_number
+
+_INTEGER_SIZES = {"byte": 1, "char": 1, "short": 2, "three": 3, "int": 4}
+
+
+class LayoutField(NamedTuple):
+    """
+    A single field in the binary layout of a protocol data structure.
+    """
+
+    name: Optional[str]
+    """The name of the field, or `None` if the field is unnamed."""
+
+    type: str
+    """
+    The name of the basic type that the field is encoded as.
+
+    Enums and bools are described by their underlying integer type.
+    """
+
+    length: Union[int, str, None]
+    """
+    The length of a string field, which is either fixed or the name of the field holding it.
+
+    `None` for integer fields.
+    """
+
+    value: Union[int, str, None]
+    """The hardcoded value of the field, or `None` if the field is not hardcoded."""
+
+    @property
+    def size(self) -> Optional[int]:
+        """
+        Optional[int]: Gets the size of the field in bytes, or `None` if it is determined by a
+            length field.
+        """
+        if self.type in _INTEGER_SIZES:
+            return _INTEGER_SIZES[self.type]
+        return self.length if isinstance(self.length, int) else None
+
+
+class StructLayout:
+    """
+    The binary layout of a protocol data structure with a flat layout.
+
+    A structure has a flat layout if it contains only integers, strings, enums and bools, and the
+    size of each string is either fixed or held by an earlier length field. The layout is generated
+    from the protocol specification, so the size of a serialized instance can be measured without
+    decoding its strings or constructing the data structure.
+
+    Pub file records all have flat layouts.
+    """
+
+    _struct_type: type
+    _fields: Tuple[LayoutField, ...]
+    _steps: List[Tuple[int, int, int]]
+    _tail_size: int
+    _length_count: int
+
+    def __init__(self, struct_type: type):
+        """
+        Creates a new `StructLayout` instance.
+
+        Args:
+            struct_type (type): The generated data structure class.
+
+        Raises:
+            ValueError: If the data structure does not have a flat layout.
+        """
+        layout = getattr(struct_type, "_field_layout", None)
+        if layout is None:
+            raise ValueError(f"{struct_type.__name__} does not have a flat layout")
+
+        self._struct_type = struct_type
+        self._fields = tuple(LayoutField(*field) for field in layout)
+
+        referenced = {f.length for f in self._fields if isinstance(f.length, str)}
+        slots: Dict[str, int] = {}
+        # Each step is (offset, size, slot).
+        # A step with a size reads a length field at the offset into a slot.
+        # A step without a size advances past the offset plus the length held in the slot.
+        self._steps = []
+        offset = 0
+        for field in self._fields:
+            if field.name in referenced:
+                slots[field.name] = len(slots)
+                self._steps.append((offset, _INTEGER_SIZES[field.type], slots[field.name]))
+            if field.size is None:
+                self._steps.append((offset, 0, slots[field.length]))  # type: ignore [index]
+                offset = 0
+            else:
+                offset += field.size
+        self._tail_size = offset
+        self._length_count = len(slots)
+
+    @property
+    def struct_type(self) -> type:
+        """
+        type: Gets the data structure class that this layout describes.
+        """
+        return self._struct_type
+
+    @property
+    def fields(self) -> Tuple[LayoutField, ...]:
+        """
+        Tuple[LayoutField, ...]: Gets the fields of the data structure, in serialization order.
+        """
+        return self._fields
+
+    @property
+    def fixed_size(self) -> Optional[int]:
+        """
+        Optional[int]: Gets the size of every serialized instance in bytes, or `None` if the size
+            depends on the values of length fields.
+        """
+        return self._tail_size if self._length_count == 0 else None
+
+    def size_of(self, data: Sequence[int], position: int = 0) -> int:
+        """
+        Measures a serialized instance of the data structure without deserializing it.
+
+        Only the length fields are decoded. If the data ends before the instance does, the size of
+        the remaining data is returned, as the generated deserializer would read only that much.
+
+        Args:
+            data (Sequence[int]): The data containing the serialized instance, such as `bytes` or a
+                `memoryview`.
+            position (int, optional): The position of the instance in the data. Defaults to 0.
+
+        Returns:
+            int: The size of the serialized instance in bytes.
+
+        Raises:
+            ValueError: If a length field holds a negative length.
+        """
+        lengths = [0] * self._length_count
+        cursor = position
+        for offset, size, slot in self._steps:
+            if size:
+                start = cursor + offset
+                length = decode_number(data[start : start + size])  # type: ignore [arg-type]
+                if length < 0:
+                    raise ValueError("Negative length")
+                lengths[slot] = length
+            else:
+                cursor += offset + lengths[slot]
+        return min(cursor + self._tail_size, len(data)) - position
+
+
+__all__ = ['LayoutField', 'StructLayout']
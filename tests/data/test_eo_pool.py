@@ -0,0 +1,77 @@
+import threading
+import pytest
+from eolib.data.eo_pool import EoReaderPool, EoWriterPool
+
+
+def test_reader_pool_reuses_released_reader():
+    pool = EoReaderPool()
+    reader = pool.acquire(bytes([0x01, 0x02]))
+    reader.get_byte()
+    pool.release(reader)
+
+    reused = pool.acquire(bytes([0xCA, 0x31]))
+    assert reused is reader
+    assert reused.position == 0
+    assert reused.get_short() == 12345
+
+
+def test_reader_pool_context_manager():
+    pool = EoReaderPool()
+    with pool.reader(bytes([0x7C])) as reader:
+        assert reader.get_char() == 123
+    with pool.reader(bytes([0x01])) as reused:
+        assert reused is reader
+
+
+def test_writer_pool_reuses_released_writer():
+    pool = EoWriterPool()
+    writer = pool.acquire()
+    writer.string_sanitization_mode = True
+    writer.add_string("foo")
+    pool.release(writer)
+
+    reused = pool.acquire()
+    assert reused is writer
+    assert len(reused) == 0
+    assert not reused.string_sanitization_mode
+
+
+def test_writer_pool_context_manager():
+    pool = EoWriterPool()
+    with pool.writer() as writer:
+        writer.add_char(123)
+        assert writer.to_bytearray() == bytearray([0x7C])
+    with pool.writer() as reused:
+        assert reused is writer
+        assert len(reused) == 0
+
+
+def test_pool_max_size():
+    pool = EoWriterPool(1)
+    first = pool.acquire()
+    second = pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    assert pool.acquire() is first
+    assert pool.acquire() is not second
+
+
+def test_pool_negative_max_size():
+    with pytest.raises(ValueError):
+        EoReaderPool(-1)
+    with pytest.raises(ValueError):
+        EoWriterPool(-1)
+
+
+def test_pool_is_thread_local():
+    pool = EoWriterPool()
+    writer = pool.acquire()
+    pool.release(writer)
+
+    acquired = []
+    thread = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    thread.start()
+    thread.join()
+
+    assert acquired[0] is not writer
+    assert pool.acquire() is writer
@@ -1,6 +1,6 @@
 import pytest
 from typing import Iterable
-from eolib import EoReader
+from eolib import EoReader, StringCache
 
 
 def test_slice():
@@ -127,6 +127,44 @@ def test_get_int():
     assert reader.get_int() == 4097152080
 
 
+def test_get_chars():
+    reader = create_reader([0x01, 0x02, 0x80, 0x81, 0xFD, 0xFE, 0xFF])
+    assert reader.get_chars(3) == [0, 1, 127]
+    assert reader.get_chars(0) == []
+    assert reader.get_chars(5) == [128, 252, 0, 254, 0]
+    assert reader.remaining == 0
+
+
+def test_get_shorts():
+    reader = create_reader([0x01, 0xFE, 0xFE, 0x80, 0x7F, 0x7F, 0xFD, 0xFD, 0xCA])
+    assert reader.get_shorts(3) == [0, 0, 32004]
+    assert reader.get_shorts(3) == [64008, 201, 0]
+
+
+def test_get_threes():
+    reader = create_reader([0x80, 0x81, 0x7F, 0xFD, 0xFD, 0xFD, 0x02])
+    assert reader.get_threes(3) == [8097645, 16194276, 1]
+
+
+def test_get_ints():
+    reader = create_reader([0x7F, 0x7F, 0x7F, 0x7F, 0xFD, 0xFD, 0xFD, 0xFD])
+    assert reader.get_ints(3) == [2048576040, 4097152080, 0]
+
+
+def test_chunked_get_shorts():
+    reader = create_reader([0xCA, 0x31, 0x7C, 0xFF, 0xCA, 0x31])
+    reader.chunked_reading_mode = True
+    assert reader.get_shorts(2) == [12345, 123]
+    reader.next_chunk()
+    assert reader.get_shorts(1) == [12345]
+
+
+def test_get_negative_length_numbers():
+    reader = create_reader([0x01])
+    with pytest.raises(ValueError):
+        reader.get_chars(-1)
+
+
 def test_get_string():
     reader = create_reader(b"Hello, World!")
     assert reader.get_string() == "Hello, World!"
@@ -194,6 +232,36 @@ def test_get_negative_length_encoded_string():
         reader.get_fixed_encoded_string(-1)
 
 
+def test_get_string_with_string_cache():
+    cache = StringCache()
+    reader = create_reader(bytes("fooÿbarfooÿ^0g", "windows-1252"))
+    reader.string_cache = cache
+
+    first = reader.get_fixed_string(4, True)
+    assert first == "foo"
+    assert reader.get_fixed_string(3) == "bar"
+    assert reader.get_fixed_string(4, True) is first
+    assert reader.get_fixed_encoded_string(3) == "foo"
+    assert reader.remaining == 0
+
+    assert cache.hits == 1
+    assert cache.misses == 3
+
+
+def test_slice_shares_string_cache():
+    cache = StringCache()
+    reader = EoReader(b"foo", cache)
+    assert reader.slice().string_cache is cache
+
+
+def test_get_long_string_with_string_cache():
+    cache = StringCache(max_length=2)
+    reader = create_reader(b"foo")
+    reader.string_cache = cache
+    assert reader.get_string() == "foo"
+    assert len(cache) == 0
+
+
 def test_chunked_reading_mode():
     reader = create_reader([])
     assert not reader.chunked_reading_mode
@@ -315,6 +383,77 @@ def test_double_read():
     assert reader.get_short() == 12345
 
 
+def test_reset():
+    reader = create_reader([0x01, 0x02, 0xFF, 0x03])
+    reader.chunked_reading_mode = True
+    reader.get_byte()
+    reader.next_chunk()
+
+    reader.reset(bytes([0xCA, 0x31, 0xFF, 0x7C]))
+    assert reader.position == 0
+    assert reader.remaining == 4
+    assert not reader.chunked_reading_mode
+    assert reader.get_short() == 12345
+
+    reader.chunked_reading_mode = True
+    assert reader.remaining == 0
+    reader.next_chunk()
+    assert reader.get_char() == 123
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes([0xCA, 0x31]) + b"foo")
+
+    with EoReader.from_file(path) as reader:
+        assert reader.remaining == 5
+        assert reader.get_short() == 12345
+        assert reader.get_string() == "foo"
+
+    with pytest.raises(ValueError):
+        reader.get_byte()
+
+
+def test_from_empty_file(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+
+    with EoReader.from_file(path) as reader:
+        assert reader.remaining == 0
+
+
+def test_close_with_slices(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"foobar")
+
+    reader = EoReader.from_file(path)
+    reader2 = reader.slice(3)
+    with pytest.raises(BufferError):
+        reader.close()
+
+    assert reader2.get_string() == "bar"
+    reader2.close()
+
+
+def test_reset_closes_file_mapping(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"foo")
+
+    reader = EoReader.from_file(path)
+    mapping = reader._mapping
+    reader.reset(b"bar")
+    assert mapping.closed
+    assert reader.get_string() == "bar"
+    reader.close()
+
+
+def test_reset_after_close():
+    reader = EoReader(b"foo")
+    reader.close()
+    reader.reset(b"bar")
+    assert reader.get_string() == "bar"
+
+
 def create_reader(input_data: Iterable[int]) -> EoReader:
     data = bytearray(10)
     data.extend(input_data)
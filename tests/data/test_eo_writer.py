@@ -39,6 +39,49 @@ def test_add_int():
     assert writer.to_bytearray() == bytearray([0x7F, 0x7F, 0x7F, 0x7F])
 
 
+def test_add_chars():
+    writer = EoWriter()
+    writer.add_chars([0, 123, 252])
+    assert writer.to_bytearray() == bytearray([0x01, 0x7C, 0xFD])
+
+
+def test_add_shorts():
+    writer = EoWriter()
+    writer.add_shorts([12345, 0, 64008])
+    assert writer.to_bytearray() == bytearray([0xCA, 0x31, 0x01, 0xFE, 0xFD, 0xFD])
+
+
+def test_add_threes():
+    writer = EoWriter()
+    writer.add_threes([10000000])
+    assert writer.to_bytearray() == bytearray([0xB0, 0x3A, 0x9D])
+
+
+def test_add_ints():
+    writer = EoWriter()
+    writer.add_ints([2048576040, 0])
+    assert writer.to_bytearray() == bytearray([0x7F, 0x7F, 0x7F, 0x7F, 0x01, 0xFE, 0xFE, 0xFE])
+
+
+def test_add_empty_numbers():
+    writer = EoWriter()
+    writer.add_chars([])
+    writer.add_shorts([])
+    assert len(writer) == 0
+
+
+def test_add_numbers_array_exceeding_limit():
+    writer = EoWriter()
+    with pytest.raises(ValueError):
+        writer.add_chars([1, CHAR_MAX])
+    with pytest.raises(ValueError):
+        writer.add_shorts([SHORT_MAX, 1])
+    with pytest.raises(ValueError):
+        writer.add_threes([THREE_MAX])
+    with pytest.raises(ValueError):
+        writer.add_ints([INT_MAX])
+
+
 def test_add_string():
     writer = EoWriter()
     writer.add_string("foo")
@@ -185,3 +228,139 @@ def test_len():
     for _ in range(27, 101):
         writer.add_byte(0xFF)
     assert len(writer) == 100
+
+
+def test_reset():
+    writer = EoWriter()
+    writer.string_sanitization_mode = True
+    writer.add_string("Lorem ipsum dolor sit amet")
+
+    writer.reset()
+    assert len(writer) == 0
+    assert writer.to_bytearray() == bytearray()
+    assert not writer.string_sanitization_mode
+
+    writer.add_short(12345)
+    writer.add_byte(0x00)
+    assert writer.to_bytearray() == bytearray([0xCA, 0x31, 0x00])
+
+
+def test_write_to_buffer():
+    buffer = bytearray(b'\x00\x01\x02\x03\x04\x05')
+    writer = EoWriter(buffer, 2)
+    writer.add_char(123)
+    assert len(writer) == 1
+    assert writer.to_bytearray() == bytearray([0x7C])
+    assert buffer == bytearray(b'\x00\x01\x7C\x03\x04\x05')
+
+    writer.add_string("foobar")
+    assert writer.to_bytearray() == bytearray(b'\x7Cfoobar')
+    assert buffer == bytearray(b'\x00\x01\x7Cfoobar')
+
+
+def test_write_to_buffer_with_invalid_offset():
+    with pytest.raises(ValueError):
+        EoWriter(bytearray(2), -1)
+    with pytest.raises(ValueError):
+        EoWriter(bytearray(2), 3)
+
+
+def test_data():
+    buffer = bytearray(b'xx')
+    writer = EoWriter(buffer, 1)
+    writer.add_bytes(b'abc')
+    assert writer.data == bytearray(b'abc')
+
+    writer.reset()
+    assert writer.data == bytearray()
+
+
+def test_getbuffer():
+    buffer = bytearray(8)
+    writer = EoWriter(buffer, 1)
+    writer.add_bytes(b'abc')
+
+    view = writer.getbuffer()
+    assert view == b'abc'
+
+    view[0] = 0x7A
+    assert writer.to_bytearray() == b'zbc'
+    assert buffer[1] == 0x7A
+    view.release()
+
+
+def test_length_prefix():
+    writer = EoWriter(length_prefix=True)
+    assert len(writer) == 2
+
+    writer.add_string("Lorem ipsum dolor sit amet")
+    writer.finalize_length_prefix()
+    assert writer.to_bytearray()[:2] == bytearray([0x1B, 0xFE])
+    assert writer.to_bytearray()[2:] == b'Lorem ipsum dolor sit amet'
+
+    writer.reset()
+    assert len(writer) == 2
+    writer.add_bytes(bytes(300))
+    writer.finalize_length_prefix()
+    assert writer.to_bytearray()[:2] == bytearray([0x30, 0x02])
+
+
+def test_length_prefix_in_buffer():
+    buffer = bytearray(b'\xAA' * 8)
+    writer = EoWriter(buffer, 3, True)
+    writer.add_byte(0x01)
+    writer.finalize_length_prefix()
+    assert buffer == bytearray(b'\xAA\xAA\xAA\x02\xFE\x01\xAA\xAA')
+
+
+def test_finalize_length_prefix_without_length_prefix():
+    writer = EoWriter()
+    with pytest.raises(RuntimeError):
+        writer.finalize_length_prefix()
+
+
+def test_reserve_and_patch():
+    writer = EoWriter()
+    char = writer.reserve_char()
+    short = writer.reserve_short()
+    three = writer.reserve_three()
+    int_ = writer.reserve_int()
+    writer.add_byte(0x00)
+
+    assert writer.to_bytearray() == bytearray(
+        [0x01, 0x01, 0xFE, 0x01, 0xFE, 0xFE, 0x01, 0xFE, 0xFE, 0xFE, 0x00]
+    )
+    assert (short.position, short.size) == (1, 2)
+
+    writer.patch(char, 123)
+    writer.patch(short, 12345)
+    writer.patch(three, 10000000)
+    writer.patch(int_, 2048576040)
+
+    assert writer.to_bytearray() == bytearray(
+        [0x7C, 0xCA, 0x31, 0xB0, 0x3A, 0x9D, 0x7F, 0x7F, 0x7F, 0x7F, 0x00]
+    )
+
+
+def test_patch_in_buffer():
+    buffer = bytearray(b'\xaa\xaa')
+    writer = EoWriter(buffer, 1)
+    reservation = writer.reserve_short()
+    writer.add_string("foo")
+    writer.patch(reservation, len(writer) - 2)
+    assert buffer == bytearray(b'\xaa\x04\xfefoo')
+
+
+def test_patch_exceeding_limit():
+    writer = EoWriter()
+    reservation = writer.reserve_char()
+    with pytest.raises(ValueError):
+        writer.patch(reservation, CHAR_MAX)
+
+
+def test_patch_after_reset():
+    writer = EoWriter()
+    reservation = writer.reserve_short()
+    writer.reset()
+    with pytest.raises(ValueError):
+        writer.patch(reservation, 1)
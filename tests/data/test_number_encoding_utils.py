@@ -1,6 +1,11 @@
 import pytest
 from collections import namedtuple
-from eolib.data.number_encoding_utils import encode_number, decode_number
+from eolib.data.number_encoding_utils import (
+    encode_number,
+    decode_number,
+    encode_numbers,
+    decode_numbers,
+)
 
 
 TCase = namedtuple("TCase", ["decoded", "encoded"])
@@ -54,3 +59,21 @@ def test_encode_number(test_case: TCase) -> None:
 )
 def test_decode_number(test_case: TCase) -> None:
     assert decode_number(test_case.encoded) == test_case.decoded
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4])
+def test_encode_numbers(size: int) -> None:
+    numbers = [t.decoded for t in TEST_CASES if t.decoded < 253**size]
+    expected = b"".join(bytes(t.encoded[:size]) for t in TEST_CASES if t.decoded < 253**size)
+    assert encode_numbers(numbers, size) == expected
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4])
+def test_decode_numbers(size: int) -> None:
+    numbers = [t.decoded for t in TEST_CASES if t.decoded < 253**size]
+    encoded = b"".join(bytes(t.encoded[:size]) for t in TEST_CASES if t.decoded < 253**size)
+    assert decode_numbers(encoded, size) == numbers
+
+
+def test_decode_numbers_with_partial_number() -> None:
+    assert decode_numbers(bytes([0xCA, 0x31, 0x7C]), 2) == [12345, 123]
@@ -0,0 +1,84 @@
+import threading
+import pytest
+from eolib.data.string_cache import StringCache
+
+
+def test_get_and_put():
+    cache = StringCache()
+    assert cache.get(b"foo") is None
+    value = cache.put(b"foo", "foo")
+    assert cache.get(b"foo") is value
+    assert len(cache) == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.hit_rate == 0.5
+
+
+def test_hit_rate_without_lookups():
+    assert StringCache().hit_rate == 0.0
+
+
+def test_put_interns_strings():
+    cache = StringCache()
+    value = cache.put(b"a", "".join(["fo", "o"]))
+    assert value is cache.put(b"b", "".join(["f", "oo"]))
+
+
+def test_least_recently_used_eviction():
+    cache = StringCache(2)
+    cache.put(b"a", "a")
+    cache.put(b"b", "b")
+    cache.get(b"a")
+    cache.put(b"c", "c")
+
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == "a"
+    assert cache.get(b"c") == "c"
+    assert cache.evictions == 1
+
+
+def test_zero_max_size():
+    cache = StringCache(0)
+    cache.put(b"a", "a")
+    assert len(cache) == 0
+
+
+def test_clear():
+    cache = StringCache()
+    cache.put(b"a", "a")
+    cache.get(b"a")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 0
+    assert cache.misses == 0
+
+
+def test_shared_between_threads():
+    cache = StringCache(max_size=8)
+    errors = []
+
+    def work(offset):
+        try:
+            for i in range(2000):
+                key = str((i + offset) % 16).encode()
+                if cache.get(key) is None:
+                    cache.put(key, key.decode())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(cache) == 8
+    assert cache.hits + cache.misses == 8000
+
+
+def test_negative_limits():
+    with pytest.raises(ValueError):
+        StringCache(-1)
+    with pytest.raises(ValueError):
+        StringCache(1, -1)
@@ -0,0 +1,128 @@
+import os
+import pytest
+from eolib.data.eo_reader import EoReader
+from eolib.packet.file_transfer_cache import FileTransferCache, build_file_transfer_packet
+from eolib.protocol.net import PacketAction, PacketFamily
+from eolib.protocol.net.server import InitInitServerPacket, InitReply
+
+
+def read_packet(data):
+    reader = EoReader(data)
+    assert reader.get_short() == len(data) - 2
+    assert reader.get_byte() == PacketAction.Init
+    assert reader.get_byte() == PacketFamily.Init
+    return InitInitServerPacket.deserialize(reader)
+
+
+def test_build_pub_file_packet():
+    packet = read_packet(build_file_transfer_packet(InitReply.FileEnf, b"ENF content", 3))
+    assert packet.reply_code == InitReply.FileEnf
+    assert packet.reply_code_data.pub_file.file_id == 3
+    assert packet.reply_code_data.pub_file.content == b"ENF content"
+
+
+def test_build_map_file_packet():
+    packet = read_packet(build_file_transfer_packet(InitReply.FileEmf, b"EMF content"))
+    assert packet.reply_code == InitReply.FileEmf
+    assert packet.reply_code_data.map_file.content == b"EMF content"
+
+
+def test_build_invalid_reply_code():
+    with pytest.raises(ValueError):
+        build_file_transfer_packet(InitReply.Ok, b"content")
+
+
+def test_build_too_large():
+    with pytest.raises(ValueError):
+        build_file_transfer_packet(InitReply.FileEif, bytes(70000))
+
+
+def test_get_reuses_packet():
+    cache = FileTransferCache()
+    first = cache.get(InitReply.FileEif, b"EIF content")
+    assert cache.get(InitReply.FileEif, bytearray(b"EIF content")) is first
+    assert cache.get(InitReply.FileEif, b"EIF content", 2) is not first
+    assert cache.get(InitReply.FileEsf, b"EIF content") is not first
+    assert cache.get(InitReply.FileEif, b"other content") is not first
+    assert len(cache) == 4
+
+
+def test_get_file(tmp_path):
+    path = tmp_path / "dat001.eif"
+    path.write_bytes(b"version 1")
+    cache = FileTransferCache()
+
+    first = cache.get_file(InitReply.FileEif, path)
+    assert cache.get_file(InitReply.FileEif, path) is first
+    assert read_packet(first).reply_code_data.pub_file.content == b"version 1"
+
+    path.write_bytes(b"version two")
+    second = cache.get_file(InitReply.FileEif, path)
+    assert read_packet(second).reply_code_data.pub_file.content == b"version two"
+    assert len(cache) == 1
+
+
+def test_get_file_unchanged_content_is_not_rebuilt(tmp_path):
+    path = tmp_path / "00001.emf"
+    path.write_bytes(b"map")
+    cache = FileTransferCache()
+    first = cache.get_file(InitReply.FileEmf, path)
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.get_file(InitReply.FileEmf, path) is first
+
+
+def test_get_file_shares_identical_content(tmp_path):
+    (tmp_path / "a.emf").write_bytes(b"map")
+    (tmp_path / "b.emf").write_bytes(b"map")
+    cache = FileTransferCache()
+    first = cache.get_file(InitReply.FileEmf, tmp_path / "a.emf")
+    assert cache.get_file(InitReply.FileEmf, tmp_path / "b.emf") is first
+    assert len(cache) == 1
+
+
+def test_invalidate(tmp_path):
+    path = tmp_path / "dat001.eif"
+    path.write_bytes(b"content")
+    cache = FileTransferCache()
+    first = cache.get_file(InitReply.FileEif, path)
+
+    cache.invalidate(path)
+    assert len(cache) == 0
+    second = cache.get_file(InitReply.FileEif, path)
+    assert second == first and second is not first
+
+    cache.get(InitReply.FileEsf, b"other")
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_least_recently_used_eviction(tmp_path):
+    path = tmp_path / "dat001.eif"
+    path.write_bytes(b"file content")
+    cache = FileTransferCache(max_size=2)
+    from_file = cache.get_file(InitReply.FileEif, path)
+    first = cache.get(InitReply.FileEsf, b"first")
+
+    assert cache.get_file(InitReply.FileEif, path) is from_file
+    cache.get(InitReply.FileEsf, b"second")
+    assert len(cache) == 2
+    assert cache.get(InitReply.FileEsf, b"first") is not first
+
+    assert cache.get_file(InitReply.FileEif, path) is not from_file
+    assert len(cache) == 2
+
+
+def test_zero_max_size(tmp_path):
+    path = tmp_path / "dat001.eif"
+    path.write_bytes(b"content")
+    cache = FileTransferCache(max_size=0)
+    first = cache.get_file(InitReply.FileEif, path)
+    assert cache.get_file(InitReply.FileEif, path) is not first
+    assert len(cache) == 0
+
+
+def test_negative_max_size():
+    with pytest.raises(ValueError):
+        FileTransferCache(max_size=-1)
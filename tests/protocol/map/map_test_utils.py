@@ -0,0 +1,153 @@
+import random
+from eolib.data.eo_writer import EoWriter
+from eolib.protocol import Coords
+from eolib.protocol.map import (
+    Emf,
+    MapGraphicLayer,
+    MapGraphicRow,
+    MapGraphicRowTile,
+    MapItem,
+    MapLegacyDoorKey,
+    MapMusicControl,
+    MapNpc,
+    MapSign,
+    MapTileSpec,
+    MapTileSpecRow,
+    MapTileSpecRowTile,
+    MapTimedEffect,
+    MapType,
+    MapWarp,
+    MapWarpRow,
+    MapWarpRowTile,
+)
+
+
+def make_coords(x, y):
+    coords = Coords()
+    coords.x = x
+    coords.y = y
+    return coords
+
+
+def make_rows(row_type, tile_factory, width, height, density, rnd):
+    rows = []
+    for y in range(height):
+        tiles = [tile_factory(x) for x in range(width) if rnd.random() < density]
+        if tiles:
+            row = row_type()
+            row.y = y
+            row.tiles = tiles
+            rows.append(row)
+    return rows
+
+
+def make_emf(width=20, height=15, seed=0, tile_specs=None, graphic_density=0.3):
+    rnd = random.Random(seed)
+    emf = Emf()
+    emf.rid = [1, 2]
+    emf.name = "Test Map"
+    emf.type = MapType.Normal
+    emf.timed_effect = MapTimedEffect.None_
+    emf.music_id = 3
+    emf.music_control = MapMusicControl.InterruptIfDifferentPlayOnce
+    emf.ambient_sound_id = 0
+    emf.width = width - 1
+    emf.height = height - 1
+    emf.fill_tile = 1
+    emf.map_available = True
+    emf.can_scroll = False
+    emf.relog_x = 0
+    emf.relog_y = 0
+
+    npcs = []
+    for i in range(3):
+        npc = MapNpc()
+        npc.coords = make_coords(i + 1, i + 2)
+        npc.id = 10 + i
+        npc.spawn_type = 0
+        npc.spawn_time = 60
+        npc.amount = 2
+        npcs.append(npc)
+    emf.npcs = npcs
+
+    key = MapLegacyDoorKey()
+    key.coords = make_coords(4, 4)
+    key.key = 1
+    emf.legacy_door_keys = [key]
+
+    items = []
+    for i in range(2):
+        item = MapItem()
+        item.coords = make_coords(5, i + 5)
+        item.key = 0
+        item.chest_slot = i
+        item.item_id = 100 + i
+        item.spawn_time = 30
+        item.amount = 1000
+        items.append(item)
+    emf.items = items
+
+    def make_tile_spec(x):
+        tile = MapTileSpecRowTile()
+        tile.x = x
+        tile.tile_spec = MapTileSpec.Wall
+        return tile
+
+    if tile_specs is None:
+        emf.tile_spec_rows = make_rows(MapTileSpecRow, make_tile_spec, width, height, 0.1, rnd)
+    else:
+        tile_spec_rows = []
+        for y in sorted({y for _, y in tile_specs}):
+            row = MapTileSpecRow()
+            row.y = y
+            tiles = []
+            for (x, tile_y), tile_spec in sorted(tile_specs.items()):
+                if tile_y == y:
+                    tile = MapTileSpecRowTile()
+                    tile.x = x
+                    tile.tile_spec = tile_spec
+                    tiles.append(tile)
+            row.tiles = tiles
+            tile_spec_rows.append(row)
+        emf.tile_spec_rows = tile_spec_rows
+
+    def make_warp(x):
+        warp = MapWarp()
+        warp.destination_map = 2
+        warp.destination_coords = make_coords(x, 1)
+        warp.level_required = 0
+        warp.door = 0
+        tile = MapWarpRowTile()
+        tile.x = x
+        tile.warp = warp
+        return tile
+
+    emf.warp_rows = make_rows(MapWarpRow, make_warp, width, height, 0.02, rnd)
+
+    def make_graphic(x):
+        tile = MapGraphicRowTile()
+        tile.x = x
+        tile.graphic = rnd.randrange(1, 500)
+        return tile
+
+    graphic_layers = []
+    for _ in range(9):
+        layer = MapGraphicLayer()
+        layer.graphic_rows = make_rows(
+            MapGraphicRow, make_graphic, width, height, graphic_density, rnd
+        )
+        graphic_layers.append(layer)
+    emf.graphic_layers = graphic_layers
+
+    sign = MapSign()
+    sign.coords = make_coords(2, 3)
+    sign.string_data = "TitleSign text"
+    sign.title_length = 5
+    emf.signs = [sign]
+    return emf
+
+
+def serialize(data):
+    writer = EoWriter()
+    type(data).serialize(writer, data)
+    return bytes(writer.to_bytearray())
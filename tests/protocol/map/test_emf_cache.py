@@ -0,0 +1,102 @@
+import sys
+import pytest
+from eolib.protocol.map import EmfCache, emf_memory_size
+from map_test_utils import make_emf, serialize
+
+
+@pytest.fixture
+def map_directory(tmp_path):
+    for map_id in range(1, 5):
+        (tmp_path / f"{map_id:05d}.emf").write_bytes(serialize(make_emf(seed=map_id)))
+    return tmp_path
+
+
+def test_emf_memory_size():
+    small = make_emf(width=10, height=10)
+    large = make_emf(width=60, height=60)
+    assert emf_memory_size(small) > sys.getsizeof(small)
+    assert emf_memory_size(large) > emf_memory_size(small)
+
+
+def test_get_loads_and_caches(map_directory):
+    cache = EmfCache(map_directory, max_bytes=10**9)
+    emf = cache.get(1)
+    assert serialize(emf) == (map_directory / "00001.emf").read_bytes()
+    assert cache.get(1) is emf
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.hit_rate == 0.5
+    assert 1 in cache
+    assert len(cache) == 1
+    assert cache.size_of(1) == emf_memory_size(emf)
+    assert cache.memory_size == cache.size_of(1)
+
+
+def test_evicts_least_recently_used(map_directory):
+    size = emf_memory_size(EmfCache(map_directory, 0).get(1))
+    cache = EmfCache(map_directory, max_bytes=size * 5 // 2)
+    cache.get(1)
+    cache.get(2)
+    cache.get(1)
+    cache.get(3)
+    assert 2 not in cache
+    assert 1 in cache
+    assert 3 in cache
+    assert cache.evictions == 1
+    assert cache.memory_size == cache.size_of(1) + cache.size_of(3)
+    assert cache.memory_size <= cache.max_bytes
+
+
+def test_keeps_map_larger_than_budget(map_directory):
+    cache = EmfCache(map_directory, max_bytes=0)
+    emf = cache.get(1)
+    assert cache.peek(1) is emf
+    cache.get(2)
+    assert 1 not in cache
+    assert 2 in cache
+    assert cache.evictions == 1
+
+
+def test_peek_does_not_load_or_count(map_directory):
+    cache = EmfCache(map_directory, max_bytes=10**9)
+    assert cache.peek(1) is None
+    assert cache.size_of(1) is None
+    assert cache.hits == 0
+    assert cache.misses == 0
+
+
+def test_invalidate(map_directory):
+    cache = EmfCache(map_directory, max_bytes=10**9)
+    first = cache.get(1)
+    cache.get(2)
+    cache.invalidate(1)
+    assert 1 not in cache
+    assert cache.memory_size == cache.size_of(2)
+    assert cache.get(1) is not first
+    cache.invalidate()
+    assert len(cache) == 0
+    assert cache.memory_size == 0
+    assert cache.evictions == 0
+
+
+def test_reset_stats(map_directory):
+    cache = EmfCache(map_directory, max_bytes=10**9)
+    cache.get(1)
+    cache.get(1)
+    cache.reset_stats()
+    assert cache.hits == 0
+    assert cache.misses == 0
+    assert cache.hit_rate == 0.0
+    assert 1 in cache
+
+
+def test_missing_map(map_directory):
+    cache = EmfCache(map_directory, max_bytes=10**9)
+    with pytest.raises(OSError):
+        cache.get(99)
+    assert len(cache) == 0
+
+
+def test_negative_budget(map_directory):
+    with pytest.raises(ValueError):
+        EmfCache(map_directory, max_bytes=-1)
@@ -0,0 +1,90 @@
+import pickle
+import pytest
+from eolib.data.eo_reader import EoReader
+from eolib.protocol.map import EMF_SECTIONS, Emf, EmfSectionIndex
+from map_test_utils import make_emf, serialize
+
+
+def test_spans_cover_file():
+    data = serialize(make_emf())
+    index = EmfSectionIndex(data)
+    assert index.header_span == (0, 46)
+    position = 46
+    for section in EMF_SECTIONS:
+        start, end = index.span(section)
+        assert start == position
+        position = end
+    assert position == len(data)
+
+
+def test_graphic_layer_spans():
+    index = EmfSectionIndex(serialize(make_emf()))
+    start, end = index.span("graphic_layers")
+    spans = [index.graphic_layer_span(i) for i in range(9)]
+    assert spans[0][0] == start
+    assert spans[-1][1] == end
+    assert all(spans[i][1] == spans[i + 1][0] for i in range(8))
+    with pytest.raises(IndexError):
+        index.graphic_layer_span(9)
+
+
+def test_section_bytes_match_serialized_sections():
+    emf = make_emf()
+    index = EmfSectionIndex(serialize(emf))
+    for i, layer in enumerate(emf.graphic_layers):
+        assert bytes(index.get_graphic_layer_bytes(i)) == serialize(layer)
+    assert bytes(index.get_bytes("signs"))[1:] == serialize(emf.signs[0])
+
+
+@pytest.mark.parametrize("section", EMF_SECTIONS)
+def test_read_section(section):
+    emf = make_emf()
+    index = EmfSectionIndex(serialize(emf))
+    expected = Emf.deserialize(EoReader(serialize(emf)))
+    actual = index.read_section(section)
+    assert [serialize(element) for element in actual] == [
+        serialize(element) for element in getattr(expected, section)
+    ]
+
+
+def test_read_header():
+    emf = make_emf()
+    index = EmfSectionIndex(serialize(emf))
+    header = index.read_header()
+    assert header.name == "Test Map"
+    assert header.width == emf.width
+    assert header.npcs == []
+    assert len(header.graphic_layers) == 9
+
+    for section in EMF_SECTIONS:
+        setattr(header, section, index.read_section(section))
+    assert serialize(header) == serialize(emf)
+
+
+def test_empty_map():
+    emf = make_emf(graphic_density=0)
+    emf.npcs = []
+    emf.signs = []
+    data = serialize(emf)
+    index = EmfSectionIndex(data)
+    assert index.span("signs") == (len(data) - 1, len(data))
+    assert index.read_section("npcs") == []
+
+
+def test_truncated():
+    data = serialize(make_emf())
+    index = EmfSectionIndex(data[:100])
+    assert all(index.span(section)[1] <= 100 for section in EMF_SECTIONS)
+
+
+def test_unknown_section():
+    with pytest.raises(KeyError):
+        EmfSectionIndex(serialize(make_emf())).span("name")
+
+
+def test_pickle():
+    data = serialize(make_emf(seed=1))
+    index = pickle.loads(pickle.dumps(EmfSectionIndex(memoryview(data))))
+    assert bytes(index.get_graphic_layer_bytes(2)) == bytes(
+        EmfSectionIndex(data).get_graphic_layer_bytes(2)
+    )
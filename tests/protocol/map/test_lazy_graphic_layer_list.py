@@ -0,0 +1,79 @@
+from eolib.data.eo_reader import EoReader
+from eolib.data.eo_writer import EoWriter
+from eolib.protocol.map import (
+    Emf,
+    EmfSectionIndex,
+    LazyGraphicLayerList,
+    MapGraphicLayer,
+    deserialize_emf_lazy,
+)
+from map_test_utils import make_emf, serialize
+
+
+def serialize_all(values):
+    writer = EoWriter()
+    for value in values:
+        type(value).serialize(writer, value)
+    return bytes(writer.to_bytearray())
+
+
+def test_deserialize_emf_lazy_defers_graphic_layers():
+    data = serialize(make_emf(seed=1))
+    emf = deserialize_emf_lazy(data)
+    assert isinstance(emf.graphic_layers, LazyGraphicLayerList)
+    assert len(emf.graphic_layers) == 9
+    assert emf.graphic_layers.materialized_count == 0
+    assert emf.byte_size == len(data)
+
+
+def test_other_sections_match_eager_deserialization():
+    data = serialize(make_emf(seed=2))
+    eager = Emf.deserialize(EoReader(data))
+    lazy = deserialize_emf_lazy(data)
+    assert lazy.name == eager.name
+    assert lazy.width == eager.width
+    assert serialize_all(lazy.npcs) == serialize_all(eager.npcs)
+    assert serialize_all(lazy.items) == serialize_all(eager.items)
+    assert serialize_all(lazy.tile_spec_rows) == serialize_all(eager.tile_spec_rows)
+    assert serialize_all(lazy.warp_rows) == serialize_all(eager.warp_rows)
+    assert serialize_all(lazy.signs) == serialize_all(eager.signs)
+
+
+def test_graphic_layers_load_on_access():
+    data = serialize(make_emf(seed=3))
+    eager = Emf.deserialize(EoReader(data))
+    lazy = deserialize_emf_lazy(data)
+    layers = lazy.graphic_layers
+
+    layer = layers[4]
+    assert layers.is_materialized(4)
+    assert not layers.is_materialized(3)
+    assert layers.materialized_count == 1
+    assert layers[4] is layer
+    assert serialize_all([layer]) == serialize_all([eager.graphic_layers[4]])
+    assert serialize_all(layers) == serialize_all(eager.graphic_layers)
+    assert layers.materialized_count == 9
+
+
+def test_round_trip():
+    data = serialize(make_emf(seed=4))
+    assert serialize(deserialize_emf_lazy(data)) == data
+
+
+def test_replace_layer():
+    emf = make_emf(seed=5)
+    lazy = deserialize_emf_lazy(serialize(emf))
+    empty = MapGraphicLayer()
+    empty.graphic_rows = []
+    lazy.graphic_layers[0] = empty
+    assert lazy.graphic_layers.is_materialized(0)
+    emf.graphic_layers = [empty] + list(emf.graphic_layers[1:])
+    assert serialize(lazy) == serialize(emf)
+
+
+def test_section_index():
+    data = serialize(make_emf(seed=6))
+    layers = deserialize_emf_lazy(data).graphic_layers
+    assert isinstance(layers.section_index, EmfSectionIndex)
+    start, end = layers.section_index.graphic_layer_span(0)
+    assert 0 < start < end <= len(data)
@@ -0,0 +1,113 @@
+import pytest
+from eolib.protocol.map import NO_GRAPHIC, NO_TILE_SPEC, MapGrid, MapTileSpec, MapWarp
+from map_test_utils import make_coords, make_emf, serialize
+
+
+def test_dimensions():
+    grid = MapGrid(make_emf(width=20, height=15))
+    assert grid.width == 20
+    assert grid.height == 15
+    assert len(grid.tile_specs) == 300
+    assert len(grid.graphic_layer(0)) == 300
+
+
+def test_tile_specs():
+    emf = make_emf(tile_specs={(3, 4): MapTileSpec.Wall, (5, 4): MapTileSpec.Chest})
+    grid = MapGrid(emf)
+    assert grid.get_tile_spec(3, 4) == MapTileSpec.Wall
+    assert grid.get_tile_spec(5, 4) == MapTileSpec.Chest
+    assert grid.get_tile_spec(4, 4) is None
+    assert grid.tile_specs[4 * grid.width + 5] == MapTileSpec.Chest
+    assert grid.tile_specs[4 * grid.width + 4] == NO_TILE_SPEC
+    assert grid.get_tile_spec(-1, 0) is None
+    assert grid.get_tile_spec(0, 100) is None
+
+    grid.set_tile_spec(4, 4, MapTileSpec.Water)
+    grid.set_tile_spec(3, 4, None)
+    assert grid.get_tile_spec(4, 4) == MapTileSpec.Water
+    assert grid.get_tile_spec(3, 4) is None
+
+
+def test_warps():
+    emf = make_emf(seed=3)
+    grid = MapGrid(emf)
+    for row in emf.warp_rows:
+        for tile in row.tiles:
+            assert grid.get_warp(tile.x, row.y) is tile.warp
+
+    warp = MapWarp()
+    warp.destination_map = 5
+    warp.destination_coords = make_coords(1, 1)
+    warp.level_required = 0
+    warp.door = 0
+    grid.set_warp(0, 0, warp)
+    assert grid.get_warp(0, 0) is warp
+    grid.set_warp(0, 0, None)
+    assert grid.get_warp(0, 0) is None
+
+
+def test_iterate_warps():
+    emf = make_emf(seed=3)
+    grid = MapGrid(emf)
+    expected = sorted(
+        ((tile.x, row.y, tile.warp) for row in emf.warp_rows for tile in row.tiles),
+        key=lambda warp: (warp[1], warp[0]),
+    )
+    assert expected
+    assert list(grid.warps()) == expected
+
+    grid.set_warp(expected[0][0], expected[0][1], None)
+    assert list(grid.warps()) == expected[1:]
+
+
+def test_graphics():
+    emf = make_emf()
+    grid = MapGrid(emf)
+    for i, layer in enumerate(emf.graphic_layers):
+        for row in layer.graphic_rows:
+            for tile in row.tiles:
+                assert grid.get_graphic(i, tile.x, row.y) == tile.graphic
+    total = sum(len(row.tiles) for row in emf.graphic_layers[0].graphic_rows)
+    assert sum(1 for graphic in grid.graphic_layer(0) if graphic != NO_GRAPHIC) == total
+
+    grid.set_graphic(8, 1, 2, 123)
+    assert grid.get_graphic(8, 1, 2) == 123
+    grid.set_graphic(8, 1, 2, None)
+    assert grid.get_graphic(8, 1, 2) is None
+    with pytest.raises(IndexError):
+        grid.get_graphic(9, 0, 0)
+
+
+def test_set_outside_grid():
+    grid = MapGrid(make_emf(width=10, height=10))
+    with pytest.raises(IndexError):
+        grid.set_tile_spec(10, 0, MapTileSpec.Wall)
+    with pytest.raises(IndexError):
+        grid.set_graphic(0, 0, -1, 1)
+
+
+def test_tiles_outside_map_bounds():
+    emf = make_emf(width=10, height=10, tile_specs={(12, 3): MapTileSpec.Wall})
+    grid = MapGrid(emf)
+    assert grid.width == 13
+    assert grid.get_tile_spec(12, 3) == MapTileSpec.Wall
+    assert serialize(grid.to_emf()) == serialize(emf)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_round_trip(seed):
+    emf = make_emf(width=30, height=25, seed=seed)
+    assert serialize(MapGrid(emf).to_emf()) == serialize(emf)
+
+
+def test_round_trip_after_edit():
+    emf = make_emf(tile_specs={})
+    grid = MapGrid(emf)
+    grid.set_tile_spec(2, 3, MapTileSpec.Wall)
+    grid.set_graphic(0, 0, 0, NO_GRAPHIC - 1)
+    result = grid.to_emf()
+    assert [(row.y, [tile.x for tile in row.tiles]) for row in result.tile_spec_rows] == [(3, [2])]
+    assert MapGrid(result).get_graphic(0, 0, 0) == NO_GRAPHIC - 1
+    assert result.npcs == emf.npcs
+    assert result.npcs is not emf.npcs
+    assert emf.tile_spec_rows == []
@@ -0,0 +1,136 @@
+import random
+import pytest
+from eolib.protocol.map import (
+    LineOfSight,
+    MapGrid,
+    MapTileSpec,
+    row_spans_in_range,
+    tile_indices_in_range,
+)
+from map_test_utils import make_emf
+
+
+def make_sight(rows):
+    emf = make_emf(
+        width=len(rows[0]),
+        height=len(rows),
+        tile_specs={
+            (x, y): MapTileSpec.Wall
+            for y, row in enumerate(rows)
+            for x, c in enumerate(row)
+            if c == "#"
+        },
+    )
+    return LineOfSight.from_grid(MapGrid(emf))
+
+
+def bresenham(x0, y0, x1, y1):
+    tiles = []
+    dx, dy = abs(x1 - x0), -abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    error = dx + dy
+    while (x0, y0) != (x1, y1):
+        doubled_error = 2 * error
+        if doubled_error >= dy:
+            error += dy
+            x0 += sx
+        if doubled_error <= dx:
+            error += dx
+            y0 += sy
+        tiles.append((x0, y0))
+    return tiles[:-1]
+
+
+def test_row_spans_in_range():
+    assert list(row_spans_in_range(5, 5, 2, 20, 20)) == [
+        (3, 5, 5),
+        (4, 4, 6),
+        (5, 3, 7),
+        (6, 4, 6),
+        (7, 5, 5),
+    ]
+    assert list(row_spans_in_range(0, 0, 1, 20, 20)) == [(0, 0, 1), (1, 0, 0)]
+    assert list(row_spans_in_range(30, 0, 1, 20, 20)) == []
+
+
+@pytest.mark.parametrize("x, y, distance", [(5, 5, 3), (0, 0, 4), (9, 2, 11), (3, 7, 0)])
+def test_tile_indices_in_range(x, y, distance):
+    width, height = 10, 8
+    expected = [
+        tile_y * width + tile_x
+        for tile_y in range(height)
+        for tile_x in range(width)
+        if abs(tile_x - x) + abs(tile_y - y) <= distance
+    ]
+    assert list(tile_indices_in_range(x, y, distance, width, height)) == expected
+
+
+def test_walls_block_sight():
+    sight = make_sight(
+        [
+            ".....",
+            "..#..",
+            ".....",
+        ]
+    )
+    assert not sight.has_line_of_sight((0, 1), (4, 1))
+    assert not sight.has_line_of_sight((4, 1), (0, 1))
+    assert sight.has_line_of_sight((0, 0), (4, 0))
+    assert sight.has_line_of_sight((0, 1), (2, 1))
+    assert sight.has_line_of_sight((2, 1), (2, 1))
+
+
+def test_out_of_bounds():
+    sight = make_sight(["..."])
+    assert not sight.has_line_of_sight((0, 0), (3, 0))
+    assert not sight.has_line_of_sight((-1, 0), (1, 0))
+    assert not sight.is_transparent(3, 0)
+
+
+def test_set_transparent():
+    sight = make_sight(["..."])
+    sight.set_transparent(1, 0, False)
+    assert not sight.is_transparent(1, 0)
+    assert not sight.has_line_of_sight((0, 0), (2, 0))
+    sight.set_transparent(1, 0, True)
+    assert sight.has_line_of_sight((0, 0), (2, 0))
+    with pytest.raises(IndexError):
+        sight.set_transparent(0, 1, True)
+
+
+def test_matches_bresenham_and_is_symmetric():
+    rnd = random.Random(0)
+    rows = ["".join("#" if rnd.random() < 0.15 else "." for _ in range(30)) for _ in range(20)]
+    sight = make_sight(rows)
+    for _ in range(2000):
+        a = (rnd.randrange(30), rnd.randrange(20))
+        b = (rnd.randrange(30), rnd.randrange(20))
+        first, last = sorted([a, b], key=lambda tile: (tile[1], tile[0]))
+        expected = all(rows[y][x] == "." for x, y in bresenham(*first, *last))
+        assert sight.has_line_of_sight(a, b) == expected
+        assert sight.has_line_of_sight(b, a) == expected
+
+
+def test_tile_indices_in_sight():
+    sight = make_sight(
+        [
+            ".....",
+            ".#...",
+            ".....",
+        ]
+    )
+    visible = list(sight.tile_indices_in_sight(0, 1, 4))
+    assert 1 * 5 + 1 in visible
+    assert 1 * 5 + 2 not in visible
+    assert 1 * 5 + 0 in visible
+    assert all(
+        sight.has_line_of_sight((0, 1), (index % 5, index // 5))
+        for index in tile_indices_in_range(0, 1, 4, 5, 3)
+        if index in visible
+    )
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        LineOfSight(bytes(3), 2, 2)
@@ -0,0 +1,55 @@
+import pickle
+import sys
+import pytest
+from eolib.protocol.map import LazyGraphicLayerList, find_map_files, load_maps
+from map_test_utils import make_emf, serialize
+
+
+@pytest.fixture
+def map_directory(tmp_path):
+    for map_id in [1, 2, 5, 12, 300]:
+        (tmp_path / f"{map_id:05d}.emf").write_bytes(serialize(make_emf(seed=map_id)))
+    (tmp_path / "readme.txt").write_text("not a map")
+    (tmp_path / "backup.emf").write_bytes(b"")
+    return tmp_path
+
+
+def test_find_map_files(map_directory):
+    paths = find_map_files(map_directory)
+    assert list(paths) == [1, 2, 5, 12, 300]
+    assert paths[5] == str(map_directory / "00005.emf")
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+@pytest.mark.parametrize("lazy_graphic_layers", [True, False])
+def test_load_maps(map_directory, processes, lazy_graphic_layers):
+    maps = load_maps(map_directory, processes, lazy_graphic_layers)
+    assert list(maps) == [1, 2, 5, 12, 300]
+    for map_id, emf in maps.items():
+        assert serialize(emf) == (map_directory / f"{map_id:05d}.emf").read_bytes()
+        assert isinstance(emf.graphic_layers, LazyGraphicLayerList) == lazy_graphic_layers
+
+
+def test_load_maps_in_process_by_default(map_directory, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("process pool should not be used")
+
+    monkeypatch.setattr(sys.modules[load_maps.__module__], "ProcessPoolExecutor", fail)
+    maps = load_maps(map_directory)
+    assert sorted(maps) == [1, 2, 5, 12, 300]
+
+
+def test_lazy_maps_pickle_without_materializing(map_directory):
+    emf = load_maps(map_directory, processes=1)[2]
+    copy = pickle.loads(pickle.dumps(emf))
+    assert copy.graphic_layers.materialized_count == 0
+    assert serialize(copy) == serialize(emf)
+
+
+def test_empty_directory(tmp_path):
+    assert load_maps(tmp_path, processes=2) == {}
+
+
+def test_invalid_processes(map_directory):
+    with pytest.raises(ValueError):
+        load_maps(map_directory, processes=0)
@@ -0,0 +1,195 @@
+import random
+from collections import deque
+import pytest
+from eolib.protocol.map import (
+    MapGrid,
+    MapTileSpec,
+    MapWarp,
+    NPC_BLOCKING_TILE_SPECS,
+    PathFinder,
+    build_walkability,
+)
+from map_test_utils import make_coords, make_emf
+
+
+def make_grid(rows, **tile_specs):
+    """Makes a grid from rows of characters, where '#' is a wall and 'w' is water."""
+    specs = {"#": MapTileSpec.Wall, "w": MapTileSpec.Water, "n": MapTileSpec.NpcBoundary}
+    emf = make_emf(
+        width=len(rows[0]),
+        height=len(rows),
+        tile_specs={
+            (x, y): specs[c] for y, row in enumerate(rows) for x, c in enumerate(row) if c in specs
+        },
+    )
+    emf.warp_rows = []
+    return MapGrid(emf)
+
+
+def make_warp(door):
+    warp = MapWarp()
+    warp.destination_map = 1
+    warp.destination_coords = make_coords(0, 0)
+    warp.level_required = 0
+    warp.door = door
+    return warp
+
+
+def test_build_walkability():
+    grid = make_grid(["#.w", "..n"])
+    assert build_walkability(grid) == bytearray([0, 1, 1, 1, 1, 1])
+    assert build_walkability(grid, NPC_BLOCKING_TILE_SPECS) == bytearray([0, 1, 0, 1, 1, 0])
+
+
+def test_build_walkability_warps():
+    grid = make_grid(["..."])
+    grid.set_warp(0, 0, make_warp(0))
+    grid.set_warp(2, 0, make_warp(1))
+    assert build_walkability(grid) == bytearray([1, 1, 1])
+    assert build_walkability(grid, block_doors=True) == bytearray([1, 1, 0])
+    assert build_walkability(grid, block_warps=True) == bytearray([0, 1, 0])
+
+
+def test_find_path_straight():
+    finder = PathFinder.from_grid(make_grid(["....."]))
+    assert finder.find_path((0, 0), (4, 0)) == [(1, 0), (2, 0), (3, 0), (4, 0)]
+    assert finder.find_path((4, 0), (4, 0)) == []
+
+
+def test_find_path_around_walls():
+    grid = make_grid(
+        [
+            ".#...",
+            ".#.#.",
+            ".#.#.",
+            "...#.",
+        ]
+    )
+    path = PathFinder.from_grid(grid).find_path((0, 0), (4, 0))
+    assert len(path) == 10
+    assert path[-1] == (4, 0)
+    steps = [(0, 0)] + path
+    assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(steps, steps[1:]))
+    assert all(grid.get_tile_spec(x, y) is None for x, y in path)
+
+
+def test_find_path_unreachable():
+    finder = PathFinder.from_grid(make_grid(["..#.."]))
+    assert finder.find_path((0, 0), (4, 0)) is None
+    assert finder.find_path((0, 0), (2, 0)) is None
+    assert finder.find_path((0, 0), (9, 0)) is None
+    assert finder.find_path((-1, 0), (1, 0)) is None
+
+
+def test_find_path_max_steps():
+    finder = PathFinder.from_grid(make_grid(["....."]))
+    assert finder.find_path((0, 0), (4, 0), max_steps=3) is None
+    assert len(finder.find_path((0, 0), (4, 0), max_steps=4)) == 4
+
+
+def test_find_path_from_blocked_start():
+    finder = PathFinder.from_grid(make_grid(["#.."]))
+    assert finder.find_path((0, 0), (2, 0)) == [(1, 0), (2, 0)]
+
+
+def test_npc_paths_avoid_boundaries_and_water():
+    grid = make_grid(
+        [
+            "..n..",
+            "..w..",
+            ".....",
+        ]
+    )
+    assert len(PathFinder.from_grid(grid).find_path((0, 0), (4, 0))) == 4
+    assert len(PathFinder.from_grid(grid, for_npcs=True).find_path((0, 0), (4, 0))) == 8
+
+
+def test_set_walkable():
+    finder = PathFinder.from_grid(make_grid(["..."]))
+    finder.set_walkable(1, 0, False)
+    assert not finder.is_walkable(1, 0)
+    assert finder.find_path((0, 0), (2, 0)) is None
+    finder.set_walkable(1, 0, True)
+    assert finder.find_path((0, 0), (2, 0)) == [(1, 0), (2, 0)]
+    with pytest.raises(IndexError):
+        finder.set_walkable(3, 0, True)
+
+
+def test_set_walkable_joins_regions():
+    finder = PathFinder.from_grid(make_grid(["..#..", "..#..", "..#.."]))
+    assert finder.find_path((0, 0), (4, 2)) is None
+    finder.set_walkable(2, 1, True)
+    assert len(finder.find_path((0, 0), (4, 2))) == 6
+    finder.set_walkable(2, 1, False)
+    assert finder.find_path((0, 0), (4, 2)) is None
+    finder.set_walkable(2, 2, True)
+    assert len(finder.find_path((0, 0), (4, 2))) == 6
+
+
+def test_find_path_from_blocked_start_between_regions():
+    finder = PathFinder.from_grid(make_grid(["..#..", "....."]))
+    finder.set_walkable(2, 1, False)
+    assert len(finder.find_path((2, 1), (0, 0))) == 3
+    assert len(finder.find_path((2, 1), (4, 0))) == 3
+    assert finder.find_path((0, 0), (4, 0)) is None
+
+
+def shortest_path_length(walkable, width, height, start, goal):
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        if (x, y) == goal:
+            return distances[goal]
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (
+                0 <= nx < width
+                and 0 <= ny < height
+                and walkable[ny * width + nx]
+                and (nx, ny) not in distances
+            ):
+                distances[(nx, ny)] = distances[(x, y)] + 1
+                queue.append((nx, ny))
+    return None
+
+
+@pytest.mark.parametrize("density", [0.0, 0.2, 0.4])
+def test_find_path_is_shortest(density):
+    rng = random.Random(density)
+    width, height = 30, 20
+    walkable = bytearray(0 if rng.random() < density else 1 for _ in range(width * height))
+    finder = PathFinder(walkable, width, height)
+    for _ in range(50):
+        start = (rng.randrange(width), rng.randrange(height))
+        goal = (rng.randrange(width), rng.randrange(height))
+        if not walkable[start[1] * width + start[0]]:
+            continue
+        path = finder.find_path(start, goal)
+        expected = shortest_path_length(walkable, width, height, start, goal)
+        if expected is None:
+            assert path is None
+        else:
+            assert len(path) == expected
+            steps = [start] + path
+            assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(steps, steps[1:]))
+            assert all(walkable[y * width + x] for x, y in path)
+
+
+def test_reachable_tiles():
+    finder = PathFinder.from_grid(make_grid(["...#.", "....."]))
+    assert sorted(finder.reachable_tiles((0, 0), 1)) == [(0, 1), (1, 0)]
+    assert sorted(finder.reachable_tiles((0, 0), 2)) == [(0, 1), (1, 0), (1, 1), (2, 0)]
+    assert len(finder.reachable_tiles((0, 0), 100)) == 8
+    assert finder.reachable_tiles((9, 9), 1) == []
+
+
+def test_repeated_queries_reuse_buffers():
+    finder = PathFinder.from_grid(make_grid(["....", "....", "...."]))
+    for _ in range(100):
+        assert len(finder.find_path((0, 0), (3, 2))) == 5
+        assert len(finder.reachable_tiles((0, 0), 10)) == 11
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        PathFinder(bytes(5), 2, 2)
@@ -0,0 +1,123 @@
+import random
+import pytest
+from eolib.protocol.map import MapEntityIndex, SpatialIndex
+from map_test_utils import make_emf
+
+
+def brute_force_in_range(positions, x, y, distance):
+    return {e for e, (ex, ey) in positions.items() if abs(ex - x) + abs(ey - y) <= distance}
+
+
+def brute_force_in_rect(positions, left, top, right, bottom):
+    return {e for e, (ex, ey) in positions.items() if left <= ex <= right and top <= ey <= bottom}
+
+
+def test_add_move_remove():
+    index = SpatialIndex(bucket_size=4)
+    index.add("a", 1, 1)
+    index.add("b", 10, 10)
+    assert len(index) == 2
+    assert "a" in index
+    assert index.position("a") == (1, 1)
+
+    index.move("a", 2, 3)
+    assert index.position("a") == (2, 3)
+    index.move("a", 9, 9)
+    assert sorted(index.in_rect(8, 8, 10, 10)) == ["a", "b"]
+    assert index.in_rect(0, 0, 7, 7) == []
+
+    index.add("b", 0, 0)
+    assert index.position("b") == (0, 0)
+    assert len(index) == 2
+
+    index.remove("a")
+    assert "a" not in index
+    assert index.position("a") is None
+    assert list(index) == ["b"]
+
+    with pytest.raises(KeyError):
+        index.remove("a")
+    with pytest.raises(KeyError):
+        index.move("a", 1, 1)
+
+
+def test_clear():
+    index = SpatialIndex()
+    index.add(1, 1, 1)
+    index.clear()
+    assert len(index) == 0
+    assert index.in_range(1, 1, 5) == []
+
+
+def test_in_range_is_manhattan_distance():
+    index = SpatialIndex(bucket_size=3)
+    index.add("center", 5, 5)
+    index.add("edge", 7, 6)
+    index.add("corner", 7, 7)
+    assert sorted(index.in_range(5, 5, 3)) == ["center", "edge"]
+    assert sorted(index.in_range(5, 5, 4)) == ["center", "corner", "edge"]
+    assert index.in_range(5, 5, 0) == ["center"]
+
+
+def test_negative_coordinates():
+    index = SpatialIndex(bucket_size=4)
+    index.add("a", -3, -1)
+    assert index.in_range(0, 0, 4) == ["a"]
+    assert index.in_rect(-5, -5, -1, -1) == ["a"]
+
+
+@pytest.mark.parametrize("bucket_size", [1, 5, 11, 100])
+def test_queries_match_brute_force(bucket_size):
+    rnd = random.Random(bucket_size)
+    index = SpatialIndex(bucket_size)
+    positions = {}
+    for entity in range(300):
+        positions[entity] = (rnd.randrange(64), rnd.randrange(64))
+        index.add(entity, *positions[entity])
+
+    for _ in range(200):
+        entity = rnd.randrange(300)
+        positions[entity] = (rnd.randrange(64), rnd.randrange(64))
+        index.move(entity, *positions[entity])
+
+        x, y, distance = rnd.randrange(64), rnd.randrange(64), rnd.randrange(20)
+        assert set(index.in_range(x, y, distance)) == brute_force_in_range(
+            positions, x, y, distance
+        )
+
+        left, top = rnd.randrange(64), rnd.randrange(64)
+        right, bottom = left + rnd.randrange(40), top + rnd.randrange(40)
+        assert set(index.in_rect(left, top, right, bottom)) == brute_force_in_rect(
+            positions, left, top, right, bottom
+        )
+
+
+def test_invalid_bucket_size():
+    with pytest.raises(ValueError):
+        SpatialIndex(bucket_size=0)
+
+
+def test_map_entity_index():
+    emf = make_emf(seed=2)
+    index = MapEntityIndex(emf)
+
+    assert len(index.npc_spawns) == len(emf.npcs)
+    for npc in emf.npcs:
+        assert index.npc_spawns.position(npc) == (npc.coords.x, npc.coords.y)
+    for item in emf.items:
+        assert item in index.items.in_range(item.coords.x, item.coords.y, 0)
+    for sign in emf.signs:
+        assert index.signs.in_rect(sign.coords.x, sign.coords.y, sign.coords.x, sign.coords.y) == [
+            sign
+        ]
+    warps = [(tile.warp, tile.x, row.y) for row in emf.warp_rows for tile in row.tiles]
+    assert len(index.warps) == len(warps)
+    for warp, x, y in warps:
+        assert index.warps.position(warp) == (x, y)
+
+    assert len(index.players) == 0
+    assert len(index.npcs) == 0
+    index.players.add(1, 3, 3)
+    index.npcs.add(0, 4, 3)
+    assert index.npcs.in_range(3, 3, 1) == [0]
+    assert index.players.bucket_size == index.npcs.bucket_size
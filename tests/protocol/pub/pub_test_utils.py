@@ -0,0 +1,40 @@
+from eolib.data.eo_writer import EoWriter
+from eolib.protocol.pub import Ecf, Eif, Enf, Esf
+from eolib.protocol.pub.pub_file_index import _get_pub_file_format
+
+
+def make_record(record_type, record_id):
+    record = record_type()
+    length_names = {field[2] for field in record_type._field_layout}
+    for name, type_, _, value in record_type._field_layout:
+        if name is None or name in length_names or value is not None:
+            continue
+        if type_ in ("string", "encoded_string"):
+            setattr(record, name, f"{name.capitalize()} {record_id}")
+        else:
+            setattr(record, name, record_id % 200)
+    return record
+
+
+def make_pub(pub_type, count):
+    pub_format = _get_pub_file_format(pub_type)
+    pub = pub_type()
+    pub.rid = [1234, 5678]
+    setattr(pub, pub_format.total_records_count_name, count)
+    pub.version = 1
+    records = [make_record(pub_format.record_type, i + 1) for i in range(count)]
+    setattr(pub, pub_format.records_name, records)
+    return pub
+
+
+def serialize(data):
+    writer = EoWriter()
+    type(data).serialize(writer, data)
+    return bytes(writer.to_bytearray())
+
+
+PUB_TYPES = [Eif, Enf, Esf, Ecf]
+
+
+def get_records(pub):
+    return getattr(pub, _get_pub_file_format(type(pub)).records_name)
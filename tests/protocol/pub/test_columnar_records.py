@@ -0,0 +1,198 @@
+import pytest
+from eolib.data.eo_reader import EoReader
+from eolib.data.eo_writer import EoWriter
+from eolib.protocol.pub import ColumnarRecords, Eif, EifRecord, ItemType, PubFileIndex
+from pub_test_utils import PUB_TYPES, get_records, make_pub, serialize
+
+
+def write_records(columns):
+    writer = EoWriter()
+    columns.write_to(writer)
+    return bytes(writer.to_bytearray())
+
+
+@pytest.mark.parametrize("pub_type", PUB_TYPES)
+def test_from_index(pub_type):
+    data = serialize(make_pub(pub_type, 30))
+    expected = get_records(pub_type.deserialize(EoReader(data)))
+
+    columns = ColumnarRecords.from_index(PubFileIndex(pub_type, data))
+    assert len(columns) == 30
+    assert [serialize(record) for record in columns.to_records()] == [
+        serialize(record) for record in expected
+    ]
+    assert write_records(columns) == data[10:]
+
+
+@pytest.mark.parametrize("pub_type", PUB_TYPES)
+def test_from_records(pub_type):
+    records = get_records(make_pub(pub_type, 10))
+    columns = ColumnarRecords.from_records(type(records[0]), records)
+    assert len(columns) == 10
+    assert write_records(columns) == serialize(make_pub(pub_type, 10))[10:]
+
+
+def test_from_truncated_index():
+    data = serialize(make_pub(Eif, 3))
+    index = PubFileIndex(Eif, data[:-4])
+    columns = ColumnarRecords.from_index(index)
+    assert len(columns) == 3
+    assert serialize(columns.to_record(2)) == serialize(index.get(3))
+
+
+def test_columns():
+    columns = ColumnarRecords.from_records(EifRecord, get_records(make_pub(Eif, 3)))
+    assert "name_length" not in columns.field_names
+    assert columns.field_names[0] == "name"
+    assert columns.column("min_damage").typecode == "H"
+    assert columns.column("spec1").itemsize == 4
+    assert columns.column("name").itemsize == 4
+    assert list(columns.column("min_damage")) == [1, 2, 3]
+    assert columns.string_pool[columns.column("name")[1]] == "Name 2"
+    assert columns.get_value("type", 1) == ItemType.Currency
+    assert isinstance(columns.get_value("type", 1), ItemType)
+    assert columns.to_record(1).name == "Name 2"
+
+
+def test_where():
+    records = get_records(make_pub(Eif, 20))
+    for record in records[::2]:
+        record.type = ItemType.Weapon
+    records[3].name = records[2].name
+    columns = ColumnarRecords.from_records(EifRecord, records)
+
+    assert columns.where(type=ItemType.Weapon, min_damage=lambda value: value > 10) == [
+        10,
+        12,
+        14,
+        16,
+        18,
+    ]
+    assert columns.where(name="Name 3") == [2, 3]
+    assert columns.where(name=lambda name: name.endswith("0")) == [9, 19]
+    assert columns.where(type=lambda type: type.name == "Currency") == [1]
+    assert columns.where(name="missing") == []
+    assert len(columns.where()) == 20
+
+
+def test_where_with_values_straddling_bytes():
+    columns = ColumnarRecords.from_records(EifRecord, get_records(make_pub(Eif, 3)))
+    hp = columns.column("hp")
+    hp[0], hp[1], hp[2] = 0x0100, 0x0001, 0x0101
+    assert columns.where(hp=0x0101) == [2]
+    assert columns.where(hp=1) == [1]
+    assert columns.where(hp=-1) == []
+    assert columns.where(hp=1.0) == [1]
+
+
+def test_select():
+    columns = ColumnarRecords.from_records(EifRecord, get_records(make_pub(Eif, 20)))
+    selected = columns.select(columns.where(hp=lambda value: value % 5 == 0))
+    assert [record.name for record in selected.to_records()] == [
+        "Name 5",
+        "Name 10",
+        "Name 15",
+        "Name 20",
+    ]
+
+
+def test_append():
+    columns = ColumnarRecords(EifRecord)
+    assert len(columns) == 0
+    record = get_records(make_pub(Eif, 1))[0]
+    columns.append(record)
+    columns.append(record)
+    assert len(columns) == 2
+    assert len(columns.string_pool) == 1
+    assert serialize(columns.to_record(1)) == serialize(record)
+
+
+def test_write_value_exceeding_limit():
+    columns = ColumnarRecords.from_records(EifRecord, get_records(make_pub(Eif, 1)))
+    columns.column("weight")[0] = 253
+    with pytest.raises(ValueError):
+        write_records(columns)
+
+
+@pytest.mark.parametrize("pub_type", PUB_TYPES)
+def test_numpy_round_trip(pub_type):
+    numpy = pytest.importorskip("numpy")
+    data = serialize(make_pub(pub_type, 30))
+    columns = ColumnarRecords.from_index(PubFileIndex(pub_type, data))
+
+    records = columns.to_numpy()
+    assert isinstance(records, numpy.ndarray)
+    assert len(records) == 30
+    assert records["name"][4] == "Name 5"
+
+    result = ColumnarRecords.from_numpy(columns.record_type, records)
+    assert write_records(result) == data[10:]
+
+
+def test_to_numpy():
+    numpy = pytest.importorskip("numpy")
+    columns = ColumnarRecords.from_records(EifRecord, get_records(make_pub(Eif, 3)))
+    records = columns.to_numpy()
+    assert records.dtype["min_damage"] == numpy.uint16
+    assert records.dtype["spec1"] == numpy.uint32
+    assert records.dtype["name"] == numpy.dtype("U6")
+    assert list(records["weight"]) == [1, 2, 3]
+    assert list(records[records["hp"] > 1]["name"]) == ["Name 2", "Name 3"]
+
+
+def test_to_numpy_empty():
+    pytest.importorskip("numpy")
+    assert len(ColumnarRecords(EifRecord).to_numpy()) == 0
+
+
+def test_from_numpy_with_missing_field():
+    pytest.importorskip("numpy")
+    records = ColumnarRecords.from_records(EifRecord, get_records(make_pub(Eif, 3))).to_numpy()
+    with pytest.raises(ValueError):
+        ColumnarRecords.from_numpy(EifRecord, records[["name", "hp"]])
+
+
+def test_from_numpy_with_value_exceeding_limit():
+    pytest.importorskip("numpy")
+    records = ColumnarRecords.from_records(EifRecord, get_records(make_pub(Eif, 3))).to_numpy()
+    records = records.astype(
+        [(name, "i8" if name == "hp" else records.dtype[name]) for name in records.dtype.names]
+    )
+    records["hp"][0] = 64009
+    with pytest.raises(ValueError):
+        ColumnarRecords.from_numpy(EifRecord, records)
+
+
+def test_from_numpy_with_value_exceeding_eo_limit():
+    pytest.importorskip("numpy")
+    records = ColumnarRecords.from_records(EifRecord, get_records(make_pub(Eif, 3))).to_numpy()
+    records["weight"][0] = 253
+    with pytest.raises(ValueError):
+        ColumnarRecords.from_numpy(EifRecord, records)
+
+
+@pytest.mark.parametrize("pub_type", PUB_TYPES)
+def test_from_columns(pub_type):
+    data = serialize(make_pub(pub_type, 30))
+    columns = ColumnarRecords.from_index(PubFileIndex(pub_type, data))
+    copied = {name: memoryview(columns.column(name)) for name in columns.field_names}
+    result = ColumnarRecords.from_columns(columns.record_type, copied, columns.string_pool)
+    assert write_records(result) == data[10:]
+
+    lists = {name: list(columns.column(name)) for name in columns.field_names}
+    result = ColumnarRecords.from_columns(columns.record_type, lists, columns.string_pool)
+    assert write_records(result) == data[10:]
+
+
+def test_from_columns_with_invalid_columns():
+    columns = ColumnarRecords.from_records(EifRecord, get_records(make_pub(Eif, 3)))
+    values = {name: list(columns.column(name)) for name in columns.field_names}
+    pool = columns.string_pool
+
+    with pytest.raises(ValueError):
+        ColumnarRecords.from_columns(EifRecord, {**values, "hp": [1]}, pool)
+    with pytest.raises(ValueError):
+        ColumnarRecords.from_columns(EifRecord, {**values, "name": [0, 1, 99]}, pool)
+    del values["weight"]
+    with pytest.raises(ValueError):
+        ColumnarRecords.from_columns(EifRecord, values, pool)
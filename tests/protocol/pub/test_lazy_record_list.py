@@ -0,0 +1,65 @@
+import pytest
+from eolib.data.eo_reader import EoReader
+from eolib.data.eo_writer import EoWriter
+from eolib.protocol.pub import Eif, LazyRecordList, PubFileIndex, deserialize_lazy
+from pub_test_utils import PUB_TYPES, get_records, make_pub, make_record, serialize
+
+
+@pytest.mark.parametrize("pub_type", PUB_TYPES)
+def test_deserialize_lazy(pub_type):
+    data = serialize(make_pub(pub_type, 20))
+    expected = pub_type.deserialize(EoReader(data))
+
+    pub = deserialize_lazy(pub_type, data)
+    records = get_records(pub)
+    assert isinstance(records, LazyRecordList)
+    assert pub.rid == expected.rid
+    assert pub.version == expected.version
+    assert pub.byte_size == len(data)
+    assert len(records) == 20
+    assert records.materialized_count == 0
+
+    assert repr(records[3]) == repr(get_records(expected)[3])
+    assert records.is_materialized(3)
+    assert not records.is_materialized(4)
+    assert records.materialized_count == 1
+
+    assert serialize(pub) == data
+
+
+def test_indexing():
+    records = LazyRecordList(PubFileIndex(Eif, serialize(make_pub(Eif, 5))))
+    assert records[-1].name == "Name 5"
+    assert [record.name for record in records[1:3]] == ["Name 2", "Name 3"]
+    assert [record.name for record in records] == [f"Name {i}" for i in range(1, 6)]
+    assert records[0] is records[0]
+    with pytest.raises(IndexError):
+        records[5]
+
+
+def test_modify():
+    data = serialize(make_pub(Eif, 3))
+    pub = deserialize_lazy(Eif, data)
+    pub.items[0].name = "Sword"
+    pub.items.append(make_record(type(pub.items[0]), 4))
+    del pub.items[1]
+
+    expected = make_pub(Eif, 4)
+    expected.total_items_count = 3
+    expected.items[0].name = "Sword"
+    del expected.items[1]
+    assert pub.items.materialized_count == 2
+    assert serialize(pub) == serialize(expected)
+
+
+def test_write_to():
+    data = serialize(make_pub(Eif, 3))
+    index = PubFileIndex(Eif, data)
+    records = LazyRecordList(index)
+    records[1].name = "Shield"
+
+    writer = EoWriter()
+    records.write_to(writer)
+    result = bytes(writer.to_bytearray())
+    assert result[: len(index.get_bytes(1))] == bytes(index.get_bytes(1))
+    assert len(result) == len(data) - 10 + len("Shield") - len("Name 2")
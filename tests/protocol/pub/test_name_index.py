@@ -0,0 +1,117 @@
+import pytest
+from eolib.protocol.pub import Eif, Esf, NameIndex, PubFileIndex
+from pub_test_utils import PUB_TYPES, get_records, make_pub, serialize
+
+
+def create_index():
+    return NameIndex(
+        [
+            (1, "Gold"),
+            (2, "Sword"),
+            (3, "Swordfish"),
+            (4, "Wooden Sword"),
+            (5, "sword"),
+            (6, "ŠTIT"),
+            (7, "Straße"),
+        ]
+    )
+
+
+def test_find():
+    index = create_index()
+    assert index.find("sword") == [2, 5]
+    assert index.find("SWORD") == [2, 5]
+    assert index.find("Swor") == []
+
+
+def test_find_prefix():
+    index = create_index()
+    assert index.find_prefix("sw") == [2, 5, 3]
+    assert index.find_prefix("SW", limit=2) == [2, 5]
+    assert index.find_prefix("x") == []
+    assert len(index.find_prefix("")) == 7
+
+
+def test_find_substring():
+    index = create_index()
+    assert index.find_substring("word") == [2, 3, 4, 5]
+    assert index.find_substring("WORD", limit=3) == [2, 3, 4]
+    assert index.find_substring("d s") == []
+    assert index.find_substring("n s") == [4]
+    assert index.find_substring("\0") == []
+    assert index.find_substring("") == [1, 2, 3, 4, 5, 6, 7]
+    assert index.find_substring("", limit=2) == [1, 2]
+
+
+def test_find_substring_empty_index():
+    index = NameIndex()
+    assert index.find_substring("") == []
+    assert index.find_substring("a") == []
+    index.set_name(1, "apple")
+    assert index.find_substring("") == [1]
+    assert index.find_substring("PP") == [1]
+
+
+def test_windows_1252_letters():
+    index = create_index()
+    assert index.find("štit") == [6]
+    assert index.find_prefix("Št") == [6]
+    assert index.find("STRASSE") == []
+    assert index.find_substring("SSE") == []
+    assert index.find_substring("ßE") == [7]
+
+
+def test_set_name():
+    index = create_index()
+    index.set_name(3, "Shield")
+    assert index.get_name(3) == "Shield"
+    assert index.find_prefix("sw") == [2, 5]
+    assert index.find_substring("shi") == [3]
+
+    index.set_name(8, "Swordbreaker")
+    assert index.find_prefix("sword") == [2, 5, 8]
+    assert len(index) == 8
+
+
+def test_remove():
+    index = create_index()
+    index.remove(2)
+    index.remove(100)
+    assert 2 not in index
+    assert index.get_name(2) is None
+    assert index.find("sword") == [5]
+    assert index.find_prefix("sword") == [5, 3]
+    assert index.find_substring("sword") == [3, 4, 5]
+    assert len(index) == 6
+
+
+@pytest.mark.parametrize("pub_type", PUB_TYPES)
+def test_from_index(pub_type):
+    pub = make_pub(pub_type, 20)
+    index = NameIndex.from_index(PubFileIndex(pub_type, serialize(pub)))
+    assert len(index) == 20
+    assert index.find("name 12") == [12]
+    assert index.find_prefix("Name 1") == [1, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19]
+
+
+def test_from_records():
+    index = NameIndex.from_records(get_records(make_pub(Esf, 3)))
+    assert index.find_substring("NAME") == [1, 2, 3]
+
+
+def test_find_substring_after_changes():
+    index = create_index()
+    assert index.find_substring("sword") == [2, 3, 4, 5]
+
+    index.set_name(1, "Sword of Gold")
+    index.set_name(3, "Fish")
+    index.remove(5)
+    index.set_name(9, "Longsword")
+    assert index.find_substring("sword") == [1, 2, 4, 9]
+    assert index.find_substring("sword", limit=2) == [1, 2]
+    assert index.find_substring("fish") == [3]
+
+    for record_id in range(10, 200):
+        index.set_name(record_id, f"Sword {record_id}")
+    assert index.find_substring("sword 19") == [19] + list(range(190, 200))
+    assert len(index.find_substring("sword")) == 194
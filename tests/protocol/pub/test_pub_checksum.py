@@ -0,0 +1,105 @@
+import pytest
+from eolib.protocol.pub import Eif, EifRecord, PubChecksum, compute_pub_rid
+from eolib.protocol.pub.pub_file_index import PubFileIndex
+from eolib.data.eo_numeric_limits import SHORT_MAX
+from pub_test_utils import PUB_TYPES, get_records, make_pub, make_record, serialize
+
+
+def full_rid(records):
+    pub = make_pub(Eif, 0)
+    pub.items = records
+    pub.total_items_count = len(records)
+    return compute_pub_rid(Eif, serialize(pub))
+
+
+@pytest.mark.parametrize("pub_type", PUB_TYPES)
+def test_from_index_matches_full_recomputation(pub_type):
+    data = serialize(make_pub(pub_type, 50))
+    checksum = PubChecksum.from_index(PubFileIndex(pub_type, data))
+    assert len(checksum) == 50
+    assert checksum.rid == compute_pub_rid(pub_type, data)
+
+
+@pytest.mark.parametrize("pub_type", PUB_TYPES)
+def test_from_records_matches_from_index(pub_type):
+    pub = make_pub(pub_type, 20)
+    assert PubChecksum.from_records(get_records(pub)).rid == compute_pub_rid(
+        pub_type, serialize(pub)
+    )
+
+
+def test_rid_is_two_shorts():
+    rid = compute_pub_rid(Eif, serialize(make_pub(Eif, 100)))
+    assert len(rid) == 2
+    assert all(0 <= value < SHORT_MAX for value in rid)
+
+
+def test_header_is_not_included():
+    first = make_pub(Eif, 10)
+    second = make_pub(Eif, 10)
+    second.rid = [1, 2]
+    second.version = 3
+    assert compute_pub_rid(Eif, serialize(first)) == compute_pub_rid(Eif, serialize(second))
+
+
+def test_order_matters():
+    records = get_records(make_pub(Eif, 2))
+    assert full_rid(records) != full_rid(records[::-1])
+
+
+def test_incremental_edits_match_full_recomputation():
+    records = get_records(make_pub(Eif, 37))
+    checksum = PubChecksum.from_records(records)
+
+    edits = [
+        lambda: ("update", 5, make_record(EifRecord, 500)),
+        lambda: ("update", 0, make_record(EifRecord, 501)),
+        lambda: ("append", None, make_record(EifRecord, 502)),
+        lambda: ("insert", 3, make_record(EifRecord, 503)),
+        lambda: ("insert", 100, make_record(EifRecord, 504)),
+        lambda: ("insert", -2, make_record(EifRecord, 506)),
+        lambda: ("insert", -100, make_record(EifRecord, 507)),
+        lambda: ("delete", 10, None),
+        lambda: ("delete", None, None),
+        lambda: ("update", -1, make_record(EifRecord, 505)),
+    ]
+    for edit in edits:
+        operation, index, record = edit()
+        if operation == "update":
+            index %= len(records)
+            records[index] = record
+            checksum.update(index, serialize(record))
+        elif operation == "append":
+            records.append(record)
+            checksum.append(serialize(record))
+        elif operation == "insert":
+            records.insert(index, record)
+            checksum.insert(index, serialize(record))
+        else:
+            index = len(records) - 1 if index is None else index
+            del records[index]
+            checksum.delete(index)
+        assert len(checksum) == len(records)
+        assert checksum.rid == full_rid(records)
+
+
+def test_append_beyond_capacity():
+    checksum = PubChecksum()
+    records = []
+    for i in range(1, 70):
+        record = make_record(EifRecord, i)
+        records.append(record)
+        checksum.append(serialize(record))
+    assert checksum.rid == full_rid(records)
+
+
+def test_empty():
+    assert PubChecksum().rid == compute_pub_rid(Eif, serialize(make_pub(Eif, 0))) == [0, 0]
+
+
+def test_out_of_range():
+    checksum = PubChecksum([b"a", b"b"])
+    with pytest.raises(IndexError):
+        checksum.update(2, b"c")
+    with pytest.raises(IndexError):
+        checksum.delete(-1)
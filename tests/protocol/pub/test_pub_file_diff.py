@@ -0,0 +1,54 @@
+import pytest
+from eolib.protocol.pub import Eif, EifRecord, FieldChange, ItemType, diff_pub_files
+from pub_test_utils import PUB_TYPES, get_records, make_pub, make_record, serialize
+
+
+@pytest.mark.parametrize("pub_type", PUB_TYPES)
+def test_identical(pub_type):
+    data = serialize(make_pub(pub_type, 20))
+    assert diff_pub_files(pub_type, data, data) == []
+
+
+def test_changed_fields():
+    old = make_pub(Eif, 10)
+    new = make_pub(Eif, 10)
+    new.items[2].name = "Renamed"
+    new.items[2].hp = 50
+    new.items[7].type = ItemType.Weapon
+
+    diffs = diff_pub_files(Eif, serialize(old), serialize(new))
+    assert [diff.record_id for diff in diffs] == [3, 8]
+    assert diffs[0].field_changes == (
+        FieldChange("name", "Name 3", "Renamed"),
+        FieldChange("hp", 3, 50),
+    )
+    assert serialize(diffs[0].old_record) == serialize(old.items[2])
+    assert serialize(diffs[0].new_record) == serialize(new.items[2])
+    assert not diffs[0].added
+    assert not diffs[0].removed
+    assert diffs[1].field_changes == (FieldChange("type", ItemType(8), ItemType.Weapon),)
+
+
+def test_added_and_removed():
+    old = serialize(make_pub(Eif, 5))
+    new = serialize(make_pub(Eif, 7))
+
+    added = diff_pub_files(Eif, old, new)
+    assert [diff.record_id for diff in added] == [6, 7]
+    assert all(diff.added and diff.field_changes == () for diff in added)
+    assert serialize(added[0].new_record) == serialize(make_record(EifRecord, 6))
+
+    removed = diff_pub_files(Eif, new, old)
+    assert [diff.record_id for diff in removed] == [6, 7]
+    assert all(diff.removed for diff in removed)
+
+
+@pytest.mark.parametrize("pub_type", PUB_TYPES)
+def test_only_changed_records_are_reported(pub_type):
+    old = make_pub(pub_type, 30)
+    new = make_pub(pub_type, 30)
+    get_records(new)[29].name = "Last"
+    diffs = diff_pub_files(pub_type, serialize(old), serialize(new))
+    assert [(diff.record_id, diff.field_changes) for diff in diffs] == [
+        (30, (FieldChange("name", "Name 30", "Last"),))
+    ]
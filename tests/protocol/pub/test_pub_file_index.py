@@ -0,0 +1,75 @@
+import pytest
+from eolib.data.eo_reader import EoReader
+from eolib.protocol.map import Emf
+from eolib.protocol.pub import Eif, Enf, PubFileIndex
+from pub_test_utils import PUB_TYPES, get_records, make_pub, serialize
+
+
+@pytest.mark.parametrize("pub_type", PUB_TYPES)
+def test_get(pub_type):
+    pub = make_pub(pub_type, 50)
+    data = serialize(pub)
+    expected = pub_type.deserialize(EoReader(data))
+
+    index = PubFileIndex(pub_type, data)
+    assert len(index) == 50
+    assert index.rid == [1234, 5678]
+    assert index.total_records_count == 50
+    assert index.version == 1
+
+    records = get_records(expected)
+    for record_id in (1, 25, 50):
+        assert repr(index.get(record_id)) == repr(records[record_id - 1])
+
+
+def test_span():
+    data = serialize(make_pub(Eif, 3))
+    index = PubFileIndex(Eif, data)
+    assert index.span(1)[0] == 10
+    assert index.span(1)[1] == index.span(2)[0]
+    assert index.span(3)[1] == len(data)
+    assert bytes(index.get_bytes(2)) == data[index.span(2)[0] : index.span(2)[1]]
+
+
+def test_get_out_of_range():
+    index = PubFileIndex(Eif, serialize(make_pub(Eif, 3)))
+    with pytest.raises(IndexError):
+        index.get(0)
+    with pytest.raises(IndexError):
+        index.get(4)
+
+
+def test_cache():
+    index = PubFileIndex(Eif, serialize(make_pub(Eif, 3)), cache_size=2)
+    first = index.get(1)
+    assert index.get(1) is first
+
+    index.get(2)
+    index.get(3)
+    assert index.get(1) is not first
+
+    index.clear_cache()
+    assert index.get(2) is not index.get(3)
+
+
+def test_empty():
+    index = PubFileIndex(Eif, serialize(make_pub(Eif, 0)))
+    assert len(index) == 0
+    assert len(PubFileIndex(Eif, b'')) == 0
+
+
+def test_truncated():
+    data = serialize(make_pub(Eif, 2))
+    index = PubFileIndex(Eif, data[:-5])
+    assert len(index) == 2
+    assert index.span(2)[1] == len(data) - 5
+
+
+def test_wrong_file_id():
+    with pytest.raises(ValueError):
+        PubFileIndex(Eif, serialize(make_pub(Enf, 1)))
+
+
+def test_not_a_pub_file_type():
+    with pytest.raises(TypeError):
+        PubFileIndex(Emf, b'')
@@ -0,0 +1,76 @@
+import io
+import pytest
+from eolib.data.eo_reader import EoReader
+from eolib.protocol.pub import Eif, merge_pub_files, split_pub_file
+from pub_test_utils import PUB_TYPES, get_records, make_pub, serialize
+
+
+@pytest.mark.parametrize("pub_type", PUB_TYPES)
+def test_split(pub_type):
+    data = serialize(make_pub(pub_type, 25))
+    parts = list(split_pub_file(pub_type, data, 10))
+    assert len(parts) == 3
+
+    records = []
+    for part in parts:
+        pub = pub_type.deserialize(EoReader(part))
+        assert pub.rid == [1234, 5678]
+        assert pub.version == 1
+        records.extend(get_records(pub))
+    assert [serialize(record) for record in records] == [
+        serialize(record) for record in get_records(make_pub(pub_type, 25))
+    ]
+
+
+def test_split_header_total():
+    parts = list(split_pub_file(Eif, serialize(make_pub(Eif, 25)), 10))
+    assert [Eif.deserialize(EoReader(part)).total_items_count for part in parts] == [25, 25, 25]
+    assert [len(Eif.deserialize(EoReader(part)).items) for part in parts] == [10, 10, 5]
+
+
+@pytest.mark.parametrize("pub_type", PUB_TYPES)
+def test_merge(pub_type):
+    data = serialize(make_pub(pub_type, 25))
+    output = io.BytesIO()
+    assert merge_pub_files(pub_type, list(split_pub_file(pub_type, data, 7)), output) == 25
+    assert output.getvalue() == data
+
+
+def test_merge_updates_total():
+    first = make_pub(Eif, 3)
+    second = make_pub(Eif, 2)
+    second.rid = [1, 1]
+    output = io.BytesIO()
+    merge_pub_files(Eif, [serialize(first), serialize(second)], output)
+
+    merged = Eif.deserialize(EoReader(output.getvalue()))
+    assert merged.rid == [1234, 5678]
+    assert merged.total_items_count == 5
+    assert [item.name for item in merged.items] == [
+        "Name 1",
+        "Name 2",
+        "Name 3",
+        "Name 1",
+        "Name 2",
+    ]
+
+
+def test_merge_with_rid():
+    output = io.BytesIO()
+    merge_pub_files(Eif, [serialize(make_pub(Eif, 1))], output, rid=[5, 6])
+    assert Eif.deserialize(EoReader(output.getvalue())).rid == [5, 6]
+
+
+def test_merge_without_sources():
+    with pytest.raises(ValueError):
+        merge_pub_files(Eif, [], io.BytesIO())
+
+
+def test_split_empty():
+    data = serialize(make_pub(Eif, 0))
+    assert list(split_pub_file(Eif, data, 10)) == [data]
+
+
+def test_split_with_invalid_max_records():
+    with pytest.raises(ValueError):
+        list(split_pub_file(Eif, serialize(make_pub(Eif, 1)), 0))
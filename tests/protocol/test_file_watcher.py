@@ -0,0 +1,284 @@
+import os
+import time
+import pytest
+from eolib.data.eo_reader import EoReader
+from eolib.data.eo_writer import EoWriter
+from eolib.protocol import StructLayout
+from eolib.protocol.file_watcher import FileWatcher
+from eolib.protocol.map import (
+    Emf,
+    MapGraphicLayer,
+    MapGraphicRow,
+    MapGraphicRowTile,
+    MapMusicControl,
+    MapTimedEffect,
+    MapType,
+)
+from eolib.protocol.pub import Eif, EifRecord
+
+
+def serialize(data):
+    writer = EoWriter()
+    type(data).serialize(writer, data)
+    return bytes(writer.to_bytearray())
+
+
+def make_eif(names, version=1):
+    layout = StructLayout(EifRecord)
+    length_names = {field.length for field in layout.fields}
+    eif = Eif()
+    eif.rid = [1, 2]
+    eif.total_items_count = len(names)
+    eif.version = version
+    eif.items = []
+    for name in names:
+        record = EifRecord()
+        for field in layout.fields:
+            if field.name in length_names or field.value is not None:
+                continue
+            setattr(record, field.name, name if field.type == "string" else 1)
+        eif.items.append(record)
+    return serialize(eif)
+
+
+def make_emf(name="Map", width=10):
+    emf = Emf()
+    emf.rid = [1, 2]
+    emf.name = name
+    emf.type = MapType.Normal
+    emf.timed_effect = MapTimedEffect.None_
+    emf.music_id = 0
+    emf.music_control = MapMusicControl.InterruptIfDifferentPlayOnce
+    emf.ambient_sound_id = 0
+    emf.width = width
+    emf.height = 10
+    emf.fill_tile = 0
+    emf.map_available = True
+    emf.can_scroll = False
+    emf.relog_x = 0
+    emf.relog_y = 0
+    emf.npcs = []
+    emf.legacy_door_keys = []
+    emf.items = []
+    emf.tile_spec_rows = []
+    emf.warp_rows = []
+    emf.graphic_layers = []
+    for _ in range(9):
+        layer = MapGraphicLayer()
+        layer.graphic_rows = []
+        emf.graphic_layers.append(layer)
+    emf.signs = []
+    return serialize(emf)
+
+
+def write(path, data):
+    path.write_bytes(data)
+    stat = os.stat(path)
+    # Ensure the modification time changes even on file systems with coarse timestamps.
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_watch_loads_file(tmp_path):
+    path = tmp_path / "dat001.eif"
+    write(path, make_eif(["Gold", "Sword"]))
+    watcher = FileWatcher()
+    eif = watcher.watch(path, Eif)
+    assert [item.name for item in eif.items] == ["Gold", "Sword"]
+    assert watcher.get(path) is eif
+    assert watcher.poll() == []
+
+
+def test_pub_change(tmp_path):
+    path = tmp_path / "dat001.eif"
+    write(path, make_eif(["Gold", "Sword", "Shield"]))
+    watcher = FileWatcher()
+    watcher.watch(path, Eif)
+    events = []
+    watcher.add_listener(events.append)
+
+    write(path, make_eif(["Gold", "Axe", "Shield"], version=2))
+    assert watcher.poll() == events
+    assert len(events) == 1
+    event = events[0]
+    assert event.path == os.fspath(path)
+    assert event.changed_fields == ("version", "items")
+    assert [diff.record_id for diff in event.record_diffs] == [2]
+    assert event.record_diffs[0].field_changes[0].new_value == "Axe"
+    assert event.new is watcher.get(path)
+    assert event.new.items[1].name == "Axe"
+    assert event.old.items[1].name == "Sword"
+
+
+def test_map_change(tmp_path):
+    path = tmp_path / "00001.emf"
+    write(path, make_emf())
+    watcher = FileWatcher()
+    watcher.watch(path, Emf)
+
+    write(path, make_emf(name="Renamed", width=20))
+    (event,) = watcher.poll()
+    assert event.changed_fields == ("name", "width")
+    assert event.record_diffs == ()
+    assert event.new.name == "Renamed"
+
+
+def test_touch_without_change(tmp_path):
+    path = tmp_path / "00001.emf"
+    write(path, make_emf())
+    watcher = FileWatcher()
+    emf = watcher.watch(path, Emf)
+    write(path, make_emf())
+    assert watcher.poll() == []
+    assert watcher.get(path) is emf
+
+
+def test_create_and_delete(tmp_path):
+    path = tmp_path / "00001.emf"
+    watcher = FileWatcher()
+    assert watcher.watch(path, Emf) is None
+
+    write(path, make_emf())
+    (created,) = watcher.poll()
+    assert created.old is None
+    assert created.new.name == "Map"
+
+    os.remove(path)
+    (deleted,) = watcher.poll()
+    assert deleted.old is created.new
+    assert deleted.new is None
+    assert watcher.get(path) is None
+
+
+def test_invalid_file_is_retried(tmp_path):
+    path = tmp_path / "dat001.eif"
+    write(path, make_eif(["Gold"]))
+    watcher = FileWatcher()
+    watcher.watch(path, Eif)
+
+    write(path, make_eif([])[:10] + b"\x00\x01")
+    assert watcher.poll() == []
+    assert watcher.get(path).items[0].name == "Gold"
+
+    write(path, make_eif(["Coin"]))
+    (event,) = watcher.poll()
+    assert event.new.items[0].name == "Coin"
+
+
+def test_unreadable_file_is_retried(tmp_path, monkeypatch):
+    path = tmp_path / "00001.emf"
+    write(path, make_emf())
+    watcher = FileWatcher()
+    watcher.watch(path, Emf)
+    write(path, make_emf(name="Renamed"))
+
+    stat = os.stat
+
+    def fail(*args, **kwargs):
+        raise PermissionError(args[0])
+
+    monkeypatch.setattr(os, "stat", fail)
+    assert watcher.poll() == []
+    monkeypatch.setattr(os, "stat", stat)
+    (event,) = watcher.poll()
+    assert event.new.name == "Renamed"
+
+
+def test_listener_exception_is_logged(tmp_path, caplog):
+    path = tmp_path / "00001.emf"
+    write(path, make_emf())
+    watcher = FileWatcher()
+    watcher.watch(path, Emf)
+    events = []
+
+    def fail(event):
+        raise RuntimeError("listener failed")
+
+    watcher.add_listener(fail)
+    watcher.add_listener(events.append)
+    write(path, make_emf(name="Renamed"))
+    assert watcher.poll() == events
+    assert len(events) == 1
+    assert "listener failed" in caplog.text
+
+
+def test_unwatch(tmp_path):
+    path = tmp_path / "00001.emf"
+    write(path, make_emf())
+    watcher = FileWatcher()
+    watcher.watch(path, Emf)
+    watcher.unwatch(path)
+    write(path, make_emf(name="Renamed"))
+    assert watcher.poll() == []
+    with pytest.raises(KeyError):
+        watcher.get(path)
+
+
+def test_invalid_file_type(tmp_path):
+    with pytest.raises(TypeError):
+        FileWatcher().watch(tmp_path / "file", EifRecord)
+
+
+def test_start_and_stop(tmp_path):
+    path = tmp_path / "00001.emf"
+    write(path, make_emf())
+    with FileWatcher() as watcher:
+        watcher.watch(path, Emf)
+        watcher.start(interval=0.01)
+        with pytest.raises(RuntimeError):
+            watcher.start()
+        write(path, make_emf(name="Renamed"))
+        for _ in range(500):
+            if watcher.get(path).name == "Renamed":
+                break
+            time.sleep(0.01)
+        assert watcher.get(path).name == "Renamed"
+    watcher.stop()
+
+
+def test_map_unchanged_sections_are_shared(tmp_path):
+    path = tmp_path / "00001.emf"
+    write(path, make_emf())
+    watcher = FileWatcher()
+    old = watcher.watch(path, Emf)
+
+    emf = Emf.deserialize(EoReader(make_emf()))
+    layer = MapGraphicLayer()
+    row = MapGraphicRow()
+    row.y = 1
+    row.tiles = [MapGraphicRowTile()]
+    row.tiles[0].x = 2
+    row.tiles[0].graphic = 3
+    layer.graphic_rows = [row]
+    emf.graphic_layers[4] = layer
+    write(path, serialize(emf))
+
+    (event,) = watcher.poll()
+    assert event.changed_fields == ("graphic_layers",)
+    assert event.new.npcs is old.npcs
+    assert event.new.signs is old.signs
+    assert event.new.graphic_layers[3] is old.graphic_layers[3]
+    assert event.new.graphic_layers[4].graphic_rows[0].tiles[0].graphic == 3
+    assert serialize(event.new) == serialize(emf)
+
+
+def test_background_thread_survives_listener_exception(tmp_path):
+    path = tmp_path / "00001.emf"
+    write(path, make_emf())
+    names = []
+
+    def listener(event):
+        names.append(event.new.name)
+        raise RuntimeError("listener failed")
+
+    with FileWatcher() as watcher:
+        watcher.watch(path, Emf)
+        watcher.add_listener(listener)
+        watcher.start(interval=0.01)
+        for name in ["First", "Second"]:
+            write(path, make_emf(name=name))
+            for _ in range(500):
+                if name in names:
+                    break
+                time.sleep(0.01)
+        assert names == ["First", "Second"]
+        assert watcher._thread is not None and watcher._thread.is_alive()
@@ -0,0 +1,51 @@
+import pytest
+from eolib.protocol.lazy_list import LazyList
+
+
+class SquareList(LazyList[str]):
+    def __init__(self, count):
+        super().__init__(range(count))
+        self.loaded = []
+
+    def _materialize(self, slot):
+        self.loaded.append(slot)
+        return str(slot * slot)
+
+
+def test_items_are_loaded_on_first_access():
+    squares = SquareList(5)
+    assert len(squares) == 5
+    assert squares.materialized_count == 0
+    assert squares[3] == "9"
+    assert squares[3] == "9"
+    assert squares.loaded == [3]
+    assert squares.is_materialized(3)
+    assert not squares.is_materialized(2)
+    assert squares[1:3] == ["1", "4"]
+    assert squares.materialized_count == 3
+    assert list(squares) == ["0", "1", "4", "9", "16"]
+    assert squares.loaded == [3, 1, 2, 0, 4]
+
+
+def test_mutation():
+    squares = SquareList(4)
+    squares[0] = "zero"
+    squares.insert(1, "inserted")
+    del squares[2]
+    squares.append("appended")
+    assert squares.loaded == []
+    assert squares.materialized_count == 3
+    assert list(squares) == ["zero", "inserted", "4", "9", "appended"]
+    squares[1:3] = ["a"]
+    assert list(squares) == ["zero", "a", "9", "appended"]
+
+
+def test_repr():
+    squares = SquareList(3)
+    squares[0]
+    assert repr(squares) == "SquareList(3 items, 1 materialized)"
+
+
+def test_abstract():
+    with pytest.raises(TypeError):
+        LazyList(range(3))
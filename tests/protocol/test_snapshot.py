@@ -0,0 +1,323 @@
+import os
+import sys
+import pytest
+from array import array
+from eolib.data.eo_writer import EoWriter
+from eolib.protocol import Coords, StructLayout
+from eolib.protocol.map import (
+    NO_TILE_SPEC,
+    Emf,
+    MapGraphicLayer,
+    MapMusicControl,
+    MapTileSpec,
+    MapTileSpecRow,
+    MapTileSpecRowTile,
+    MapTimedEffect,
+    MapType,
+    MapWarp,
+    MapWarpRow,
+    MapWarpRowTile,
+    PathFinder,
+)
+from eolib.protocol.pub import Eif, EifRecord, Enf
+from eolib.protocol.snapshot import (
+    SNAPSHOT_VERSION,
+    Snapshot,
+    compile_map_snapshot,
+    compute_source_checksum,
+    load_map_snapshot,
+    load_pub_snapshot,
+    load_snapshot,
+    snapshot_columnar_records,
+)
+
+
+def serialize(data):
+    writer = EoWriter()
+    type(data).serialize(writer, data)
+    return bytes(writer.to_bytearray())
+
+
+def make_eif(names):
+    layout = StructLayout(EifRecord)
+    length_names = {field.length for field in layout.fields}
+    eif = Eif()
+    eif.rid = [1, 2]
+    eif.total_items_count = len(names)
+    eif.version = 1
+    items = []
+    for i, name in enumerate(names):
+        record = EifRecord()
+        for field in layout.fields:
+            if field.name in length_names or field.value is not None:
+                continue
+            setattr(record, field.name, name if field.type == "string" else i + 1)
+        items.append(record)
+    eif.items = items
+    return serialize(eif)
+
+
+def make_emf(walls=(), warps=()):
+    emf = Emf()
+    emf.rid = [1, 2]
+    emf.name = "Map"
+    emf.type = MapType.Normal
+    emf.timed_effect = MapTimedEffect.None_
+    emf.music_id = 0
+    emf.music_control = MapMusicControl.InterruptIfDifferentPlayOnce
+    emf.ambient_sound_id = 0
+    emf.width = 4
+    emf.height = 2
+    emf.fill_tile = 0
+    emf.map_available = True
+    emf.can_scroll = False
+    emf.relog_x = 0
+    emf.relog_y = 0
+    emf.npcs = []
+    emf.legacy_door_keys = []
+    emf.items = []
+
+    tile_spec_rows = []
+    for x, y in walls:
+        tile = MapTileSpecRowTile()
+        tile.x = x
+        tile.tile_spec = MapTileSpec.Wall
+        row = MapTileSpecRow()
+        row.y = y
+        row.tiles = [tile]
+        tile_spec_rows.append(row)
+    emf.tile_spec_rows = tile_spec_rows
+
+    warp_rows = []
+    for x, y, destination_map, door in warps:
+        coords = Coords()
+        coords.x = 7
+        coords.y = 8
+        warp = MapWarp()
+        warp.destination_map = destination_map
+        warp.destination_coords = coords
+        warp.level_required = 3
+        warp.door = door
+        tile = MapWarpRowTile()
+        tile.x = x
+        tile.warp = warp
+        row = MapWarpRow()
+        row.y = y
+        row.tiles = [tile]
+        warp_rows.append(row)
+    emf.warp_rows = warp_rows
+
+    layers = []
+    for _ in range(9):
+        layer = MapGraphicLayer()
+        layer.graphic_rows = []
+        layers.append(layer)
+    emf.graphic_layers = layers
+    emf.signs = []
+    return serialize(emf)
+
+
+def test_write_and_open(tmp_path):
+    path = tmp_path / "test.snapshot"
+    arrays = {"bytes": b"\x01\x02\x03", "shorts": array("H", [1, 500]), "empty": array("I")}
+    Snapshot.write(path, "test", (3, 4), arrays)
+    with Snapshot.open(path) as snapshot:
+        assert snapshot.kind == "test"
+        assert snapshot.source_checksum == (3, 4)
+        assert snapshot.names == ["bytes", "shorts", "empty"]
+        assert "shorts" in snapshot
+        assert "missing" not in snapshot
+        assert list(snapshot["bytes"]) == [1, 2, 3]
+        assert list(snapshot["shorts"]) == [1, 500]
+        assert list(snapshot["empty"]) == []
+        with pytest.raises(KeyError):
+            snapshot["missing"]
+    assert os.listdir(tmp_path) == ["test.snapshot"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="file modes are not supported on Windows")
+def test_write_file_mode(tmp_path):
+    path = tmp_path / "test.snapshot"
+    umask = os.umask(0o022)
+    try:
+        Snapshot.write(path, "test", (0, 0), {})
+    finally:
+        os.umask(umask)
+    assert os.stat(path).st_mode & 0o777 == 0o644
+
+    os.chmod(path, 0o640)
+    Snapshot.write(path, "test", (0, 0), {})
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+def test_write_removes_temp_file_on_failure(tmp_path, monkeypatch):
+    def fail(src, dst):
+        raise OSError("replace failed")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        Snapshot.write(tmp_path / "test.snapshot", "test", (0, 0), {"data": b"abc"})
+    assert os.listdir(tmp_path) == []
+
+
+def test_arrays_are_aligned(tmp_path):
+    path = tmp_path / "test.snapshot"
+    Snapshot.write(path, "test", (0, 0), {"a": b"\x01", "b": array("I", [1]), "c": b"\x02"})
+    data = path.read_bytes()
+    snapshot = Snapshot(data)
+    for name in snapshot.names:
+        assert snapshot._entries[name][1] % 8 == 0
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"NOTASNAPSHOT" * 10,
+    ],
+)
+def test_invalid_data(data):
+    with pytest.raises(ValueError):
+        Snapshot(data)
+
+
+def test_unsupported_version(tmp_path):
+    path = tmp_path / "test.snapshot"
+    Snapshot.write(path, "test", (0, 0), {"a": b"\x01"})
+    data = bytearray(path.read_bytes())
+    data[8] = SNAPSHOT_VERSION + 1
+    with pytest.raises(ValueError):
+        Snapshot(bytes(data))
+
+
+def test_different_byte_order(tmp_path):
+    path = tmp_path / "test.snapshot"
+    Snapshot.write(path, "test", (0, 0), {"a": b"\x01"})
+    data = bytearray(path.read_bytes())
+    data[10] = 1 if sys.byteorder == "little" else 0
+    with pytest.raises(ValueError):
+        Snapshot(bytes(data))
+
+
+def test_truncated(tmp_path):
+    path = tmp_path / "test.snapshot"
+    Snapshot.write(path, "test", (0, 0), {"a": b"\x01" * 100})
+    with pytest.raises(ValueError):
+        Snapshot(path.read_bytes()[:-1])
+
+
+def test_invalid_names(tmp_path):
+    with pytest.raises(ValueError):
+        Snapshot.write(tmp_path / "a", "toolongkind", (0, 0), {})
+    with pytest.raises(ValueError):
+        Snapshot.write(tmp_path / "a", "test", (0, 0), {"x" * 33: b""})
+
+
+def test_load_snapshot_rebuilds_when_stale(tmp_path):
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"abc")
+    compiled = []
+
+    def compiler(data):
+        compiled.append(data)
+        return {"data": data}
+
+    with load_snapshot(source, "test", compiler) as snapshot:
+        assert bytes(snapshot["data"]) == b"abc"
+    assert os.path.exists(f"{source}.snapshot")
+
+    with load_snapshot(source, "test", compiler) as snapshot:
+        assert snapshot.matches(b"abc")
+    assert compiled == [b"abc"]
+
+    source.write_bytes(b"abcd")
+    with load_snapshot(source, "test", compiler) as snapshot:
+        assert bytes(snapshot["data"]) == b"abcd"
+        assert snapshot.source_checksum == compute_source_checksum(b"abcd")
+    assert compiled == [b"abc", b"abcd"]
+
+    with load_snapshot(source, "other", compiler) as snapshot:
+        assert snapshot.kind == "other"
+    assert len(compiled) == 3
+
+
+def test_load_snapshot_rebuilds_when_invalid(tmp_path):
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"abc")
+    snapshot_path = tmp_path / "custom.snapshot"
+    snapshot_path.write_bytes(b"garbage")
+    with load_snapshot(source, "test", lambda data: {"data": data}, snapshot_path) as snapshot:
+        assert bytes(snapshot["data"]) == b"abc"
+
+
+def test_load_snapshot_propagates_permission_error(tmp_path, monkeypatch):
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"abc")
+
+    def fail(path):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(Snapshot, "open", staticmethod(fail))
+    with pytest.raises(PermissionError):
+        load_snapshot(source, "test", lambda data: {"data": data})
+    assert not os.path.exists(f"{source}.snapshot")
+
+
+def test_compile_map_snapshot():
+    arrays = compile_map_snapshot(make_emf(walls=[(1, 0)], warps=[(2, 1, 5, 0), (3, 2, 6, 1)]))
+    width, height = arrays["dimensions"]
+    assert (width, height) == (5, 3)
+    assert arrays["tile_specs"][1] == MapTileSpec.Wall
+    assert arrays["tile_specs"][0] == NO_TILE_SPEC
+    assert arrays["player_walkable"][1] == 0
+    assert arrays["player_walkable"][1 * 5 + 2] == 1
+    assert arrays["player_walkable"][2 * 5 + 3] == 1
+    assert arrays["npc_walkable"][2 * 5 + 3] == 0
+    assert arrays["npc_walkable"][1 * 5 + 2] == 0
+    assert arrays["transparent"][1] == 0
+    assert arrays["transparent"][2 * 5 + 3] == 1
+    assert list(arrays["warp_tiles"]) == [1 * 5 + 2, 2 * 5 + 3]
+    assert list(arrays["warp_maps"]) == [5, 6]
+    assert list(arrays["warp_xs"]) == [7, 7]
+    assert list(arrays["warp_ys"]) == [8, 8]
+    assert list(arrays["warp_levels"]) == [3, 3]
+    assert list(arrays["warp_doors"]) == [0, 1]
+
+
+def test_load_map_snapshot(tmp_path):
+    path = tmp_path / "00001.emf"
+    path.write_bytes(make_emf(walls=[(1, 0), (1, 1)]))
+    with load_map_snapshot(path) as snapshot:
+        width, height = snapshot["dimensions"]
+        finder = PathFinder(snapshot["player_walkable"], width, height)
+        assert len(finder.find_path((0, 0), (2, 0))) == 6
+
+    path.write_bytes(make_emf(walls=[(1, 0)]))
+    with load_map_snapshot(path) as snapshot:
+        width, height = snapshot["dimensions"]
+        finder = PathFinder(snapshot["player_walkable"], width, height)
+        assert len(finder.find_path((0, 0), (2, 0))) == 4
+
+
+def test_load_pub_snapshot(tmp_path):
+    path = tmp_path / "dat001.eif"
+    path.write_bytes(make_eif(["Sword", "Shield", "Sword"]))
+    with load_pub_snapshot(Eif, path) as snapshot:
+        assert snapshot.kind == "eif"
+        assert list(snapshot["header"]) == [1, 2, 3, 1]
+        columns = snapshot_columnar_records(Eif, snapshot)
+
+    assert len(columns) == 3
+    assert columns.get_value("name", 1) == "Shield"
+    assert columns.where(name="Sword") == [0, 2]
+    writer = EoWriter()
+    columns.write_to(writer)
+    assert bytes(writer.to_bytearray()) == path.read_bytes()[10:]
+
+
+def test_snapshot_columnar_records_wrong_kind(tmp_path):
+    path = tmp_path / "dat001.eif"
+    path.write_bytes(make_eif(["Sword"]))
+    with load_pub_snapshot(Eif, path) as snapshot:
+        with pytest.raises(ValueError):
+            snapshot_columnar_records(Enf, snapshot)
@@ -0,0 +1,46 @@
+import pytest
+from eolib.data.eo_writer import EoWriter
+from eolib.protocol.map import MapTileSpecRowTile
+from eolib.protocol.pub import Eif, EsfRecord
+from eolib.protocol.struct_layout import LayoutField, StructLayout
+
+
+def test_fields():
+    layout = StructLayout(EsfRecord)
+    assert layout.struct_type is EsfRecord
+    assert layout.fields[0] == LayoutField("name_length", "char", None, None)
+    assert layout.fields[2] == LayoutField("name", "string", "name_length", None)
+    assert layout.fields[2].size is None
+    assert layout.fields[4].size == 2
+
+
+def test_fixed_size():
+    assert StructLayout(MapTileSpecRowTile).fixed_size == 2
+    assert StructLayout(EsfRecord).fixed_size is None
+
+
+def test_size_of():
+    record = EsfRecord()
+    record.name = "Fireball"
+    record.chant = "Burn!"
+    for field in StructLayout(EsfRecord).fields:
+        if field.name is not None and field.size is not None and "length" not in field.name:
+            setattr(record, field.name, 0)
+
+    writer = EoWriter()
+    writer.add_bytes(b'\x01\x02\x03')
+    EsfRecord.serialize(writer, record)
+    data = bytes(writer.to_bytearray())
+
+    assert StructLayout(EsfRecord).size_of(data, 3) == len(data) - 3
+    assert StructLayout(EsfRecord).size_of(data[:20], 3) == 17
+
+
+def test_size_of_with_negative_length():
+    with pytest.raises(ValueError):
+        StructLayout(EsfRecord).size_of(b'\x00\x01')
+
+
+def test_struct_without_flat_layout():
+    with pytest.raises(ValueError):
+        StructLayout(Eif)